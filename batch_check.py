@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+
+"""
+Pre-flight validation of batch files without running the macros.
+
+Every line is parsed with its macro's own argparse parser. Its datafile is
+resolved, and the referenced columns and Config/Name values are checked
+against cheap schema metadata, so a typo fails in seconds instead of after
+a full unpickle:
+
+    python3 run_plot_scripts.py -s my_plots --check
+    python3 batch_check.py catalog              # index input/data once (incremental)
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import glob
+import io
+import json
+import pickle
+import runpy
+import shlex
+import time
+from functools import lru_cache
+
+from rich import print as rprint
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join("input", "data")
+REPO_SRC = os.path.join(REPO_ROOT, "src")
+# Catalog file (None: lib.catalog default, output/cache/data_catalog.json)
+CATALOG_PATH = None
+EVENT_INDEX_SUFFIX = ".events"
+# Macro options that name DataFrame columns
+COLUMN_ARGS = ("x", "y", "z", "iterable", "colorby", "select", "event_column")
+# Macro options checked against the values stored in a column
+VALUE_ARGS = {"configs": "Config", "names": "Name"}
+
+
+class _ParserCaptured(Exception):
+    def __init__(self, parser):
+        super().__init__("parser captured")
+        self.parser = parser
+
+
+@lru_cache(maxsize=None)
+def _load_macro_parser(script_path, _mtime):
+    """
+    Execute a macro's module body up to its ``parser.parse_args()`` call and
+    return the parser, without parsing sys.argv or running main().
+    """
+
+    def capture(self, *args, **kwargs):
+        raise _ParserCaptured(self)
+
+    original_parse_args = argparse.ArgumentParser.parse_args
+    old_argv, old_path = sys.argv, list(sys.path)
+    argparse.ArgumentParser.parse_args = capture
+    try:
+        sys.argv = [script_path]
+        sys.path.insert(0, os.path.dirname(script_path))
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            runpy.run_path(script_path, run_name="__check__")
+    except _ParserCaptured as captured:
+        return captured.parser
+    finally:
+        argparse.ArgumentParser.parse_args = original_parse_args
+        sys.argv = old_argv
+        sys.path[:] = old_path
+    raise ValueError(f"{script_path} does not parse its arguments with argparse")
+
+
+def load_macro_parser(script_path):
+    script_path = os.path.abspath(script_path)
+    return _load_macro_parser(script_path, os.stat(script_path).st_mtime_ns)
+
+
+def parse_macro_args(parser, argv):
+    """
+    Parse ``argv`` with a macro parser. Returns (namespace, None) or (None, error message).
+    """
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+            return parser.parse_args(argv), None
+    except SystemExit:
+        lines = buffer.getvalue().strip().splitlines()
+        return None, lines[-1] if lines else "Invalid arguments"
+
+
+def datafile_pattern(datafile):
+    """
+    Glob pattern of the files a bare --datafile name refers to: input/data/<name>.*
+    """
+    return os.path.join(DATA_DIR, f"{glob.escape(str(datafile))}.*")
+
+
+def resolve_datafile(datafile):
+    """
+    Files a --datafile value refers to: the path itself, or input/data/<name>.*
+    """
+    if os.path.isfile(datafile):
+        return [datafile]
+    return sorted(
+        path
+        for path in glob.glob(datafile_pattern(datafile))
+        if os.path.isfile(path) and not path.endswith(".json")
+    )
+
+
+def _catalog_schema(path):
+    if REPO_SRC not in sys.path:
+        sys.path.insert(0, REPO_SRC)
+    from lib.catalog import describe_datafile
+
+    entry = describe_datafile(path, CATALOG_PATH)
+    if entry is None:
+        return None
+    return {
+        "columns": list(entry["columns"]),
+        "values": {
+            column: [str(value) for value in entry["columns"][column]["distinct"] or []]
+            for column in VALUE_ARGS.values()
+            if column in entry["columns"]
+        },
+    }
+
+
+def build_data_catalog(datafiles=None, force=False):
+    """
+    Refresh the dataset catalog (all of input/data, or only ``datafiles``).
+    """
+    if REPO_SRC not in sys.path:
+        sys.path.insert(0, REPO_SRC)
+    from lib.catalog import build_catalog
+
+    paths = None
+    if datafiles:
+        paths = [path for datafile in datafiles for path in resolve_datafile(datafile)]
+    return build_catalog(DATA_DIR, CATALOG_PATH, force=force, paths=paths)
+
+
+def _event_index_schema(path):
+    index_dir = os.path.splitext(path)[0] + EVENT_INDEX_SUFFIX
+    meta_path = os.path.join(index_dir, "meta.json")
+    if not os.path.isfile(meta_path) or os.path.getmtime(meta_path) < os.path.getmtime(path):
+        return None
+    with open(meta_path, "r") as f:
+        columns = [column["name"] for column in json.load(f)["columns"]]
+    with open(os.path.join(index_dir, "categories.pkl"), "rb") as f:
+        categories = pickle.load(f)
+    values = {
+        name: sorted(map(str, categories[position]))
+        for position, name in enumerate(columns)
+        if name in VALUE_ARGS.values() and position in categories
+    }
+    return {"columns": columns, "values": values}
+
+
+def _parquet_schema(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return {"columns": list(pq.read_schema(path).names), "values": {}}
+
+
+def read_schema(path):
+    """
+    Cheap schema of one datafile: the dataset catalog, an up-to-date event
+    index, or a parquet footer. Returns None when only a full load could tell.
+    """
+    schema = _catalog_schema(path)
+    if schema is None:
+        schema = _event_index_schema(path)
+    if schema is None and path.endswith(".parquet"):
+        schema = _parquet_schema(path)
+    return schema
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def check_line(script_name):
+    """
+    Validate one batch line. Returns a list of problems (empty when it looks runnable).
+    """
+    try:
+        tokens = shlex.split(script_name)
+    except ValueError as exc:
+        return [f"Cannot split line: {exc}"]
+    script = next((idx for idx, token in enumerate(tokens) if token.endswith(".py")), None)
+    if script is None:
+        return ["No macro script (*.py) in line"]
+    script_path = tokens[script]
+    if not os.path.isfile(script_path):
+        return [f"Macro {script_path} not found"]
+
+    try:
+        parser = load_macro_parser(script_path)
+    except Exception as exc:
+        return [f"Cannot load the parser of {script_path}: {type(exc).__name__}: {exc}"]
+    macro_args, error = parse_macro_args(parser, tokens[script + 1 :])
+    if error is not None:
+        return [error]
+
+    datafile = getattr(macro_args, "datafile", None)
+    if datafile is None:
+        return []
+    paths = resolve_datafile(str(datafile))
+    if not paths:
+        return [f"Datafile '{datafile}' not found (looked for {os.path.join(DATA_DIR, str(datafile))}.*)"]
+
+    schemas = [read_schema(path) for path in paths]
+    if any(schema is None for schema in schemas):
+        return []
+    columns = {column for schema in schemas for column in schema["columns"]}
+    problems = []
+    for name in COLUMN_ARGS:
+        for column in _as_list(getattr(macro_args, name, None)):
+            if isinstance(column, str) and column not in columns:
+                problems.append(f"Column '{column}' (--{name}) not in {datafile}")
+    for name, column in VALUE_ARGS.items():
+        known = {value for schema in schemas for value in schema["values"].get(column, [])}
+        if not known:
+            continue
+        for value in _as_list(getattr(macro_args, name, None)):
+            if str(value) not in known:
+                problems.append(f"{column} '{value}' (--{name}) not in {datafile}")
+    return problems
+
+
+def check_batch(scripts):
+    """
+    Validate every batch line.
+
+    Returns:
+        tuple: (list of (line number, line, problems) for lines with problems,
+        number of lines whose columns could not be checked without a full load)
+    """
+    failures = []
+    unchecked = 0
+    for number, script_name in enumerate(scripts, start=1):
+        problems = check_line(script_name)
+        if problems:
+            failures.append((number, script_name, problems))
+        elif _needs_full_load(script_name):
+            unchecked += 1
+    return failures, unchecked
+
+
+def _needs_full_load(script_name):
+    try:
+        tokens = shlex.split(script_name)
+    except ValueError:
+        return False
+    datafiles = [tokens[idx + 1] for idx, token in enumerate(tokens[:-1]) if token == "--datafile"]
+    return any(read_schema(path) is None for datafile in datafiles for path in resolve_datafile(datafile))
+
+
+def report_check(scripts):
+    """
+    Check a batch and print every problem. Returns the runner exit code.
+    """
+    start = time.perf_counter()
+    failures, unchecked = check_batch(scripts)
+    elapsed = time.perf_counter() - start
+    for number, script_name, problems in failures:
+        rprint(f"\n[red]Error:[/red] line {number}: {' '.join(script_name.split())}")
+        for problem in problems:
+            rprint(f"  - {problem}")
+    if unchecked:
+        rprint(
+            f"\n[yellow]Warning:[/yellow] Columns of {unchecked} line(s) were not checked: "
+            "their datafiles are not in the catalog (python3 batch_check.py catalog)"
+        )
+    if failures:
+        rprint(f"\n[red]{len(failures)} of {len(scripts)} lines have problems[/red] ({elapsed:.1f} s)")
+        return 1
+    rprint(f"\n[green]All {len(scripts)} lines passed the check[/green] ({elapsed:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch pre-flight helpers.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    catalog_parser = subparsers.add_parser(
+        "catalog", help="Build or refresh the input/data catalog used by --check"
+    )
+    catalog_parser.add_argument(
+        "datafiles", nargs="*", help="Only refresh these datafiles (paths or names in input/data)"
+    )
+    catalog_parser.add_argument("--force", action="store_true", help="Summarize the (given) datafiles again")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = build_data_catalog(args.datafiles, args.force)
+    for name, entry in sorted(catalog["files"].items()):
+        rprint(f"[blue]Info:[/blue] {name}: {entry['rows']} rows, {len(entry['columns'])} columns")
+    rprint(f"[green]Catalog of {len(catalog['files'])} datafiles ready[/green] ({time.perf_counter() - start:.1f} s)")
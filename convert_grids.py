@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Move the grid cells of contour datafiles into memory-mapped grid stores.
+
+    python3 convert_grids.py my_contours            # writes input/data/my_contours_grids.pkl
+    python3 run_plot_scripts.py -s my_plots         # with --datafile my_contours_grids
+
+The converted datafile keeps every scalar column and replaces each array cell
+by an ``npy:`` reference into ``input/data/<name>.grids/``, so contour batches
+page in only the grids they aggregate.
+"""
+
+import sys
+import os
+import argparse
+import time
+
+from rich import print as rprint
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+
+from lib.grids import convert_grid_datafile
+
+DATA_DIR = os.path.join(REPO_ROOT, "input", "data")
+DATAFILE_SUFFIXES = (".pkl", ".pickle")
+
+
+def resolve_pickle(datafile):
+    """
+    Path of a pickled datafile given as a path or a name in input/data.
+    """
+    if os.path.isfile(datafile):
+        return datafile
+    for suffix in DATAFILE_SUFFIXES:
+        path = os.path.join(DATA_DIR, f"{datafile}{suffix}")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert grid columns of datafiles into memory-mapped grid stores.")
+    parser.add_argument("datafiles", nargs="+", help="Pickled datafiles (paths or names in input/data)")
+    parser.add_argument(
+        "-c", "--columns", nargs="+", default=None, help="Grid columns to convert (default: every array-valued column)"
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Name of the converted datafile (default <name>_grids, one datafile only)"
+    )
+    args = parser.parse_args()
+
+    if args.output is not None and len(args.datafiles) > 1:
+        parser.error("--output needs exactly one datafile")
+
+    exit_code = 0
+    for datafile in args.datafiles:
+        path = resolve_pickle(datafile)
+        if path is None:
+            rprint(f"[red]Error:[/red] Datafile '{datafile}' not found in {DATA_DIR}")
+            exit_code = 1
+            continue
+        start = time.perf_counter()
+        output_path, columns = convert_grid_datafile(path, args.columns, args.output)
+        if not columns:
+            rprint(f"[yellow]Warning:[/yellow] {datafile}: no array-valued columns to convert")
+        rprint(
+            f"[green]Saved {output_path}[/green] with {', '.join(columns) or 'no'} grid column(s) "
+            f"({time.perf_counter() - start:.1f} s)"
+        )
+    sys.exit(exit_code)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+"""
+Resident plot daemon: keeps lib, the macros and recently used datasets warm
+and runs macro invocations sent over a local Unix domain socket.
+
+    python3 plot_daemon.py serve &
+    python3 plot_daemon.py run scripts/script_compare_hist1d.py --datafile my_data
+    python3 run_plot_scripts.py -s my_plots --daemon
+    python3 plot_daemon.py stop
+
+Edits to the macros are picked up on every run; edits to src/lib need a restart.
+"""
+
+import sys
+import os
+import argparse
+import contextlib
+import io
+import json
+import runpy
+import socket
+import time
+import traceback
+from collections import OrderedDict
+
+from rich import print as rprint
+
+from batch_check import resolve_datafile
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.path.join(REPO_ROOT, "output", "cache", "plot_daemon.sock")
+DEFAULT_MAX_DATASETS = 4
+# Arguments that select what import_data loads; anything else only changes the plot
+IMPORT_KEY_ARGS = ("datafile", "configs", "names", "variables", "select")
+
+
+def _send_message(conn, message):
+    conn.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _receive_message(conn):
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        # json.dumps never emits raw newlines, so a trailing one ends the message
+        if chunk.endswith(b"\n"):
+            break
+    data = b"".join(chunks)
+    return json.loads(data) if data.strip() else None
+
+
+def _datafile_stamp(datafile):
+    if datafile is None:
+        return ()
+    return tuple((path, os.stat(path).st_mtime_ns) for path in resolve_datafile(str(datafile)))
+
+
+def make_cached_import(import_data, max_datasets=DEFAULT_MAX_DATASETS):
+    """
+    Wrap import_data with an LRU of loaded DataFrames keyed by the data
+    selection arguments and the datafile modification time. Callers get a
+    copy, so macros that modify their DataFrame do not touch the cache.
+    """
+    cache = OrderedDict()
+
+    def cached_import_data(args):
+        key = (
+            tuple(repr(getattr(args, name, None)) for name in IMPORT_KEY_ARGS),
+            _datafile_stamp(getattr(args, "datafile", None)),
+        )
+        if key not in cache:
+            cache[key] = import_data(args)
+            while len(cache) > max_datasets:
+                cache.popitem(last=False)
+        cache.move_to_end(key)
+        df = cache[key]
+        return df.copy() if hasattr(df, "copy") else df
+
+    cached_import_data.cache = cache
+    return cached_import_data
+
+
+def warm_up(max_datasets=DEFAULT_MAX_DATASETS):
+    """
+    Import matplotlib and lib once and route import_data through the dataset cache.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    scripts_dir = os.path.join(REPO_ROOT, "scripts")
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    from _bootstrap import ensure_src_path
+
+    ensure_src_path()
+
+    import lib  # noqa: F401
+    import lib.imports
+    import lib.plot  # noqa: F401
+
+    if not hasattr(lib.imports.import_data, "cache"):
+        lib.imports.import_data = make_cached_import(lib.imports.import_data, max_datasets)
+
+
+def run_macro(argv, cwd=None):
+    """
+    Run one macro invocation inside this process.
+
+    Args:
+        argv: Script path followed by its arguments
+        cwd: Working directory for the run (default: repository root)
+
+    Returns:
+        tuple: (returncode, captured output, list of saved figure paths)
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+
+    saved_paths = []
+    original_savefig = Figure.savefig
+
+    def recording_savefig(fig, fname, *args, **kwargs):
+        if isinstance(fname, (str, os.PathLike)):
+            saved_paths.append(os.path.abspath(os.fspath(fname)))
+        return original_savefig(fig, fname, *args, **kwargs)
+
+    buffer = io.StringIO()
+    returncode = 0
+    old_argv, old_cwd, old_path = sys.argv, os.getcwd(), list(sys.path)
+    try:
+        os.chdir(cwd or REPO_ROOT)
+        script = os.path.abspath(argv[0])
+        sys.argv = [argv[0], *argv[1:]]
+        sys.path.insert(0, os.path.dirname(script))
+        Figure.savefig = recording_savefig
+        # rc_context drops rcParams a macro changed (e.g. savefig.dpi) after the run
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer), matplotlib.rc_context():
+            try:
+                runpy.run_path(script, run_name="__main__")
+            except SystemExit as exc:
+                if exc.code is None or isinstance(exc.code, int):
+                    returncode = exc.code or 0
+                else:
+                    print(exc.code)
+                    returncode = 1
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        Figure.savefig = original_savefig
+        plt.close("all")
+        sys.argv = old_argv
+        sys.path[:] = old_path
+        os.chdir(old_cwd)
+
+    return returncode, buffer.getvalue(), saved_paths
+
+
+def handle_request(request):
+    """
+    Answer one decoded client request ("ping", "shutdown" or "run").
+    """
+    command = (request or {}).get("command", "run")
+    if command in ("ping", "shutdown"):
+        return {"status": "ok", "pid": os.getpid()}
+    if command != "run" or not request.get("argv"):
+        return {"returncode": 1, "output": f"Unknown request: {request}", "outputs": []}
+
+    start = time.perf_counter()
+    returncode, output, outputs = run_macro(request["argv"], request.get("cwd"))
+    return {
+        "returncode": returncode,
+        "output": output,
+        "outputs": outputs,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        _send_message(client, request)
+        return _receive_message(client)
+
+
+def daemon_available(socket_path=DEFAULT_SOCKET):
+    try:
+        return send_request({"command": "ping"}, socket_path, timeout=2) is not None
+    except OSError:
+        return False
+
+
+def run_via_daemon(argv, socket_path=DEFAULT_SOCKET, cwd=None):
+    """
+    Run a macro through a running daemon. Raises OSError if it is not reachable.
+
+    Returns:
+        tuple: (returncode, captured output, list of saved figure paths)
+    """
+    response = send_request(
+        {"command": "run", "argv": list(argv), "cwd": cwd or os.getcwd()}, socket_path
+    )
+    if response is None:
+        raise ConnectionError(f"No response from plot daemon at {socket_path}")
+    return response["returncode"], response["output"], response.get("outputs", [])
+
+
+def serve(socket_path=DEFAULT_SOCKET, max_datasets=DEFAULT_MAX_DATASETS):
+    if os.path.exists(socket_path):
+        if daemon_available(socket_path):
+            rprint(f"[red]Error:[/red] A plot daemon is already listening on {socket_path}")
+            return 1
+        os.unlink(socket_path)
+
+    warm_up(max_datasets)
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    rprint(f"[blue]Info:[/blue] Plot daemon {os.getpid()} listening on {socket_path}")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                request = _receive_message(conn)
+                response = handle_request(request)
+                if request and request.get("command", "run") == "run":
+                    rprint(
+                        f"[cyan]Ran[/cyan] {' '.join(request['argv'])} "
+                        f"(exit {response['returncode']}, {response.get('elapsed', 0):.2f} s)"
+                    )
+                _send_message(conn, response)
+            if request and request.get("command") == "shutdown":
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident plot daemon and client.")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket path (default: {os.path.relpath(DEFAULT_SOCKET)})",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Start the daemon in the foreground")
+    serve_parser.add_argument(
+        "--max_datasets",
+        type=int,
+        default=DEFAULT_MAX_DATASETS,
+        help="Number of loaded datasets kept in memory",
+    )
+    run_parser = subparsers.add_parser("run", help="Run a macro through the daemon")
+    run_parser.add_argument("argv", nargs=argparse.REMAINDER, help="Script path and its arguments")
+    subparsers.add_parser("ping", help="Check whether the daemon is running")
+    subparsers.add_parser("stop", help="Stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        sys.exit(serve(args.socket, args.max_datasets))
+
+    try:
+        if args.command == "run":
+            exit_code, output, outputs = run_via_daemon(args.argv, args.socket)
+            sys.stdout.write(output)
+            for path in outputs:
+                rprint(f"[green]Saved[/green] {path}")
+            sys.exit(exit_code)
+        send_request({"command": "shutdown" if args.command == "stop" else "ping"}, args.socket, timeout=2)
+        rprint(f"[blue]Info:[/blue] Plot daemon at {args.socket} {'stopped' if args.command == 'stop' else 'is running'}")
+    except OSError:
+        rprint(f"[red]Error:[/red] No plot daemon listening on {args.socket}")
+        sys.exit(1)
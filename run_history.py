@@ -0,0 +1,83 @@
+"""
+Per-line run history for the batch runners: wall time and peak memory keyed
+by the normalized command, used to schedule long lines first.
+"""
+
+import os
+import json
+import shlex
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY_FILE = os.path.join(REPO_ROOT, "output", "cache", "run_history.json")
+# Weight of the newest run in the smoothed wall time
+HISTORY_SMOOTHING = 0.5
+
+
+def normalize_command(script_name):
+    """
+    Canonical form of a batch line so whitespace and quoting do not split its history.
+    """
+    try:
+        return " ".join(shlex.quote(token) for token in shlex.split(script_name))
+    except ValueError:
+        return " ".join(script_name.split())
+
+
+def load_history(path=DEFAULT_HISTORY_FILE):
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_runs(runs, path=DEFAULT_HISTORY_FILE):
+    """
+    Merge finished runs into the history file.
+
+    Args:
+        runs: Iterable of (script_name, seconds, peak_rss_mb) with peak_rss_mb None if unknown
+        path: History file (written atomically)
+
+    Returns:
+        dict: The updated history
+    """
+    history = load_history(path)
+    for script_name, seconds, peak_rss_mb in runs:
+        key = normalize_command(script_name)
+        entry = history.get(key, {"runs": 0})
+        previous = entry.get("seconds")
+        entry["seconds"] = (
+            seconds
+            if previous is None
+            else HISTORY_SMOOTHING * seconds + (1 - HISTORY_SMOOTHING) * previous
+        )
+        entry["last_seconds"] = seconds
+        if peak_rss_mb is not None:
+            entry["peak_rss_mb"] = peak_rss_mb
+        entry["runs"] += 1
+        history[key] = entry
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(history, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+    return history
+
+
+def expected_seconds(history, script_name):
+    return history.get(normalize_command(script_name), {}).get("seconds")
+
+
+def longest_first(scripts, history):
+    """
+    Order batch lines for a worker pool: lines without history first (in file
+    order, so they get measured), then known lines by decreasing expected time.
+    """
+    unknown = [script_name for script_name in scripts if expected_seconds(history, script_name) is None]
+    known = [script_name for script_name in scripts if expected_seconds(history, script_name) is not None]
+    return unknown + sorted(known, key=lambda script_name: -expected_seconds(history, script_name))
@@ -0,0 +1,114 @@
+"""
+Append-only journal of finished batch lines so an interrupted batch can be resumed.
+
+Every line that finishes appends one JSON record with its status, outputs and
+a fingerprint of its inputs. ``--resume`` skips lines whose last record
+succeeded, whose fingerprint still matches and whose outputs still exist.
+"""
+
+import os
+import hashlib
+import json
+import threading
+import time
+
+from run_history import normalize_command
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOURNAL_DIR = os.path.join(REPO_ROOT, "output", "cache", "journals")
+
+_journal_lock = threading.Lock()
+
+
+def default_journal_path(kind, batch, shard=None):
+    suffix = f"_shard{shard[0]}of{shard[1]}" if shard is not None else ""
+    return os.path.join(DEFAULT_JOURNAL_DIR, f"{kind}_{batch}{suffix}.jsonl")
+
+
+def input_fingerprint(script_name, file_state):
+    """
+    Hash of the normalized command and the (mtime, size) of every input file.
+
+    Args:
+        script_name: Batch line
+        file_state: Mapping of input path to (mtime_ns, size)
+    """
+    digest = hashlib.sha1(normalize_command(script_name).encode())
+    for path in sorted(file_state):
+        digest.update(f"{path}\0{file_state[path]}\0".encode())
+    return digest.hexdigest()
+
+
+def reset_journal(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    open(path, "w").close()
+
+
+def append_journal(path, script_name, exit_code, seconds, outputs, fingerprint):
+    """
+    Append one finished line and flush it to disk before returning.
+    """
+    entry = {
+        "line": normalize_command(script_name),
+        "status": "ok" if exit_code == 0 else "failed",
+        "exit_code": exit_code,
+        "seconds": seconds,
+        "outputs": outputs,
+        "fingerprint": fingerprint,
+        "finished": time.time(),
+    }
+    with _journal_lock:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    return entry
+
+
+def load_journal(path):
+    """
+    Latest journal record per normalized command. A torn last line (the
+    process died mid-write) is ignored.
+    """
+    entries = {}
+    if not os.path.isfile(path):
+        return entries
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["line"]] = entry
+    return entries
+
+
+def plan_resume(scripts, journal, fingerprints):
+    """
+    Split a batch into lines that still need to run and lines already done.
+
+    Args:
+        scripts: Batch lines in file order
+        journal: Records from load_journal
+        fingerprints: Current input fingerprint per batch line
+
+    Returns:
+        tuple: (lines to run with previous failures first, lines skipped)
+    """
+    failed, pending, done = [], [], []
+    for script_name in scripts:
+        entry = journal.get(normalize_command(script_name))
+        if entry is None:
+            pending.append(script_name)
+        elif (
+            entry["status"] == "ok"
+            and entry["fingerprint"] == fingerprints[script_name]
+            and all(os.path.exists(path) for path in entry.get("outputs", []))
+        ):
+            done.append(script_name)
+        elif entry["status"] == "failed":
+            failed.append(script_name)
+        else:
+            pending.append(script_name)
+    return failed + pending, done
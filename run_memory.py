@@ -0,0 +1,120 @@
+"""
+Memory-aware admission control for the batch runners: lines are admitted
+against a budget using their recorded (or estimated) peak RSS.
+"""
+
+import os
+import glob
+import shlex
+import threading
+
+from run_history import normalize_command
+
+# Baseline of a macro process (python, numpy, pandas, matplotlib) in MB
+DEFAULT_BASE_MB = 200.0
+# Unpickled DataFrames usually take a few times their file size
+DATAFILE_MEMORY_FACTOR = 3.0
+# Share of the available memory used by --mem_budget auto
+AUTO_BUDGET_FRACTION = 0.8
+# Exit codes of a process killed with SIGKILL (the kernel OOM killer)
+MEMORY_KILL_CODES = (-9, 137)
+
+
+def available_memory_mb():
+    """
+    MemAvailable from /proc/meminfo in MB, or None where it is not available.
+    """
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return float(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def parse_memory_budget(value):
+    """
+    Convert a --mem_budget value ("auto" or megabytes) to MB. Returns None
+    to disable admission control.
+    """
+    if value is None:
+        return None
+    if str(value).lower() == "auto":
+        available = available_memory_mb()
+        return None if available is None else AUTO_BUDGET_FRACTION * available
+    return float(value)
+
+
+def _datafile_size_mb(script_name):
+    try:
+        tokens = shlex.split(script_name)
+    except ValueError:
+        return 0.0
+    size = 0
+    for idx, token in enumerate(tokens):
+        if token != "--datafile" or idx + 1 >= len(tokens):
+            continue
+        datafile = tokens[idx + 1]
+        paths = [datafile] if os.path.isfile(datafile) else glob.glob(
+            os.path.join("input", "data", f"{glob.escape(datafile)}.*")
+        )
+        size += sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+    return size / (1024 * 1024)
+
+
+def estimate_peak_mb(script_name, history, base_mb=DEFAULT_BASE_MB):
+    """
+    Expected peak RSS of a batch line: the recorded peak when there is one,
+    otherwise the process baseline plus a multiple of its datafile size.
+    """
+    recorded = history.get(normalize_command(script_name), {}).get("peak_rss_mb")
+    if recorded is not None:
+        return float(recorded)
+    return base_mb + DATAFILE_MEMORY_FACTOR * _datafile_size_mb(script_name)
+
+
+def is_memory_kill(exit_code, captured_output=""):
+    # A MemoryError the script caught and recovered from is not a failed run
+    return exit_code in MEMORY_KILL_CODES or (exit_code != 0 and "MemoryError" in (captured_output or ""))
+
+
+class MemoryBudget:
+    """
+    Counting admission gate in MB shared by the worker threads.
+
+    A request larger than the budget is admitted once nothing else runs, so
+    every line can make progress. Exclusive requests (retries after a memory
+    kill) stop new admissions until they have run alone.
+    """
+
+    def __init__(self, budget_mb):
+        self.budget_mb = float(budget_mb)
+        self.used_mb = 0.0
+        self.running = 0
+        self.exclusive_waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, mb, exclusive=False):
+        mb = min(float(mb), self.budget_mb)
+        with self._condition:
+            if exclusive:
+                self.exclusive_waiting += 1
+                self._condition.wait_for(lambda: self.running == 0)
+                self.exclusive_waiting -= 1
+                mb = self.budget_mb
+            else:
+                self._condition.wait_for(
+                    lambda: self.exclusive_waiting == 0
+                    and (self.running == 0 or self.used_mb + mb <= self.budget_mb)
+                )
+            self.used_mb += mb
+            self.running += 1
+        return mb
+
+    def release(self, mb):
+        with self._condition:
+            self.used_mb -= mb
+            self.running -= 1
+            self._condition.notify_all()
@@ -8,11 +8,21 @@ import sys
 import os
 import argparse
 import json
+import glob
 import shlex
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from rich import print as rprint
 
+from plot_daemon import DEFAULT_SOCKET, run_via_daemon
+from run_history import DEFAULT_HISTORY_FILE, load_history, longest_first, normalize_command, record_runs
+from run_memory import DEFAULT_BASE_MB, MemoryBudget, estimate_peak_mb, is_memory_kill, parse_memory_budget
+from batch_check import datafile_pattern, report_check
+from run_reports import default_report_path, extract_output_paths, parse_shard, shard_lines, write_report
+from run_journal import append_journal, default_journal_path, input_fingerprint, load_journal, plan_resume, reset_journal
+
 # Add debug and show flags to run_all.py
 parser = argparse.ArgumentParser(description="Run all scripts with debug output.")
 parser.add_argument(
@@ -26,6 +36,91 @@ parser.add_argument(
     "-p", "--plot", action="store_true", help="Show plots after running scripts"
 )
 parser.add_argument("-d", "--debug", action="store_true", help="Enable debug output")
+parser.add_argument(
+    "--daemon",
+    type=str,
+    nargs="?",
+    const=DEFAULT_SOCKET,
+    default=None,
+    help="Run scripts through a running plot_daemon.py (optional socket path)",
+)
+parser.add_argument(
+    "-j", "--jobs", type=int, default=1, help="Number of scripts run in parallel"
+)
+parser.add_argument(
+    "-w",
+    "--watch",
+    action="store_true",
+    help="Keep running and rerun the lines whose datafile, config or macro changed",
+)
+parser.add_argument(
+    "--interval",
+    type=float,
+    default=1.0,
+    help="Polling interval in seconds for --watch",
+)
+parser.add_argument(
+    "--debounce",
+    type=float,
+    default=0.5,
+    help="Seconds the inputs must stay unchanged before --watch reruns",
+)
+parser.add_argument(
+    "--history",
+    type=str,
+    default=DEFAULT_HISTORY_FILE,
+    help="Run history file used to schedule long scripts first",
+)
+parser.add_argument(
+    "--no_history",
+    action="store_true",
+    help="Neither record nor use the run history",
+)
+parser.add_argument(
+    "--mem_budget",
+    type=str,
+    default=None,
+    help="Memory budget in MB (or 'auto') that parallel scripts are admitted against",
+)
+parser.add_argument(
+    "--mem_base",
+    type=float,
+    default=DEFAULT_BASE_MB,
+    help="Peak memory in MB assumed for a script without history, before its datafile size",
+)
+parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    default=None,
+    help="Run only shard i/N of the batch (stable assignment by line hash)",
+)
+parser.add_argument(
+    "--shard_weighted",
+    action="store_true",
+    help="Balance shards by the recorded run times (every node needs the same --history file)",
+)
+parser.add_argument(
+    "--report",
+    type=str,
+    default=None,
+    help="Write a JSON run report (default with --shard: output/reports/plots_<scripts>_shard<i>of<N>.json)",
+)
+parser.add_argument(
+    "--resume",
+    action="store_true",
+    help="Skip lines the journal records as done with unchanged inputs; retry failures first",
+)
+parser.add_argument(
+    "--journal",
+    type=str,
+    default=None,
+    help="Journal file (default: output/cache/journals/plots_<scripts>[_shard<i>of<N>].jsonl)",
+)
+parser.add_argument(
+    "--check",
+    action="store_true",
+    help="Validate every line (arguments, datafile, columns) without running the scripts",
+)
 args = parser.parse_args()
 
 
@@ -40,9 +135,19 @@ def load_output_paths(kind):
     return config.get(kind, {})
 
 
-def run_script(script_name):
+def run_script(script_name, socket_path=None, stream=True):
     script_name = " ".join(script_name.split())  # Remove extra spaces
-    rprint(f"\n[cyan]Running[/cyan] {script_name}")
+    if stream:
+        rprint(f"\n[cyan]Running[/cyan] {script_name}")
+    if socket_path is not None:
+        try:
+            exit_code, captured_output, _ = run_via_daemon(shlex.split(script_name), socket_path)
+            if stream:
+                sys.stdout.write(captured_output)
+            # The daemon's memory is shared between runs, so there is no per-line peak
+            return exit_code, captured_output.strip(), None
+        except OSError:
+            rprint(f"[yellow]Warning:[/yellow] Plot daemon not reachable at {socket_path}. Running in a subprocess.")
     captured_lines = []
     proc = subprocess.Popen(
         [sys.executable] + shlex.split(script_name),
@@ -51,62 +156,339 @@ def run_script(script_name):
         text=True,
     )
     for line in proc.stdout:
-        sys.stdout.write(line)
+        if stream:
+            sys.stdout.write(line)
         captured_lines.append(line)
-    proc.wait()
+    peak_rss_mb = None
+    if hasattr(os, "wait4"):
+        # wait4 reports the resource usage of this child only
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    else:
+        proc.wait()
     captured_output = "".join(captured_lines).strip()
-    return proc.returncode, captured_output
+    return proc.returncode, captured_output, peak_rss_mb
 
 
-if __name__ == "__main__":
-    output_paths = load_output_paths("plots")
+# Files every plot macro reads besides its own datafile and source
+SHARED_DEPENDENCIES = (
+    os.path.join("config", "*.json"),
+    os.path.join("src", "lib", "*.py"),
+    os.path.join("scripts", "common_args.py"),
+    os.path.join("scripts", "_bootstrap.py"),
+)
 
-    # Read txt file with list of scripts to run in input/plots/{args.scripts}_scripts.txt
-    script_file = os.path.join("input", "plots", f"{args.scripts}_scripts.txt")
-    if os.path.isfile(script_file):
-        with open(script_file, "r") as f:
-            scripts = [
-                line.strip() for line in f if line.strip() and not line.startswith("#")
-            ]
+
+def read_script_lines(script_file):
+    with open(script_file, "r") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def build_command(script_name, external_outputs):
+    full_script = script_name
+    if (
+        external_outputs
+        and " -o " not in full_script
+        and " --output " not in full_script
+    ):
+        output_args = " ".join([shlex.quote(path) for path in external_outputs])
+        full_script += f" -o {output_args}"
+    if args.plot:
+        full_script += " -p"
+    if args.debug:
+        full_script += " -d"
+    return full_script
+
+
+def run_batch(scripts, external_outputs, jobs=1, journal=None, first=()):
+    """
+    Run the batch lines, streaming output when sequential. With jobs > 1 the
+    lines are submitted longest-first according to the run history, and each
+    line's output is printed in file order once it and the lines above it finish.
+    Lines in ``first`` (e.g. earlier failures) start before all others. With a
+    ``journal`` path every finished line is appended to the journal.
+
+    Returns:
+        list: (original_script_line, exit_code, captured_output, seconds, peak_rss_mb)
+        per line in file order
+    """
+    records = {}
+    timings = []
+    latest = {}
+    history = {} if args.no_history else load_history(args.history)
+    budget = None
+    if jobs > 1 and args.mem_budget is not None:
+        budget_mb = parse_memory_budget(args.mem_budget)
+        if budget_mb is None:
+            rprint("[yellow]Warning:[/yellow] Available memory unknown. Running without a memory budget.")
+        else:
+            budget = MemoryBudget(budget_mb)
+            rprint(f"[blue]Info:[/blue] Admitting scripts against a {budget_mb:.0f} MB memory budget")
+
+    def run_once(script_name):
+        start = time.perf_counter()
+        exit_code, captured_output, peak_rss_mb = run_script(
+            build_command(script_name, external_outputs), args.daemon, stream=jobs <= 1
+        )
+        timings.append((script_name, time.perf_counter() - start, peak_rss_mb))
+        latest[script_name] = timings[-1][1:]
+        return exit_code, captured_output
+
+    def run_line(script_name):
+        if budget is None:
+            return run_once(script_name)
+
+        estimate = estimate_peak_mb(script_name, history, args.mem_base)
+        reserved = budget.acquire(estimate)
+        try:
+            exit_code, captured_output = run_once(script_name)
+        finally:
+            budget.release(reserved)
+
+        if is_memory_kill(exit_code, captured_output):
+            rprint(
+                f"[yellow]Warning:[/yellow] {' '.join(script_name.split())} was killed for memory "
+                f"(estimated {estimate:.0f} MB). Requeuing it to run alone."
+            )
+            reserved = budget.acquire(estimate, exclusive=True)
+            try:
+                exit_code, captured_output = run_once(script_name)
+            finally:
+                budget.release(reserved)
+        return exit_code, captured_output
+
+    def run_and_journal(script_name):
+        if journal is None:
+            return run_line(script_name)
+        # Fingerprint before running, so inputs edited mid-run count as changed
+        fingerprint = input_fingerprint(script_name, snapshot_files(script_dependencies(script_name)))
+        exit_code, captured_output = run_line(script_name)
+        append_journal(
+            journal,
+            script_name,
+            exit_code,
+            latest[script_name][0],
+            extract_output_paths(captured_output),
+            fingerprint,
+        )
+        return exit_code, captured_output
+
+    first = set(first)
+    run_order = longest_first(scripts, history) if jobs > 1 else list(scripts)
+    run_order = [line for line in run_order if line in first] + [line for line in run_order if line not in first]
+
+    if jobs <= 1:
+        for script_name in run_order:
+            records[script_name] = run_and_journal(script_name)
+            report_line(script_name, *records[script_name], streamed=True)
     else:
-        rprint(f"[red]Error:[/red] Script file {script_file} not found.")
-        sys.exit(1)
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                script_name: pool.submit(run_and_journal, script_name)
+                for script_name in run_order
+            }
+            for script_name in scripts:
+                records[script_name] = futures[script_name].result()
+                report_line(script_name, *records[script_name], streamed=False)
+
+    if not args.no_history:
+        record_runs(timings, args.history)
+    return [(script_name, *records[script_name], *latest[script_name]) for script_name in scripts]
 
-    # Each entry: (original_script_line, exit_code, captured_output)
-    run_records = []
-    for script_name in scripts:
-        external_outputs = output_paths.get(args.scripts) or []
-        # Ensure external_outputs is a list
-        if not isinstance(external_outputs, list):
-            external_outputs = [external_outputs]
-
-        full_script = script_name
-        if (
-            external_outputs
-            and " -o " not in full_script
-            and " --output " not in full_script
-        ):
-            output_args = " ".join([shlex.quote(path) for path in external_outputs])
-            full_script += f" -o {output_args}"
-        if args.plot:
-            full_script += " -p"
-        if args.debug:
-            full_script += " -d"
-
-        exit_code, captured_output = run_script(full_script)
-
-        if exit_code != 0:
-            rprint(f"[yellow]Script failed (exit {exit_code}):[/yellow] {' '.join(script_name.split())}")
-
-        run_records.append((script_name, exit_code, captured_output))
 
+def report_line(script_name, exit_code, captured_output, streamed):
+    if not streamed:
+        rprint(f"\n[cyan]Ran[/cyan] {' '.join(script_name.split())}")
+        if captured_output:
+            print(captured_output)
+    if exit_code != 0:
+        rprint(f"[yellow]Script failed (exit {exit_code}):[/yellow] {' '.join(script_name.split())}")
+
+
+def report_batch(run_records):
     if all(r[1] == 0 for r in run_records):
         rprint("\n[green]All scripts executed successfully![/green]")
     else:
         rprint("\n[red]--- Failed scripts summary ---[/red]")
-        for original_cmd, result, output in run_records:
+        for original_cmd, result, output, *_ in run_records:
             if result != 0:
                 rprint(f"\n[red]Error (exit {result}):[/red] {' '.join(original_cmd.split())}")
                 if output:
                     last_lines = "\n".join(output.splitlines()[-10:])
                     rprint(f"[dim]{last_lines}[/dim]")
+
+
+def _option_values(tokens, option):
+    values = []
+    for idx, token in enumerate(tokens):
+        if token.startswith(f"{option}="):
+            values.append(token.split("=", 1)[1])
+        elif token == option:
+            for value in tokens[idx + 1 :]:
+                if value.startswith("-"):
+                    break
+                values.append(value)
+    return values
+
+
+def script_dependencies(script_name):
+    """
+    Glob patterns of the files a batch line reads: the macro source, the shared
+    helpers, lib modules and configs, and its datafile(s) (input/data/<name>.*
+    for bare names, as batch_check resolves them).
+    Patterns are re-globbed on every poll, so a datafile that does not exist
+    yet is picked up when it lands.
+    """
+    tokens = shlex.split(script_name)
+    patterns = [token for token in tokens if token.endswith(".py")][:1]
+    patterns.extend(SHARED_DEPENDENCIES)
+    for datafile in _option_values(tokens, "--datafile"):
+        if os.sep in datafile or os.path.exists(datafile):
+            patterns.append(datafile)
+        else:
+            patterns.append(datafile_pattern(datafile))
+    return tuple(patterns)
+
+
+def snapshot_files(patterns):
+    """
+    Map every regular file matched by ``patterns`` to its (mtime, size).
+    """
+    state = {}
+    for pattern in patterns:
+        for path in glob.glob(pattern):
+            # Directories such as event indexes are derived data, not inputs
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def snapshot_scripts(dependencies):
+    """
+    Snapshot the inputs of every batch line, globbing each shared pattern once.
+    """
+    pattern_states = {}
+    states = {}
+    for script_name, patterns in dependencies.items():
+        state = {}
+        for pattern in patterns:
+            if pattern not in pattern_states:
+                pattern_states[pattern] = snapshot_files([pattern])
+            state.update(pattern_states[pattern])
+        states[script_name] = state
+    return states
+
+
+def watch_batch(script_file, external_outputs, jobs=1, interval=1.0, debounce=0.5):
+    """
+    Poll the inputs of every batch line and rerun only the affected lines.
+    Lines added to or edited in the batch file itself are run as well.
+    """
+    scripts = read_script_lines(script_file)
+    dependencies = {script_name: script_dependencies(script_name) for script_name in scripts}
+
+    def current_state():
+        return snapshot_files([script_file]), snapshot_scripts(dependencies)
+
+    last_run = current_state()
+    watched = {path for state in last_run[1].values() for path in state}
+    rprint(
+        f"\n[blue]Info:[/blue] Watching {len(watched)} files for {len(scripts)} scripts. Press Ctrl+C to stop."
+    )
+    try:
+        while True:
+            time.sleep(interval)
+            state = current_state()
+            if state == last_run:
+                continue
+            # Debounce: wait until writers (e.g. a pickle being copied) are done
+            while True:
+                time.sleep(debounce)
+                settled = current_state()
+                if settled == state:
+                    break
+                state = settled
+
+            batch_state, line_states = state
+            affected = [
+                script_name
+                for script_name in scripts
+                if line_states[script_name] != last_run[1][script_name]
+            ]
+            if batch_state != last_run[0]:
+                previous = set(scripts)
+                scripts = read_script_lines(script_file)
+                dependencies = {script_name: script_dependencies(script_name) for script_name in scripts}
+                affected = [
+                    script_name
+                    for script_name in scripts
+                    if script_name not in previous or script_name in affected
+                ]
+                state = current_state()
+            last_run = state
+
+            if not affected:
+                continue
+            rprint(f"\n[blue]Info:[/blue] Inputs changed. Rerunning {len(affected)} of {len(scripts)} scripts.")
+            report_batch(run_batch(affected, external_outputs, jobs))
+    except KeyboardInterrupt:
+        rprint("\n[blue]Info:[/blue] Stopped watching.")
+
+
+if __name__ == "__main__":
+    output_paths = load_output_paths("plots")
+
+    # Read txt file with list of scripts to run in input/plots/{args.scripts}_scripts.txt
+    script_file = os.path.join("input", "plots", f"{args.scripts}_scripts.txt")
+    if os.path.isfile(script_file):
+        scripts = read_script_lines(script_file)
+    else:
+        rprint(f"[red]Error:[/red] Script file {script_file} not found.")
+        sys.exit(1)
+
+    external_outputs = output_paths.get(args.scripts) or []
+    # Ensure external_outputs is a list
+    if not isinstance(external_outputs, list):
+        external_outputs = [external_outputs]
+
+    if args.shard is not None:
+        history = load_history(args.history) if args.shard_weighted else None
+        scripts = shard_lines(scripts, *args.shard, history=history)
+        rprint(f"[blue]Info:[/blue] Shard {args.shard[0]}/{args.shard[1]}: running {len(scripts)} scripts")
+
+    if args.check:
+        sys.exit(report_check(scripts))
+
+    journal_path = args.journal or default_journal_path("plots", args.scripts, args.shard)
+    failed_before = []
+    if args.resume:
+        journal = load_journal(journal_path)
+        fingerprints = {
+            script_name: input_fingerprint(script_name, snapshot_files(script_dependencies(script_name)))
+            for script_name in scripts
+        }
+        pending, done = plan_resume(scripts, journal, fingerprints)
+        failed_before = [
+            script_name
+            for script_name in pending
+            if journal.get(normalize_command(script_name), {}).get("status") == "failed"
+        ]
+        rprint(
+            f"[blue]Info:[/blue] Resuming: {len(done)} scripts already done, "
+            f"{len(failed_before)} failed before, {len(pending) - len(failed_before)} still to run"
+        )
+        scripts = [script_name for script_name in scripts if script_name in pending]
+    else:
+        reset_journal(journal_path)
+
+    started = time.time()
+    run_records = run_batch(scripts, external_outputs, args.jobs, journal=journal_path, first=failed_before)
+    report_batch(run_records)
+    if args.report is not None or args.shard is not None:
+        report_path = args.report or default_report_path("plots", args.scripts, args.shard)
+        write_report(report_path, "plots", args.scripts, args.shard, run_records, started)
+
+    if args.watch:
+        watch_batch(script_file, external_outputs, args.jobs, args.interval, args.debounce)
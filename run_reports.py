@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+"""
+Batch sharding and JSON run reports for the batch runners.
+
+Split a batch over nodes without a scheduler, then combine the reports:
+
+    python3 run_plot_scripts.py -s thesis --shard 1/3   # on node 1
+    python3 run_plot_scripts.py -s thesis --shard 2/3   # on node 2
+    python3 run_plot_scripts.py -s thesis --shard 3/3   # on node 3
+    python3 run_reports.py merge output/reports/plots_thesis_shard*of3.json
+"""
+
+import sys
+import os
+import argparse
+import hashlib
+import json
+import re
+import socket
+import statistics
+import time
+
+from rich import print as rprint
+
+from run_history import expected_seconds, normalize_command
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REPORT_DIR = os.path.join(REPO_ROOT, "output", "reports")
+REPORT_TAIL_LINES = 10
+OUTPUT_PATH_PATTERN = re.compile(r"[\w./~+-]+\.(?:png|pdf|svg|eps|jpg|tex|html|csv)\b")
+
+
+def parse_shard(value):
+    """
+    argparse type for ``--shard i/N`` with 1 <= i <= N. Returns (i, N).
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like i/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard index must be between 1 and N, got {value!r}")
+    return index, count
+
+
+def line_hash(script_name):
+    """
+    Stable hash of a batch line, identical on every node and Python process.
+    """
+    digest = hashlib.sha1(normalize_command(script_name).encode()).hexdigest()
+    return int(digest[:16], 16)
+
+
+def shard_lines(scripts, index, count, history=None):
+    """
+    Return the batch lines of shard ``index`` (1-based) out of ``count``.
+
+    Without ``history`` a line belongs to shard ``hash % count``. With history
+    the lines are packed longest-first onto the least loaded shard, which
+    balances wall time as long as every node reads the same history file.
+    Lines without history count as the median known cost.
+    """
+    if count == 1:
+        return list(scripts)
+    if history is None:
+        return [script_name for script_name in scripts if line_hash(script_name) % count == index - 1]
+
+    costs = {script_name: expected_seconds(history, script_name) for script_name in scripts}
+    known = [cost for cost in costs.values() if cost is not None]
+    default_cost = statistics.median(known) if known else 1.0
+    costs = {script_name: default_cost if cost is None else cost for script_name, cost in costs.items()}
+
+    loads = [0.0] * count
+    assignment = {}
+    for script_name in sorted(costs, key=lambda script_name: (-costs[script_name], line_hash(script_name))):
+        shard = min(range(count), key=lambda k: (loads[k], k))
+        loads[shard] += costs[script_name]
+        assignment[script_name] = shard
+    return [script_name for script_name in scripts if assignment[script_name] == index - 1]
+
+
+def extract_output_paths(captured_output):
+    """
+    Paths of saved figures and tables mentioned in a script's output that exist on disk.
+    """
+    paths = []
+    for match in OUTPUT_PATH_PATTERN.findall(captured_output or ""):
+        path = os.path.abspath(os.path.expanduser(match))
+        if os.path.isfile(path) and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def default_report_path(kind, batch, shard):
+    suffix = f"_shard{shard[0]}of{shard[1]}" if shard is not None else ""
+    return os.path.join(DEFAULT_REPORT_DIR, f"{kind}_{batch}{suffix}.json")
+
+
+def write_report(path, kind, batch, shard, run_records, started):
+    """
+    Write a JSON run report.
+
+    Args:
+        path: Report file
+        kind: "plots" or "tables"
+        batch: Name of the script list (the -s value)
+        shard: (i, N) or None
+        run_records: (line, exit_code, captured_output, seconds, peak_rss_mb) per line
+        started: Start time of the batch (time.time())
+    """
+    lines = []
+    for script_name, exit_code, captured_output, seconds, peak_rss_mb in run_records:
+        lines.append(
+            {
+                "line": script_name,
+                "exit_code": exit_code,
+                "seconds": seconds,
+                "peak_rss_mb": peak_rss_mb,
+                "outputs": extract_output_paths(captured_output),
+                "output_tail": "\n".join((captured_output or "").splitlines()[-REPORT_TAIL_LINES:]),
+            }
+        )
+    report = {
+        "kind": kind,
+        "batch": batch,
+        "shard": list(shard) if shard is not None else [1, 1],
+        "host": socket.gethostname(),
+        "started": started,
+        "finished": time.time(),
+        "lines": lines,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+    rprint(f"[blue]Info:[/blue] Run report saved to {path}")
+    return report
+
+
+def merge_reports(reports):
+    """
+    Combine shard reports into one report and list the shards that are missing.
+    """
+    counts = {tuple(report["shard"])[1] for report in reports}
+    seen = {tuple(report["shard"])[0] for report in reports}
+    count = max(counts) if counts else 1
+    return {
+        "kind": ",".join(sorted({report["kind"] for report in reports})),
+        "batch": ",".join(sorted({report["batch"] for report in reports})),
+        "shards": sorted(seen),
+        "shard_count": count,
+        "missing_shards": [index for index in range(1, count + 1) if index not in seen],
+        "inconsistent": len(counts) > 1,
+        "hosts": sorted({report["host"] for report in reports}),
+        "lines": [line for report in reports for line in report["lines"]],
+    }
+
+
+def print_summary(merged):
+    lines = merged["lines"]
+    failed = [line for line in lines if line["exit_code"] != 0]
+    total_seconds = sum(line["seconds"] or 0 for line in lines)
+    rprint(
+        f"[blue]Info:[/blue] {len(lines)} scripts from shard(s) {merged['shards']} of "
+        f"{merged['shard_count']} on {', '.join(merged['hosts'])} ({total_seconds:.0f} s of compute)"
+    )
+    if merged["inconsistent"]:
+        rprint("[yellow]Warning:[/yellow] Reports were produced with different shard counts.")
+    if merged["missing_shards"]:
+        rprint(f"[yellow]Warning:[/yellow] Missing reports for shard(s) {merged['missing_shards']}")
+
+    if not failed:
+        rprint("\n[green]All scripts executed successfully![/green]")
+        return 0
+    rprint("\n[red]--- Failed scripts summary ---[/red]")
+    for line in failed:
+        rprint(f"\n[red]Error (exit {line['exit_code']}):[/red] {' '.join(line['line'].split())}")
+        if line["output_tail"]:
+            rprint(f"[dim]{line['output_tail']}[/dim]")
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Combine batch run reports.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge_parser = subparsers.add_parser("merge", help="Merge shard reports and summarize failures")
+    merge_parser.add_argument("reports", nargs="+", help="Report JSON files")
+    merge_parser.add_argument("-o", "--output", type=str, default=None, help="Save the merged report")
+    args = parser.parse_args()
+
+    reports = []
+    for path in args.reports:
+        with open(path, "r") as f:
+            reports.append(json.load(f))
+    merged = merge_reports(reports)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(merged, f, indent=1)
+    exit_code = print_summary(merged)
+    sys.exit(exit_code if not merged["missing_shards"] else max(exit_code, 2))
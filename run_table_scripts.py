@@ -8,9 +8,15 @@ import os
 import argparse
 import json
 import shlex
+import subprocess
+import tempfile
+import time
 
 from rich import print as rprint
 
+from batch_check import report_check
+from run_reports import default_report_path, parse_shard, shard_lines, write_report
+
 parser = argparse.ArgumentParser(description="Run table scripts with debug output.")
 parser.add_argument(
     "-s",
@@ -23,6 +29,29 @@ parser.add_argument(
     "-p", "--plot", action="store_true", help="Show plots after running scripts"
 )
 parser.add_argument("-d", "--debug", action="store_true", help="Enable debug output")
+parser.add_argument(
+    "-b",
+    "--batch",
+    action="store_true",
+    help="Build all mean tables of the script file in one script_mean_table run (at the position of the first one)",
+)
+parser.add_argument(
+    "--shard",
+    type=parse_shard,
+    default=None,
+    help="Run only shard i/N of the batch (stable assignment by line hash)",
+)
+parser.add_argument(
+    "--report",
+    type=str,
+    default=None,
+    help="Write a JSON run report (default with --shard: output/reports/tables_<scripts>_shard<i>of<N>.json)",
+)
+parser.add_argument(
+    "--check",
+    action="store_true",
+    help="Validate every line (arguments, datafile, columns) without running the scripts",
+)
 args = parser.parse_args()
 
 
@@ -40,10 +69,33 @@ def load_output_paths(kind):
 def run_script(script_name):
     script_name = " ".join(script_name.split())
     rprint(f"\n[cyan]Running[/cyan] {script_name}")
-    result = os.system(f"{shlex.quote(sys.executable)} {script_name}")
-    if result != 0:
+    # Stream the output and keep it for the run report (output paths, log tail)
+    captured_lines = []
+    proc = subprocess.Popen(
+        [sys.executable] + shlex.split(script_name),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    for line in proc.stdout:
+        sys.stdout.write(line)
+        captured_lines.append(line)
+    proc.wait()
+    if proc.returncode != 0:
         rprint(f"[red]Error:[/red] {script_name} failed to execute.")
-    return result
+    return proc.returncode, "".join(captured_lines).strip()
+
+
+def is_mean_table_script(script_name):
+    """
+    Same rule as script_mean_table.load_table_specs: the first *.py token is the macro.
+    """
+    try:
+        tokens = shlex.split(script_name)
+    except ValueError:
+        return False
+    script = next((token for token in tokens if token.endswith(".py")), None)
+    return script is not None and os.path.basename(script) == "script_mean_table.py"
 
 
 if __name__ == "__main__":
@@ -59,36 +111,79 @@ if __name__ == "__main__":
         rprint(f"[red]Error:[/red] Script file {script_file} not found.")
         sys.exit(1)
 
+    if args.shard is not None:
+        scripts = shard_lines(scripts, *args.shard)
+        rprint(f"[blue]Info:[/blue] Shard {args.shard[0]}/{args.shard[1]}: running {len(scripts)} scripts")
+
+    if args.check:
+        sys.exit(report_check(scripts))
+
+    table_file = None
+    if args.batch:
+        # The mean tables share their datafiles, so load them once in a single run
+        batched = [line for line in scripts if is_mean_table_script(line)]
+        if batched:
+            tables = script_file
+            if args.shard is not None:
+                # Only this shard's tables go into the multi-table run
+                with tempfile.NamedTemporaryFile("w", suffix="_scripts.txt", delete=False) as f:
+                    f.write("\n".join(batched) + "\n")
+                    tables = table_file = f.name
+            # The combined run takes the place of the first mean-table line
+            first = scripts.index(batched[0])
+            scripts = [line for line in scripts if not is_mean_table_script(line)]
+            scripts.insert(first, f"scripts/script_mean_table.py --tables {shlex.quote(tables)}")
+
+    started = time.time()
+    run_records = []
     all_results = []
-    for script_name in scripts:
-        external_outputs = output_paths.get(args.scripts) or []
-        # Ensure external_outputs is a list
-        if not isinstance(external_outputs, list):
-            external_outputs = [external_outputs]
+    try:
+        for script_name in scripts:
+            external_outputs = output_paths.get(args.scripts) or []
+            # Ensure external_outputs is a list
+            if not isinstance(external_outputs, list):
+                external_outputs = [external_outputs]
         
-        if (
-            external_outputs
-            and " -o " not in script_name
-            and " --output " not in script_name
-        ):
-            output_args = " ".join([shlex.quote(path) for path in external_outputs])
-            script_name += f" -o {output_args}"
-        if args.plot:
-            script_name += " -p"
-        if args.debug:
-            script_name += " --debug"
-
-        this_result = run_script(script_name)
-
-        if this_result != 0:
-            script_name = " ".join(script_name.split())
-            rprint(f"Script {script_name} failed. Exiting.")
-
-        all_results.append(this_result)
-
-    if sum(all_results) == 0:
+            if (
+                external_outputs
+                and " -o " not in script_name
+                and " --output " not in script_name
+            ):
+                output_args = " ".join([shlex.quote(path) for path in external_outputs])
+                script_name += f" -o {output_args}"
+            if args.plot:
+                script_name += " -p"
+            if args.debug:
+                script_name += " --debug"
+
+            line_start = time.perf_counter()
+            this_result, captured_output = run_script(script_name)
+            run_records.append(
+                (
+                    scripts[len(all_results)],
+                    this_result,
+                    captured_output,
+                    time.perf_counter() - line_start,
+                    None,
+                )
+            )
+
+            if this_result != 0:
+                script_name = " ".join(script_name.split())
+                rprint(f"Script {script_name} failed. Exiting.")
+
+            all_results.append(this_result)
+    finally:
+        if table_file is not None:
+            os.unlink(table_file)
+
+    if all(result == 0 for result in all_results):
         rprint("\n[green]All scripts executed successfully![/green]")
     else:
         for i, result in enumerate(all_results):
             if result != 0:
                 rprint(f"[red]Error:[/red] {' '.join(scripts[i].split())}")
+
+    if args.report is not None or args.shard is not None:
+        report_path = args.report or default_report_path("tables", args.scripts, args.shard)
+        write_report(report_path, "tables", args.scripts, args.shard, run_records, started)
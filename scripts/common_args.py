@@ -187,6 +187,56 @@ COMMON_ARG_SPECS = {
             "help": "Reduce number of plotted lines for clarity",
         },
     },
+    "decimate": {
+        "flags": ["--decimate"],
+        "kwargs": {
+            "type": str,
+            "default": None,
+            "choices": ["minmax", "lttb"],
+            "help": (
+                "Downsample long plot/line/step series to the axes pixel width before drawing "
+                "(minmax keeps per-pixel extrema, lttb keeps the visually largest triangles)"
+            ),
+        },
+    },
+    "collection_threshold": {
+        "flags": ["--collection_threshold"],
+        "kwargs": {
+            "type": int,
+            "default": 50,
+            "help": (
+                "Draw --plot_type line/step scans as a single colormapped collection with a "
+                "colorbar when there are more than this many iterable values (0 disables)"
+            ),
+        },
+    },
+    "collection_cmap": {
+        "flags": ["--collection_cmap"],
+        "kwargs": {
+            "type": str,
+            "default": "viridis",
+            "help": "Colormap used for collection-rendered iterable lines",
+        },
+    },
+    "rasterize_threshold": {
+        "flags": ["--rasterize_threshold"],
+        "kwargs": {
+            "type": int,
+            "default": None,
+            "help": (
+                "Rasterize scatter, hist2d and image layers drawing more than this many points "
+                "(or mesh cells) in vector outputs; axes, text and legends stay vector"
+            ),
+        },
+    },
+    "rasterize_dpi": {
+        "flags": ["--rasterize_dpi"],
+        "kwargs": {
+            "type": int,
+            "default": 300,
+            "help": "Resolution of rasterized layers (used as the save DPI when a layer is rasterized)",
+        },
+    },
     "bins": {
         "flags": ["--bins", "-b"],
         "kwargs": {
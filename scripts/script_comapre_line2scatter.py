@@ -6,6 +6,7 @@ ensure_src_path()
 
 from pathlib import Path
 import argparse
+from functools import lru_cache
 import pickle
 
 import matplotlib.pyplot as plt
@@ -17,7 +18,7 @@ from common_args import add_common_args
 from lib import titlefontsize, xlabelfontsize, ysublabelfontsize, linelabelfontsize
 from lib.format import make_title_from_args
 from lib.selection import filter_dataframe
-from lib.plot import apply_legend_style, plot_data, create_common_subplots, create_common_two_panel_figure, apply_note_to_figure, apply_common_figure_margins, draw_vertical_lines, draw_horizontal_lines, place_point_label
+from lib.plot import apply_legend_style, plot_data, create_common_subplots, create_common_two_panel_figure, apply_note_to_figure, apply_common_figure_margins, draw_vertical_lines, draw_horizontal_lines, place_point_label, apply_rasterize_options, figure_save_dpi, draw_vertical_spans, draw_vertical_line_collection
 
 
 
@@ -58,6 +59,9 @@ def parse_args():
             "title",
             "output",
             "note",
+            "decimate",
+            "rasterize_threshold",
+            "rasterize_dpi",
             "debug",
         ],
         overrides={
@@ -265,7 +269,19 @@ def _resolve_column(row, explicit_column, fallback_candidates):
     return None
 
 
+def _row_columns(row):
+    return tuple(row.index) if hasattr(row, "index") else tuple(row)
+
+
 def _resolve_prefixed_column(row, prefix, preferred_tokens, fallback_tokens=()):
+    return _resolve_prefixed_column_for_schema(
+        _row_columns(row), prefix, tuple(preferred_tokens), tuple(fallback_tokens)
+    )
+
+
+@lru_cache(maxsize=256)
+def _resolve_prefixed_column_for_schema(columns, prefix, preferred_tokens, fallback_tokens=()):
+    """Resolve a prefixed column once per dataframe schema (``columns`` tuple)."""
     if prefix is None:
         return None
 
@@ -274,7 +290,7 @@ def _resolve_prefixed_column(row, prefix, preferred_tokens, fallback_tokens=()):
         return None
 
     lower_prefix = prefix_text.lower()
-    available_columns = list(row.index)
+    available = set(columns)
 
     exact_candidates = []
     for token in preferred_tokens:
@@ -303,13 +319,13 @@ def _resolve_prefixed_column(row, prefix, preferred_tokens, fallback_tokens=()):
     )
 
     for candidate in exact_candidates:
-        if candidate in row:
+        if candidate in available:
             return candidate
 
-    if prefix_text in row:
+    if prefix_text in available:
         return prefix_text
 
-    for column in available_columns:
+    for column in columns:
         column_text = str(column)
         column_lower = column_text.lower()
         if not (column_lower.startswith(lower_prefix) or column_lower.startswith(f"true{lower_prefix}")):
@@ -323,32 +339,37 @@ def _resolve_prefixed_column(row, prefix, preferred_tokens, fallback_tokens=()):
 
 
 def _resolve_lower_series_columns(row, prefix):
-    x_column = _resolve_prefixed_column(
-        row,
+    return _resolve_lower_series_columns_for_schema(_row_columns(row), prefix)
+
+
+@lru_cache(maxsize=64)
+def _resolve_lower_series_columns_for_schema(columns, prefix):
+    x_column = _resolve_prefixed_column_for_schema(
+        columns,
         prefix,
         preferred_tokens=("Time", "Peak", "X", "Position"),
         fallback_tokens=("TimeNS", "PeakNS", "X"),
     )
-    y_column = _resolve_prefixed_column(
-        row,
+    y_column = _resolve_prefixed_column_for_schema(
+        columns,
         prefix,
         preferred_tokens=("Area", "Count", "Value", "Amplitude", "Y"),
         fallback_tokens=("AreaPE", "Count", "Y"),
     )
-    start_column = _resolve_prefixed_column(
-        row,
+    start_column = _resolve_prefixed_column_for_schema(
+        columns,
         prefix,
         preferred_tokens=("Start",),
         fallback_tokens=("Start",),
     )
-    end_column = _resolve_prefixed_column(
-        row,
+    end_column = _resolve_prefixed_column_for_schema(
+        columns,
         prefix,
         preferred_tokens=("End",),
         fallback_tokens=("End",),
     )
-    center_column = _resolve_prefixed_column(
-        row,
+    center_column = _resolve_prefixed_column_for_schema(
+        columns,
         prefix,
         preferred_tokens=("Peak", "Center", "Time", "X"),
         fallback_tokens=("Peak", "Center", "X"),
@@ -378,6 +399,7 @@ def _plot_scatter_series(
     top_ax=None,
     vertical_color="gray",
     vertical_alpha=0.5,
+    rasterize_args=None,
 ):
     if x_column not in row:
         return
@@ -407,12 +429,21 @@ def _plot_scatter_series(
         return
 
     y_values = _to_array_or_zero(row, y_column, x_values.size)
-    ax.scatter(x_values, y_values, color=color, s=size, marker="o", label=label)
+    collection = ax.scatter(x_values, y_values, color=color, s=size, marker="o", label=label)
+    if rasterize_args is not None:
+        apply_rasterize_options(rasterize_args, collection, x_values.size)
 
     if vertical_lines and top_ax is not None:
-        for x_value in x_values:
-            ax.axvline(x_value, color=vertical_color, linestyle="--", linewidth=0.8, alpha=vertical_alpha, zorder=0)
-            top_ax.axvline(x_value, color=vertical_color, linestyle="--", linewidth=0.8, alpha=vertical_alpha, zorder=0)
+        for target_ax in (ax, top_ax):
+            draw_vertical_line_collection(
+                target_ax,
+                x_values,
+                color=vertical_color,
+                linestyle="--",
+                linewidth=0.8,
+                alpha=vertical_alpha,
+                zorder=0,
+            )
 
     if not show_range_bars:
         return
@@ -460,9 +491,9 @@ def _overlay_windows(ax, row, start_column, end_column, center_column, color):
     ends = np.asarray(row[end_column], dtype=float).ravel()
     peaks = np.asarray(row[center_column], dtype=float).ravel()
 
-    for idx in range(min(starts.size, ends.size, peaks.size)):
-        ax.axvspan(starts[idx], ends[idx], color=color, alpha=0.14, zorder=1)
-        ax.axvline(peaks[idx], color=color, linestyle="--", linewidth=0.8, alpha=0.8, zorder=2)
+    count = min(starts.size, ends.size, peaks.size)
+    draw_vertical_spans(ax, starts[:count], ends[:count], color=color, alpha=0.14, zorder=1)
+    draw_vertical_line_collection(ax, peaks[:count], color=color, linestyle="--", linewidth=0.8, alpha=0.8, zorder=2)
 
 
 def _resolve_output_path(args, row):
@@ -650,6 +681,7 @@ def main():
             top_ax=ax_top,
             vertical_color=active_color,
             vertical_alpha=0.55,
+            rasterize_args=args,
         )
 
         ax_bottom.set_ylabel(args.lower_labely, fontsize=ysublabelfontsize)
@@ -703,7 +735,8 @@ def main():
     apply_note_to_figure(fig, getattr(args, "note", None))
 
     output_path = _resolve_output_path(args, row)
-    fig.savefig(output_path, dpi=180)
+    # --rasterize_dpi only applies when a scatter layer was actually rasterized
+    fig.savefig(output_path, dpi=figure_save_dpi(fig) or 180)
     plt.close(fig)
 
     print("Saved line panel figure to", output_path)
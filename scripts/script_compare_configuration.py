@@ -14,6 +14,7 @@ from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_subtitle_from_args, make_title_from_args, make_config_label_from_args, make_config_color_and_style_from_args
 from lib.functions import resolution, gaussian
 from lib.imports import import_data, prepare_import
+from lib.resample import RESAMPLE_MODES, bin_edges_from_centers, resample_series
 from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines
 from lib.selection import prepare_selection, filter_dataframe
 from common_args import add_common_args, map_iterable_label, map_iterable_color, resolve_axis_label
@@ -58,6 +59,7 @@ add_common_args(
         "note",
         "title",
         "output",
+        "decimate",
         "debug",
     ],
     overrides={
@@ -160,6 +162,14 @@ parser.add_argument(
     help="Scale factor to apply to y values when projecting",
 )
 
+parser.add_argument(
+    "--project_mode",
+    type=str,
+    default="linear",
+    choices=list(RESAMPLE_MODES),
+    help="Resampling used when projecting: linear interpolation, step (nearest bin) or integral (bin contents preserved)",
+)
+
 parser.add_argument(
     "--iterable_mapping",
     type=str,
@@ -588,51 +598,18 @@ def main():
                             combined_errory = combined_errory + np.power(errory, 2)
 
                 if args.project is not None and config in args.project:
-                    # Interpolate the projected y values at the original x values to combine with the original y values
-                    interpy = np.interp(
+                    # Resample the projected spectrum back onto the original x values
+                    # so it can be combined with the original y values.
+                    projected_y, projected_errors = resample_series(
+                        [(x * args.project_scale) + args.project_offset],
+                        [y],
                         x,
-                        (x * args.project_scale) + args.project_offset,
-                        y,
-                        left=0,
-                    )
-                    error_interpy = (
-                        [
-                            np.interp(
-                                x,
-                                (
-                                    (x * args.project_scale) + args.project_offset
-                                    if args.project_offset is not None
-                                    and args.project_scale is not None
-                                    else x
-                                ),
-                                (
-                                    errory[i]
-                                    if errory[i] is not None
-                                    else np.zeros_like(x)
-                                ),
-                                left=0,
-                                right=0,
-                            )
-                            for i in range(2)
-                        ]
-                        if errory is not None and errory_sym == "asymmetric"
-                        else (
-                            np.interp(
-                                x,
-                                (
-                                    (x + args.project_offset) * args.project_scale
-                                    if args.project_offset is not None
-                                    and args.project_scale is not None
-                                    else x
-                                ),
-                                errory if errory is not None else np.zeros_like(x),
-                                left=0,
-                                right=0,
-                            )
-                            if errory is not None and errory_sym == "symmetric"
-                            else None
-                        )
+                        errors=[errory],
+                        mode=getattr(args, "project_mode", "linear"),
+                        fill=0.0,
                     )
+                    interpy = projected_y[0]
+                    error_interpy = projected_errors[0]
 
                     if args.operation == "squared_sum":
                         combinedy = combinedy + np.power(
@@ -671,19 +648,7 @@ def main():
                     rprint(
                         f"[yellow]Warning:[/yellow] Bins have different widths for Config: {config}, Name: {name}."
                     )
-                    # Compute suitable x_edges by extrapolating the first and last bins from the x and x_bins values
-                    x_edges = np.concatenate(
-                        [
-                            [x[0] - x_bins[0] / 2],
-                            x[:-1] + x_bins / 2,
-                            [x[-1] + x_bins[-1] / 2],
-                        ]
-                    )
-
-                else:
-                    x_edges = np.linspace(
-                        x[0] - x_bin / 2, x[-1] + x_bin / 2, len(x) + 1
-                    )
+                x_edges = bin_edges_from_centers(x)
             else:
                 rprint(f"[red]Error:[/red] Only found one x value. Skipping...")
                 continue
@@ -45,6 +45,10 @@ A typical dataframe row should look like:
         ]
     )
 
+Grid cells may also hold `npy:` references written by `convert_grids.py`
+(`lib.grids.store_grid_columns`), in which case the arrays are memory-mapped
+from `input/data/<datafile>.grids/` on demand instead of living in the dataframe.
+
 The macro draws the z matrix as an image-like background and overlays contours
 from the same z values. When `--operation squared_sum` is used, the combined
 contour/background is computed bin-by-bin as `sqrt(sum_i(z_i^2))`.
@@ -54,14 +58,17 @@ from _bootstrap import ensure_src_path
 
 ensure_src_path()
 
+from concurrent.futures import ProcessPoolExecutor
+
 from matplotlib.lines import Line2D
 from rich import print as rprint
 
 from lib import *
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_subtitle_from_args, make_title_from_args
+from lib.grids import as_float_array, open_shared_grid, share_grid
 from lib.imports import import_data, prepare_import
-from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
+from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label, apply_rasterize_options, figure_save_context
 
 from lib.selection import filter_dataframe
 from common_args import add_common_args, resolve_axis_label
@@ -108,6 +115,8 @@ add_common_args(
         "note",
         "title",
         "output",
+        "rasterize_threshold",
+        "rasterize_dpi",
         "debug",
     ],
     overrides={
@@ -277,6 +286,13 @@ parser.add_argument(
     help="Interpolation method used when --nan_fill interpolate",
 )
 
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=1,
+    help="Worker processes for per-config grid preparation (default 1: no pool; 0 uses all cores). The pool copies in-memory grids into shared memory",
+)
+
 
 
 args = parser.parse_args()
@@ -481,9 +497,9 @@ def fill_nan_image(z, x=None, y=None, strategy=None):
 
 
 def validate_grid_shapes(x, y, z):
-    x = np.asarray(x, dtype=float)
-    y = np.asarray(y, dtype=float)
-    z = np.asarray(z, dtype=float)
+    x = as_float_array(x)
+    y = as_float_array(y)
+    z = as_float_array(z)
 
     if z.ndim != 2:
         raise ValueError(f"{args.z} must be a 2D array, got shape {z.shape}.")
@@ -521,12 +537,16 @@ def grids_match(reference, candidate):
     )
 
 
-def aggregate_config_grid(df_config):
+def config_grid_cells(df_config):
+    return list(zip(df_config[args.x], df_config[args.y], df_config[args.z]))
+
+
+def aggregate_grid_cells(cells):
     reference_grid = None
     summed_z = None
 
-    for _, row in df_config.iterrows():
-        x, y, z = validate_grid_shapes(row[args.x], row[args.y], row[args.z])
+    for x, y, z in cells:
+        x, y, z = validate_grid_shapes(x, y, z)
         z = fill_nan_image(z, x=x, y=y)
         z = normalize_image(z)
 
@@ -537,7 +557,7 @@ def aggregate_config_grid(df_config):
         else:
             if not grids_match(reference_grid, (x, y)):
                 raise ValueError("All grids for a given selection must share the same x/y coordinates.")
-            summed_z = summed_z + z
+            summed_z += z
 
     if reference_grid is None:
         return None
@@ -545,6 +565,125 @@ def aggregate_config_grid(df_config):
     return {"x": reference_grid[0], "y": reference_grid[1], "z": summed_z}
 
 
+def prepare_config_grid(cells):
+    """Aggregate one configuration's grid cells and compute its contour products."""
+    grid = aggregate_grid_cells(cells)
+    if grid is None:
+        return None
+
+    grid["contour_image"] = None
+    grid["levels"] = []
+    if not getattr(args, "combined_contours_only", False):
+        grid["contour_image"] = smooth_contour_image(smooth_background_image(grid["z"]))
+        grid["levels"] = compute_contour_levels(grid["contour_image"], args.contour_sigmas)
+
+    return grid
+
+
+def _init_grid_worker(worker_args):
+    global args
+    args = worker_args
+
+
+def _prepare_shared_config_grid(descriptors):
+    segments = []
+    cells = []
+    try:
+        for row in descriptors:
+            cell = []
+            for descriptor in row:
+                segment, array = open_shared_grid(descriptor)
+                if segment is not None:
+                    segments.append(segment)
+                cell.append(array)
+            cells.append(tuple(cell))
+
+        grid = prepare_config_grid(cells)
+        if grid is not None:
+            # x/y may still be views into the shared segments.
+            grid["x"] = np.array(grid["x"])
+            grid["y"] = np.array(grid["y"])
+        return grid
+    finally:
+        del cells
+        for segment in segments:
+            segment.close()
+
+
+def resolve_worker_count(task_count):
+    workers = int(getattr(args, "workers", 1) or 0)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, task_count))
+
+
+def _prepare_config_grid_or_error(cells):
+    try:
+        return prepare_config_grid(cells)
+    except ValueError as exc:
+        return exc
+
+
+def prepare_config_grids(config_frames):
+    """Prepare the image products of every configuration of one panel.
+
+    Each configuration is independent, so with more than one worker the
+    aggregation, NaN fill, smoothing and level computation run in a process
+    pool. Grid cells reach the workers through shared memory (or as
+    ``npy:`` references), and only the drawing stays on the main process.
+
+    Returns:
+        list: One grid dict, ``None`` or ``ValueError`` per input frame
+    """
+    cell_lists = [config_grid_cells(df_config) for df_config in config_frames]
+    workers = resolve_worker_count(len(cell_lists))
+
+    if workers <= 1:
+        return [_prepare_config_grid_or_error(cells) for cells in cell_lists]
+
+    segments = []
+    try:
+        descriptor_lists = []
+        for cells in cell_lists:
+            descriptor_rows = []
+            for cell in cells:
+                row = []
+                for value in cell:
+                    segment, descriptor = share_grid(value)
+                    if segment is not None:
+                        segments.append(segment)
+                    row.append(descriptor)
+                descriptor_rows.append(tuple(row))
+            descriptor_lists.append(descriptor_rows)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_grid_worker,
+            initargs=(args,),
+        ) as pool:
+            futures = [
+                pool.submit(_prepare_shared_config_grid, descriptors)
+                for descriptors in descriptor_lists
+            ]
+            results = []
+            for cells, future in zip(cell_lists, futures):
+                try:
+                    results.append(future.result())
+                except ValueError as exc:
+                    results.append(exc)
+                except Exception as exc:
+                    # A crashed worker (e.g. BrokenProcessPool) must not cost the panel.
+                    rprint(
+                        f"[yellow]Warning:[/yellow] Grid worker failed ({type(exc).__name__}: {exc}). Preparing the configuration in the main process."
+                    )
+                    results.append(_prepare_config_grid_or_error(cells))
+        return results
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
 def draw_image_background(ax, fig, x, y, z, df=None):
     positive = smooth_background_image(z)
     if args.logz:
@@ -557,6 +696,7 @@ def draw_image_background(ax, fig, x, y, z, df=None):
         shading="auto",
         norm=LogNorm() if args.logz else None,
     )
+    apply_rasterize_options(args, mesh)
     cbar = fig.colorbar(mesh, ax=ax)
     if args.labelz is not None:
         z_label = args.labelz
@@ -714,6 +854,7 @@ def main():
         x_range_local = None
         y_range_local = None
 
+        config_tasks = []
         for cdx, (config, name) in enumerate(zip(configs, names)):
             df_config = subset.copy()
             if config is not None:
@@ -728,10 +869,13 @@ def main():
                     )
                 continue
 
-            try:
-                grid = aggregate_config_grid(df_config)
-            except ValueError as exc:
-                rprint(f"[red]Error:[/red] {exc}")
+            config_tasks.append((cdx, config, name, df_config))
+
+        config_grids = prepare_config_grids([task[3] for task in config_tasks])
+
+        for (cdx, config, name, _df_config), grid in zip(config_tasks, config_grids):
+            if isinstance(grid, ValueError):
+                rprint(f"[red]Error:[/red] {grid}")
                 continue
 
             if grid is None:
@@ -764,6 +908,8 @@ def main():
                     "x": x_grid,
                     "y": y_grid,
                     "z": z_grid,
+                    "contour_image": grid["contour_image"],
+                    "levels": grid["levels"],
                     "color": color,
                     "linestyle": linestyle,
                     "label": build_config_label(config, name, iterable),
@@ -798,10 +944,8 @@ def main():
         legend_handles = []
         if not args.combined_contours_only:
             for payload in payloads:
-                contour_image = smooth_contour_image(
-                    smooth_background_image(payload["z"])
-                )
-                levels = compute_contour_levels(contour_image, args.contour_sigmas)
+                contour_image = payload["contour_image"]
+                levels = payload["levels"]
                 if not levels:
                     continue
 
@@ -1002,7 +1146,8 @@ def main():
 
     output_file = make_name_from_args(args, prefix=None, suffix="contour.png")
     default_output_dir = os.path.join(os.path.dirname(__file__), "..", "output", "plots")
-    save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
+    with figure_save_context(fig):
+        save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
 
 if __name__ == "__main__":
@@ -16,7 +16,7 @@ from lib.selection import filter_dataframe
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_subtitle_from_args, make_title_from_args, make_config_label_from_args, make_config_color_and_style_from_args
 from lib.imports import import_data, prepare_import
-from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
+from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label, plot_line_collection
 
 from common_args import add_common_args, resolve_axis_label
 
@@ -35,6 +35,8 @@ add_common_args(
         "x",
         "iterable",
         "reduce",
+        "collection_threshold",
+        "collection_cmap",
         "select",
         "save_values",
         "bins",
@@ -138,6 +140,20 @@ def main():
             df_config[args.iterable].unique() if args.iterable is not None else [None]
         )
         two_line_mode = len(iterable_values) == 2
+
+        # Many iterable values are drawn as one colormapped collection per axis.
+        collection_threshold = getattr(args, "collection_threshold", 0) or 0
+        collection_mode = (
+            args.iterable is not None
+            and collection_threshold > 0
+            and len(iterable_values) > collection_threshold
+        )
+        collection_series = {idx: [] for idx in range(ncols)}
+        if collection_mode:
+            rprint(
+                f"[blue]Info:[/blue] Drawing {len(iterable_values)} values of {args.iterable} as a single line collection."
+            )
+
         for (idx, variable), (jdx, iterable) in product(
             enumerate(variables),
             enumerate(
@@ -145,7 +161,7 @@ def main():
             ),
         ):
             if args.iterable is not None:
-                if len(iterable_values) > 8 and args.reduce:
+                if len(iterable_values) > 8 and args.reduce and not collection_mode:
                     if jdx % 2 == 1:
                         rprint(
                             f"\tSkipping plotting for {args.iterable}={iterable} to avoid overcrowding"
@@ -231,7 +247,11 @@ def main():
                 ),
             )
             bin_centers = (bins[:-1] + bins[1:]) / 2
-            
+
+            if collection_mode:
+                collection_series[idx].append((bin_centers, hist, iterable))
+                continue
+
             # Generate label, color, and linestyle based on iterable type
             if args.iterable == "Config":
                 # When iterating over configs, use the config naming structure and styling
@@ -257,6 +277,21 @@ def main():
                 drawstyle="steps-mid",
             )
 
+        for idx, series in collection_series.items():
+            if not series:
+                continue
+
+            xs, ys, values = zip(*series)
+            plot_line_collection(
+                ax if ncols == 1 else ax[idx],
+                xs,
+                ys,
+                values,
+                drawstyle="steps-mid",
+                cmap=getattr(args, "collection_cmap", "viridis"),
+                colorbar_label=args.iterable,
+            )
+
         for idx, variable in enumerate(variables):
             if ncols == 1:
                 ax_current = ax
@@ -294,7 +329,7 @@ def main():
             if args.logx:
                 ax_current.semilogx()
 
-            if idx == ncols - 1:
+            if idx == ncols - 1 and not collection_series[idx]:
                 apply_legend_style(
                     ax_current,
                     title=args.iterable,
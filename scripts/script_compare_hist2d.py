@@ -16,7 +16,7 @@ from lib.selection import filter_dataframe
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_title_from_args, make_subtitle_from_args
 from lib.imports import import_data, prepare_import
-from lib.plot import apply_scientific_threshold_formatter, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
+from lib.plot import apply_scientific_threshold_formatter, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label, figure_save_context
 
 from common_args import add_common_args, resolve_axis_label
 
@@ -63,6 +63,8 @@ add_common_args(
         "point",
         "point_label",
         "note",
+        "rasterize_threshold",
+        "rasterize_dpi",
         "debug",
     ],
     overrides={
@@ -326,7 +328,8 @@ def main():
         default_output_dir = os.path.join(
             os.path.dirname(__file__), "..", "output", "plots"
         )
-        save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
+        with figure_save_context(fig):
+            save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
 
 if __name__ == "__main__":
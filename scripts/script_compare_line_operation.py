@@ -17,6 +17,7 @@ from lib.selection import filter_dataframe
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_title_from_args
 from lib.imports import import_data, prepare_import
+from lib.operations import line_operation_series, stack_lines
 from lib.plot import apply_legend_style, plot_data, create_common_subplots, create_common_two_panel_figure, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
 from common_args import add_common_args, load_computation_settings, map_iterable_label, map_iterable_color, resolve_plot_kwargs, resolve_axis_label
 
@@ -61,6 +62,7 @@ add_common_args(
         "point",
         "point_label",
         "note",
+        "decimate",
         "debug",
     ],
     overrides={
@@ -141,6 +143,20 @@ parser.add_argument(
     help="Reference iterable value for pairwise operations (overrides --reference)",
 )
 
+parser.add_argument(
+    "--all_references",
+    action="store_true",
+    default=False,
+    help="Compute pairwise operations against every line instead of a single reference",
+)
+
+parser.add_argument(
+    "--errory",
+    action="store_true",
+    default=False,
+    help="Read '<y>Error' uncertainties and propagate them through the operation",
+)
+
 parser.add_argument(
     "--bottom_labely",
     type=str,
@@ -254,6 +270,22 @@ def _extract_line_arrays(subset, x_col, y_col):
 
     return x, y
 
+def _extract_line_errors(subset, x_col, y_col, error_col):
+    """Return ``error_col`` aligned with the arrays of :func:`_extract_line_arrays`."""
+    if error_col not in subset.columns:
+        return None
+
+    expanded = subset.explode(column=[x_col, y_col, error_col])
+    try:
+        x = expanded[x_col].astype(float).to_numpy()
+        y = expanded[y_col].astype(float).to_numpy()
+        error = expanded[error_col].astype(float).to_numpy()
+    except ValueError:
+        return None
+
+    mask = ~np.isnan(x) & ~np.isnan(y)
+    return error[mask]
+
 def _extract_bottom_column_arrays(subset, x_col, bottom_col):
     expanded = subset.explode(column=[x_col, bottom_col])
     if expanded.empty:
@@ -331,83 +363,61 @@ def _resolve_comparable_style(sdx, args):
     )
     return ls, lw
 
-def _compute_pairwise(reference, other, operation):
-    if operation == "subtract":
-        return other - reference
-    if operation == "add":
-        return other + reference
-    if operation == "ratio":
-        with np.errstate(divide="ignore", invalid="ignore"):
-            result = np.divide(other, reference)
-        result[~np.isfinite(result)] = np.nan
-        return result
-    if operation == "relative_difference":
-        with np.errstate(divide="ignore", invalid="ignore"):
-            result = 100.0 * np.divide(other - reference, reference)
-        result[~np.isfinite(result)] = np.nan
-        return result
-    if operation == "absolute_relative_difference":
-        with np.errstate(divide="ignore", invalid="ignore"):
-            result = 100.0 * np.abs(np.divide(other - reference, reference))
-        result[~np.isfinite(result)] = np.nan
-        return result
-    if operation == "asymmetry":
-        with np.errstate(divide="ignore", invalid="ignore"):
-            denominator = 0.5 * (reference + other)
-            result = np.divide(reference - other, denominator)
-        result[~np.isfinite(result)] = np.nan
-        return result
-
-    raise ValueError(f"Unsupported pairwise operation: {operation}")
-
-def compute_bottom_series(labels, line_arrays, operation, reference_index=0):
+def compute_bottom_entries(
+    labels,
+    line_arrays,
+    operation,
+    reference_index=0,
+    x_values=None,
+    x_grid=None,
+    errors=None,
+    all_references=False,
+):
+    """Compute lower-panel series with the vectorized operation engine.
+
+    Lines are stacked into one array (resampled onto ``x_grid`` when their
+    ``x_values`` differ) and the operation is evaluated against the selected
+    reference, or against every line with ``all_references``.
+
+    Returns:
+        list: Dicts with ``label``, ``values``, ``errors`` and ``index`` (see
+        ``lib.operations.line_operation_series``)
+    """
     if len(labels) != len(line_arrays):
         raise ValueError("labels and line_arrays must have the same length")
     if len(line_arrays) == 0:
         return []
 
-    op = operation.lower()
-
-    if op in ["sum", "mean", "rms"]:
-        stacked = np.vstack(line_arrays)
-        if op == "sum":
-            y_out = np.sum(stacked, axis=0)
-            return [("sum", y_out)]
-        if op == "mean":
-            y_out = np.mean(stacked, axis=0)
-            return [("mean", y_out)]
-        y_out = np.sqrt(np.mean(stacked**2, axis=0))
-        return [("rms", y_out)]
-
-    if len(line_arrays) < 2:
-        return []
-
-    ref_idx = max(0, min(reference_index, len(line_arrays) - 1))
-    ref_label = labels[ref_idx]
-    ref_array = line_arrays[ref_idx]
+    if x_values is not None:
+        _, values, stacked_errors = stack_lines(
+            x_values, line_arrays, errors=errors, x_grid=x_grid
+        )
+    else:
+        values = np.vstack(line_arrays).astype(float)
+        stacked_errors = None
+        if errors is not None and any(e is not None for e in errors):
+            stacked_errors = np.vstack(
+                [
+                    np.full(values.shape[1], np.nan) if e is None else np.asarray(e, dtype=float)
+                    for e in errors
+                ]
+            )
 
-    output = []
-    for idx, (label, y_values) in enumerate(zip(labels, line_arrays)):
-        if idx == ref_idx:
-            continue
-        y_out = _compute_pairwise(ref_array, y_values, op)
-        if op == "subtract":
-            out_label = f"{label} - {ref_label}"
-        elif op == "add":
-            out_label = f"{label} + {ref_label}"
-        elif op == "ratio":
-            out_label = f"{label}/{ref_label}"
-        elif op == "relative_difference":
-            out_label = f"({label} - {ref_label})/{ref_label} [%]"
-        elif op == "absolute_relative_difference":
-            out_label = f"|{label} - {ref_label}|/{ref_label} [%]"
-        elif op == "asymmetry":
-            out_label = f"({ref_label} - {label})/(0.5*({ref_label}+{label}))"
-        else:
-            out_label = f"{label} ({op})"
-        output.append((out_label, y_out))
+    references = "all" if all_references else reference_index
+    return line_operation_series(
+        labels, values, operation, references=references, errors=stacked_errors
+    )
 
-    return output
+def compute_bottom_series(labels, line_arrays, operation, reference_index=0, x_values=None, x_grid=None):
+    entries = compute_bottom_entries(
+        labels,
+        line_arrays,
+        operation,
+        reference_index=reference_index,
+        x_values=x_values,
+        x_grid=x_grid,
+    )
+    return [(entry["label"], entry["values"]) for entry in entries]
 
 def _default_bottom_label(operation):
     labels = {
@@ -565,6 +575,8 @@ def main():
 
         top_labels = []
         top_arrays = []
+        top_x = []
+        top_errors = []
         bottom_arrays = []
         top_by_comparable = {}   # comparable_val -> ([labels], [arrays])
         bottom_by_comparable = {}  # comparable_val -> [(label, arr)]
@@ -613,10 +625,21 @@ def main():
                     elif x_v.size != x_reference.size or not np.allclose(
                         x_v, x_reference, equal_nan=True
                     ):
-                        rprint(
-                            f"[yellow]Warning:[/yellow] Skipping iterable={iterable}, {comparable_col}={comparable_val} because x-values are not aligned."
-                        )
-                        continue
+                        if stacked_enabled:
+                            rprint(
+                                f"[yellow]Warning:[/yellow] Skipping iterable={iterable}, {comparable_col}={comparable_val} because x-values are not aligned."
+                            )
+                            continue
+                        if args.debug:
+                            rprint(
+                                f"[blue]Info:[/blue] Resampling iterable={iterable}, {comparable_col}={comparable_val} onto the x-values of the first line."
+                            )
+
+                    e_v = (
+                        _extract_line_errors(subset_comparable, args.x, args.y, f"{args.y}Error")
+                        if getattr(args, "errory", False)
+                        else None
+                    )
 
                     comparable_ls, comparable_lw = _resolve_comparable_style(sdx, args)
                     comparable_style_kwargs = {"linewidth": comparable_lw} if comparable_lw is not None else {}
@@ -640,6 +663,7 @@ def main():
                         y=y_v,
                         label=label if sdx == 0 else None,
                         color=line_color,
+                        **({"errory": e_v, "errory_sym": "symmetric"} if e_v is not None else {}),
                         **({"linestyle": comparable_ls} if not stacked_enabled else {}),
                         **comparable_style_kwargs,
                         **plot_type_kwargs,
@@ -649,10 +673,14 @@ def main():
                     if plot_bottom is not None:
                         plot_bottom += y_v
 
-                    comparable_entry = top_by_comparable.setdefault(comparable_val, ([], [], []))
+                    comparable_entry = top_by_comparable.setdefault(
+                        comparable_val, ([], [], [], [], [])
+                    )
                     comparable_entry[0].append(label)
                     comparable_entry[1].append(y_v)
                     comparable_entry[2].append(line_color)
+                    comparable_entry[3].append(x_v)
+                    comparable_entry[4].append(e_v)
 
                     if bottom_column is not None and bottom_column in subset_comparable.columns:
                         local_sub = subset_comparable[subset_comparable[bottom_column].notna()]
@@ -688,10 +716,21 @@ def main():
                 elif x_values.size != x_reference.size or not np.allclose(
                     x_values, x_reference, equal_nan=True
                 ):
-                    rprint(
-                        f"[yellow]Warning:[/yellow] Skipping iterable={iterable} because x-values are not aligned with the first line."
-                    )
-                    continue
+                    if stacked_enabled:
+                        rprint(
+                            f"[yellow]Warning:[/yellow] Skipping iterable={iterable} because x-values are not aligned with the first line."
+                        )
+                        continue
+                    if args.debug:
+                        rprint(
+                            f"[blue]Info:[/blue] Resampling iterable={iterable} onto the x-values of the first line."
+                        )
+
+                y_errors = (
+                    _extract_line_errors(subset, args.x, args.y, f"{args.y}Error")
+                    if getattr(args, "errory", False)
+                    else None
+                )
 
                 plot_type_kwargs = dict(plot_kwargs)
                 if stacked_enabled:
@@ -714,6 +753,7 @@ def main():
                     y=y_values,
                     label=label,
                     color=line_color,
+                    **({"errory": y_errors, "errory_sym": "symmetric"} if y_errors is not None else {}),
                     **plot_type_kwargs,
                     **({"bottom": stacked_bottom} if stacked_enabled else {}),
                 )
@@ -723,6 +763,8 @@ def main():
 
                 top_labels.append(label)
                 top_arrays.append(y_values)
+                top_x.append(x_values)
+                top_errors.append(y_errors)
 
                 if bottom_column is not None:
                     if bottom_column not in subset.columns:
@@ -802,30 +844,36 @@ def main():
                         bottom_s_raw = bottom_by_comparable.get(comparable_val, [])
                         bottom_s = [(lbl, vals) for lbl, vals, _c in bottom_s_raw]
                         bottom_colors = [c for _lbl, _vals, c in bottom_s_raw]
+                        bottom_errors = []
                         op_label = (
                             args.bottom_labely if args.bottom_labely is not None else bottom_column
                         )
                     else:
-                        labels_at, arrays_at, colors_at = top_by_comparable[comparable_val]
-                        bottom_s = compute_bottom_series(
-                            labels_at, arrays_at, operation, reference_index=ref_index
+                        labels_at, arrays_at, colors_at, x_at, errors_at = top_by_comparable[comparable_val]
+                        bottom_entries = compute_bottom_entries(
+                            labels_at,
+                            arrays_at,
+                            operation,
+                            reference_index=ref_index,
+                            x_values=x_at,
+                            x_grid=x_reference,
+                            errors=errors_at,
+                            all_references=getattr(args, "all_references", False),
                         )
+                        bottom_s = [(entry["label"], entry["values"]) for entry in bottom_entries]
+                        bottom_errors = [entry["errors"] for entry in bottom_entries]
                         op_label = (
                             args.bottom_labely
                             if args.bottom_labely is not None
                             else _default_bottom_label(operation or "")
                         )
-                        if operation in {"sum", "mean", "rms"}:
-                            bottom_colors = [None] * len(bottom_s)
-                        else:
-                            clamped_ref = max(0, min(ref_index, len(colors_at) - 1))
-                            bottom_colors = [
-                                colors_at[i]
-                                for i in range(len(colors_at))
-                                if i != clamped_ref
-                            ]
+                        bottom_colors = [
+                            None if entry["index"] is None else colors_at[entry["index"]]
+                            for entry in bottom_entries
+                        ]
 
                     for idx, (_label, values) in enumerate(bottom_s):
+                        values_error = bottom_errors[idx] if idx < len(bottom_errors) else None
                         plot_data(
                             args,
                             ax_bottom,
@@ -833,6 +881,7 @@ def main():
                             y=values,
                             label=(op_label if idx == 0 and sdx == 0 else None),
                             color=bottom_colors[idx] if idx < len(bottom_colors) else None,
+                            **({"errory": values_error, "errory_sym": "symmetric"} if values_error is not None else {}),
                             linestyle=comparable_ls,
                             **comparable_style_kwargs,
                             **plot_kwargs,
@@ -852,16 +901,23 @@ def main():
             else:
                 if bottom_column is not None:
                     bottom_series = bottom_arrays
+                    bottom_errors = []
                     operation_label = (
                         args.bottom_labely if args.bottom_labely is not None else bottom_column
                     )
                 else:
-                    bottom_series = compute_bottom_series(
+                    bottom_entries = compute_bottom_entries(
                         top_labels,
                         top_arrays,
                         operation,
                         reference_index=ref_index,
+                        x_values=top_x,
+                        x_grid=x_reference,
+                        errors=top_errors,
+                        all_references=getattr(args, "all_references", False),
                     )
+                    bottom_series = [(entry["label"], entry["values"]) for entry in bottom_entries]
+                    bottom_errors = [entry["errors"] for entry in bottom_entries]
 
                     operation_label = (
                         args.bottom_labely
@@ -870,12 +926,14 @@ def main():
                     )
 
                 for idx, (_label, values) in enumerate(bottom_series):
+                    values_error = bottom_errors[idx] if idx < len(bottom_errors) else None
                     plot_data(
                         args,
                         ax_bottom,
                         x_reference,
                         y=values,
                         label=(operation_label if idx == 0 else None),
+                        **({"errory": values_error, "errory_sym": "symmetric"} if values_error is not None else {}),
                         linestyle=args.plot_style,
                         **plot_kwargs,
                     )
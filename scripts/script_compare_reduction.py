@@ -14,10 +14,12 @@ from rich import print as rprint
 
 from lib import *
 from lib.selection import filter_dataframe
+from lib.binning import group_by_bins
+from lib.boxstats import binned_box_statistics
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.format import make_title_from_args, make_subtitle_from_args
 from lib.imports import import_data, prepare_import
-from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
+from lib.plot import apply_scientific_threshold_formatter, apply_legend_style, plot_data, create_common_subplots, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label, figure_save_context
 from common_args import add_common_args, load_computation_settings, resolve_plot_kwargs, resolve_axis_label
 
 
@@ -61,6 +63,8 @@ add_common_args(
         "point",
         "point_label",
         "note",
+        "rasterize_threshold",
+        "rasterize_dpi",
         "debug",
     ],
     overrides={
@@ -102,6 +106,20 @@ parser.add_argument(
     default=False,
 )
 
+parser.add_argument(
+    "--box_cache_dir",
+    type=str,
+    default=None,
+    help="Directory of the persistent box statistics cache (default: output/cache/boxstats)",
+)
+
+parser.add_argument(
+    "--no_box_cache",
+    action="store_true",
+    default=False,
+    help="Bypass the box statistics cache and always recompute",
+)
+
 args = parser.parse_args()
 
 def main():
@@ -237,19 +255,22 @@ def main():
                 bin_centers = (bins[:-1] + bins[1:]) / 2
 
             if args.boxplot:
-                if args.threshold:
-                    # If threshold is set, use x values as thresholds instead of bins
-                    boxplot_data = [y[(x >= bins[i])] for i in range(len(bins) - 1)]
-                else:
-                    boxplot_data = [
-                        y[(x >= bins[i]) & (x < bins[i + 1])]
-                        for i in range(len(bins) - 1)
-                    ]
+                # If threshold is set, use x values as thresholds instead of bins
+                box_stats = binned_box_statistics(
+                    x,
+                    y,
+                    bins,
+                    cumulative=args.threshold,
+                    # Boxes are drawn without fliers, so none are computed or cached.
+                    max_fliers=0,
+                    cache_dir=getattr(args, "box_cache_dir", None),
+                    use_cache=not getattr(args, "no_box_cache", False),
+                )
                 plot_data(
                     args,
                     ax_current,
                     bin_centers,
-                    y=boxplot_data,
+                    box_stats=box_stats,
                     label=f"Median {args.y}",
                     plot_type="boxplot",
                     positions=bin_centers,
@@ -280,12 +301,10 @@ def main():
                     return
 
                 op_func = get_operation(operation)
-                mask_func = (
-                    (lambda i: x >= bins[i])
-                    if args.threshold
-                    else (lambda i: (x >= bins[i]) & (x < bins[i + 1]))
-                )
-                y_scatter = [op_func(y[mask_func(i)]) for i in range(len(bins) - 1)]
+                y_scatter = [
+                    op_func(group)
+                    for group in group_by_bins(x, y, bins, cumulative=args.threshold)
+                ]
 
                 if args.operation is None:
                     source = "flag" if args.default_operation else "config"
@@ -422,7 +441,8 @@ def main():
         default_output_dir = os.path.join(
             os.path.dirname(__file__), "..", "output", "plots"
         )
-        save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
+        with figure_save_context(fig):
+            save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
 if __name__ == "__main__":
     main()
@@ -10,10 +10,13 @@ from pathlib import Path
 import pickle
 import pandas as pd
 import numpy as np
+from matplotlib.colors import Normalize
 from rich import print as rprint
 
 from lib import *
-from lib.plot import apply_legend_style, create_common_subplots, apply_note_to_figure
+from lib.plot import apply_legend_style, create_common_subplots, apply_note_to_figure, apply_rasterize_options, plot_density_image, figure_save_context
+from lib.density import DENSITY_REDUCTIONS
+from lib.event_index import ensure_event_index, load_events
 from lib.format import make_title_from_args
 from lib.exports import make_name_from_args, save_figure_to_paths
 from lib.selection import filter_dataframe
@@ -45,6 +48,8 @@ add_common_args(
         "title",
         "output",
         "note",
+        "rasterize_threshold",
+        "rasterize_dpi",
         "debug",
     ],
     overrides={
@@ -94,6 +99,35 @@ parser.add_argument(
     help="Title label for the size legend (defaults to the column name given to --sizeby).",
 )
 
+parser.add_argument(
+    "--event",
+    nargs="+",
+    type=str,
+    default=None,
+    help=(
+        "Event id(s) to display. Only their hits are read, through an event index built "
+        "next to the pickle on first use"
+    ),
+)
+
+parser.add_argument(
+    "--event_column",
+    type=str,
+    default="Event",
+    help="Column holding the event (or cluster) id used by --event",
+)
+
+parser.add_argument(
+    "--aggregate",
+    type=str,
+    default=None,
+    choices=list(DENSITY_REDUCTIONS),
+    help=(
+        "Render hits as a pixel-resolution image instead of markers, reducing each pixel by "
+        "count, or by the mean/max of the --colorby column"
+    ),
+)
+
 parser.add_argument(
     "--iterable_mapping",
     type=str,
@@ -112,7 +146,11 @@ args = parser.parse_args()
 
 
 def _load_display_df(args):
-    """Load a display pkl that may live directly at the given path or in input/data/."""
+    """Load a display pkl that may live directly at the given path or in input/data/.
+
+    With ``--event`` only the hits of the requested events are read, from the
+    event index stored next to the pickle (see ``lib.event_index``).
+    """
     candidate = Path(args.datafile)
     repo_root = Path(__file__).resolve().parents[1]
     input_dir = repo_root / "input" / "data"
@@ -127,6 +165,17 @@ def _load_display_df(args):
     for path in candidates:
         if not path.exists():
             continue
+        events = getattr(args, "event", None)
+        if events:
+            event_column = getattr(args, "event_column", "Event")
+            try:
+                index_dir = ensure_event_index(path, event_column)
+            except ValueError as exc:
+                rprint(f"[yellow]Warning:[/yellow] {exc}. Loading the full display file.")
+            else:
+                if args.debug:
+                    rprint(f"[blue]Debug:[/blue] Reading events {events} from {index_dir}")
+                return load_events(index_dir, events)
         with path.open("rb") as fh:
             data = pickle.load(fh)
         if isinstance(data, pd.DataFrame):
@@ -174,7 +223,57 @@ def _add_size_legend(ax, label, vmin, vmax, base_size, n_levels=4):
 
 
 def _scatter_group(ax, x_vals, y_vals, color, label, size, alpha=0.85, zorder=3):
-    ax.scatter(x_vals, y_vals, c=color, s=size, label=label, alpha=alpha, zorder=zorder, linewidths=0)
+    collection = ax.scatter(x_vals, y_vals, c=color, s=size, label=label, alpha=alpha, zorder=zorder, linewidths=0)
+    apply_rasterize_options(args, collection)
+    return collection
+
+
+def _draw_density_panels(fig, ax_left, ax_right, df_config, reduction):
+    """Draw both projections as aggregated images sharing one colorbar."""
+    values = None
+    if reduction != "count":
+        if args.colorby is None or args.colorby not in df_config.columns:
+            rprint(f"[yellow]Warning:[/yellow] --aggregate {reduction} needs a valid --colorby column. Showing counts.")
+            reduction = "count"
+        else:
+            values = df_config[args.colorby].astype(float).to_numpy()
+
+    x_vals = df_config[args.x].astype(float).to_numpy()
+    images = [
+        plot_density_image(
+            ax,
+            x_vals,
+            df_config[column].astype(float).to_numpy(),
+            values=values,
+            reduction=reduction,
+            x_range=args.rangex,
+            y_range=y_range,
+        )
+        for ax, column, y_range in ((ax_left, args.y, args.rangey), (ax_right, args.z, None))
+    ]
+
+    grids = np.concatenate([image.get_array().compressed() for image in images])
+    grids = grids[np.isfinite(grids)]
+    if args.logz:
+        positive = grids[grids > 0]
+        norm = LogNorm(vmin=positive.min(), vmax=positive.max()) if positive.size else None
+    else:
+        norm = Normalize(vmin=grids.min(), vmax=grids.max()) if grids.size else None
+    if norm is not None:
+        for image in images:
+            image.set_norm(norm)
+
+    cbar = fig.colorbar(images[1], ax=[ax_left, ax_right], shrink=0.9, pad=0.02)
+    if args.labelz is not None:
+        colorbar_label = args.labelz
+    elif reduction == "count":
+        colorbar_label = "Hits per pixel"
+    else:
+        colorbar_label = f"{reduction.capitalize()} {args.colorby}"
+    if args.logz:
+        colorbar_label += " (log scale)"
+    cbar.set_label(colorbar_label)
+    return images
 
 
 def main():
@@ -239,7 +338,11 @@ def main():
             size_vmax = df_config[sizeby].astype(float).max()
         sizes = _resolve_sizes(df_config, sizeby, args.marker_size, size_vmin, size_vmax)
 
-        if use_colorby:
+        aggregate = getattr(args, "aggregate", None)
+        if aggregate:
+            _draw_density_panels(fig, ax_left, ax_right, df_config, aggregate)
+
+        elif use_colorby:
             c_vals = df_config[args.colorby].astype(float).to_numpy()
             norm = LogNorm(vmin=c_vals[c_vals > 0].min(), vmax=c_vals.max()) if args.logz else None
 
@@ -262,6 +365,9 @@ def main():
                 linewidths=0,
             )
 
+            apply_rasterize_options(args, sc_left)
+            apply_rasterize_options(args, sc_right)
+
             cbar = fig.colorbar(sc_right, ax=[ax_left, ax_right], shrink=0.9, pad=0.02)
             colorbar_label = args.labelz if args.labelz is not None else args.colorby
             if args.logz:
@@ -334,7 +440,7 @@ def main():
                     sizes,
                 )
 
-        if sizeby and size_vmin is not None and size_vmin != size_vmax:
+        if not aggregate and sizeby and size_vmin is not None and size_vmin != size_vmax:
             size_legend_label = getattr(args, "labelsize", None) or sizeby
             _add_size_legend(ax_right, size_legend_label, size_vmin, size_vmax, args.marker_size)
 
@@ -363,7 +469,8 @@ def main():
         default_output_dir = os.path.join(
             os.path.dirname(__file__), "..", "output", "plots"
         )
-        save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
+        with figure_save_context(fig):
+            save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
 
 if __name__ == "__main__":
@@ -25,6 +25,8 @@ from lib.plot import (
     draw_vertical_lines,
     draw_horizontal_lines,
     place_point_label,
+    plot_line_collection,
+    figure_save_context,
 )
 from common_args import add_common_args, map_iterable_label, map_iterable_color, resolve_axis_label
 
@@ -47,6 +49,8 @@ add_common_args(
         "x",
         "y",
         "reduce",
+        "collection_threshold",
+        "collection_cmap",
         "labelx",
         "labely",
         "labelz",
@@ -69,6 +73,9 @@ add_common_args(
         "point",
         "point_label",
         "note",
+        "decimate",
+        "rasterize_threshold",
+        "rasterize_dpi",
         "debug",
     ],
     overrides={
@@ -231,10 +238,29 @@ def main():
         iterable_values = df_config[args.iterable].unique()
         two_line_mode = iterable_values.size == 2
 
+        # Explicit line/step scans over many iterable values are drawn as one
+        # colormapped collection per axis instead of one artist per line.
+        # Marker and error-bar scans keep their per-line artists.
+        collection_threshold = getattr(args, "collection_threshold", 0) or 0
+        collection_mode = (
+            collection_threshold > 0
+            and iterable_values.size > collection_threshold
+            and not args.stacked
+            and getattr(args, "comparable", None) is None
+            and args.plot_type in ("line", "step")
+        )
+        collection_series = {idx: [] for idx in range(ncols)}
+        # Axes where some series could not join the collection (non-numeric x)
+        per_line_axes = set()
+        if collection_mode:
+            rprint(
+                f"[blue]Info:[/blue] Drawing {iterable_values.size} values of {args.iterable} as a single line collection."
+            )
+
         for (idx, variable), (jdx, iterable) in product(
             enumerate(variables), enumerate(iterable_values)
         ):
-            if iterable_values.size > 8 and args.reduce:
+            if iterable_values.size > 8 and args.reduce and not collection_mode:
                 if jdx % 2 == 1:
                     rprint(
                         f"\tSkipping plotting for {args.iterable}={iterable} to avoid overcrowding"
@@ -503,6 +529,14 @@ def main():
                 else map_iterable_color(iterable, getattr(args, "iterable_color_mapping", None))
             )
 
+            if collection_mode:
+                if isinstance(x, np.ndarray) and x.dtype.kind == "f":
+                    collection_series[idx].append(
+                        (x, y, x_edges if args.plot_type == "step" else None, iterable)
+                    )
+                    continue
+                per_line_axes.add(idx)
+
             if args.plot_type is not None:
                 rprint(
                     f"\tPlotting {len(x)} points with explicit plot_type={args.plot_type} for {args.iterable}={iterable} (legend={iterable_label}), Variable={variable}"
@@ -675,6 +709,22 @@ def main():
                             linestyle="None",
                         )
 
+        for idx, series in collection_series.items():
+            if not series:
+                continue
+
+            xs, ys, edges, values = zip(*series)
+            plot_line_collection(
+                ax if ncols == 1 else ax[idx],
+                xs,
+                ys,
+                values,
+                x_edges=edges,
+                cmap=getattr(args, "collection_cmap", "viridis"),
+                linestyle=args.plot_style,
+                colorbar_label=args.labelz if args.labelz is not None else args.iterable,
+            )
+
         for idx, variable in enumerate(variables):
             if ncols == 1:
                 ax_current = ax
@@ -714,7 +764,11 @@ def main():
             if args.logx:
                 ax_current.semilogx()
 
-            if args.stacked:
+            if collection_series[idx] and idx not in per_line_axes:
+                # The colorbar added with the collection replaces the legend.
+                pass
+
+            elif args.stacked:
                 if idx == ncols - 1:
                     apply_legend_style(
                         ax_current,
@@ -772,7 +826,8 @@ def main():
         default_output_dir = os.path.join(
             os.path.dirname(__file__), "..", "output", "plots"
         )
-        save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
+        with figure_save_context(fig):
+            save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
 if __name__ == "__main__":
     main()
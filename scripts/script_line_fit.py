@@ -25,6 +25,8 @@ from lib.functions import (
     quadratic_cut,
     quadratic_function,
 )
+from lib.fitcache import cached_fit_products, evaluate_fit_products, evict_fit_cache
+from lib.fitting import fit_series_batch, save_fit_results
 from lib.plot import apply_legend_style, plot_data, create_common_subplots, create_common_two_panel_figure, apply_note_to_figure, draw_vertical_lines, draw_horizontal_lines, place_point_label
 
 from common_args import add_common_args, resolve_axis_label
@@ -70,6 +72,7 @@ add_common_args(
         "point",
         "point_label",
         "note",
+        "decimate",
         "debug",
     ],
     overrides={
@@ -128,10 +131,119 @@ parser.add_argument(
     default=False,
 )
 
+parser.add_argument(
+    "--fit_model",
+    type=str,
+    default=None,
+    help="Refit every series with this model (linear, quadratic, cubic or a lib.functions name) instead of using the stored FitFunction/Params",
+)
+
+parser.add_argument(
+    "--fit_range",
+    nargs=2,
+    type=float,
+    default=None,
+    help="x-range (min max) used when refitting with --fit_model",
+)
+
+parser.add_argument(
+    "--fit_p0",
+    nargs="+",
+    type=float,
+    default=None,
+    help="Initial parameter guess for the first nonlinear fit; later iterables warm-start from the previous fit",
+)
+
+parser.add_argument(
+    "--fit_workers",
+    type=int,
+    default=1,
+    help="Worker processes used for nonlinear refits",
+)
+
+parser.add_argument(
+    "--fit_output_dir",
+    type=str,
+    default=None,
+    help="Directory for the refit parameter tables (default: output/fits)",
+)
+
+parser.add_argument(
+    "--fit_cache_dir",
+    type=str,
+    default=None,
+    help="Directory of the persistent fit/curve cache (default: output/fits/cache)",
+)
+
+parser.add_argument(
+    "--no_fit_cache",
+    action="store_true",
+    default=False,
+    help="Bypass the fit/curve cache and always refit and re-evaluate",
+)
+
 
 args = parser.parse_args()
 
 
+def stored_fit_matches(subset, fit_spec):
+    """Whether the stored FitFunction of ``subset`` is the --fit_model refit model.
+
+    Only then do the stored ParamsLabel/ParamsFormat/ParamsUnit describe the
+    refitted parameters.
+    """
+    if "FitFunction" not in subset.columns or "ParamsLabel" not in subset.columns:
+        return False
+    stored = subset["FitFunction"].iloc[0]
+    if stored is fit_spec["function"]:
+        return True
+    stored_name = stored if isinstance(stored, str) else getattr(stored, "__name__", None)
+    return stored_name == fit_spec["name"]
+
+
+def fit_config_series(series, config, name, kdx):
+    """Refit every selected series of one configuration with --fit_model.
+
+    Results are also written to output/fits/ so the Params, ParamsError and
+    covariances can be reused without rerunning the upstream pipeline.
+    """
+    xs = [subset[args.x].values[0] for _, _, subset in series]
+    ys = [subset[args.y].values[0] for _, _, subset in series]
+    error_column = f"{args.y}Error"
+    errors = [
+        subset[error_column].values[0] if args.errory and error_column in subset.columns else None
+        for _, _, subset in series
+    ]
+
+    spec, results = fit_series_batch(
+        args.fit_model,
+        xs,
+        ys,
+        errors=errors,
+        fit_range=getattr(args, "fit_range", None),
+        p0=getattr(args, "fit_p0", None),
+        workers=getattr(args, "fit_workers", 1),
+        cache_dir=getattr(args, "fit_cache_dir", None),
+        use_cache=not getattr(args, "no_fit_cache", False),
+    )
+
+    iterable_key = args.iterable if args.iterable is not None else "Iterable"
+    keys = [
+        {"Config": config, "Name": name, iterable_key: iterable}
+        for _, iterable, _ in series
+    ]
+    fit_file = make_name_from_args(args, kdx, prefix=None, suffix="fits.pkl")
+    fit_dir = getattr(args, "fit_output_dir", None) or os.path.join(
+        os.path.dirname(__file__), "..", "output", "fits"
+    )
+    fit_path = os.path.join(fit_dir, fit_file)
+    save_fit_results(fit_path, keys, spec, results, fit_range=getattr(args, "fit_range", None))
+    if args.debug:
+        rprint(f"[blue]Info:[/blue] Saved {len(results)} {spec['name']} fits to {fit_path}")
+
+    return spec, results
+
+
 def main():
     # For each configuration provided combine the data files and plot the results
     df = import_data(args)
@@ -172,6 +284,7 @@ def main():
         iterables = (
             df_config[args.iterable].unique() if args.iterable is not None else [None]
         )
+        series = []
         for jdx, iterable in enumerate(iterables):
             if args.reduce and args.iterable is not None:
                 if df_config[args.iterable].unique().size > 8:
@@ -197,18 +310,46 @@ def main():
             if subset.empty:
                 continue
 
-            fit_function_label = subset["FitFunctionLabel"].iloc[0]
+            series.append((jdx, iterable, subset))
+
+        fit_spec, fit_results = (None, None)
+        if getattr(args, "fit_model", None) is not None and series:
+            fit_spec, fit_results = fit_config_series(series, config, name, kdx)
 
+        for sdx, (jdx, iterable, subset) in enumerate(series):
             x = subset[args.x].values[0].astype(float)
             y = subset[args.y].values[0].astype(float)
 
-            params = subset["Params"].iloc[0]
-            params_format = subset["ParamsFormat"].iloc[0]
-            params_labels = subset["ParamsLabel"].iloc[0]
-            params_error = subset["ParamsError"].iloc[0]
             params_units = subset["ParamsUnit"].iloc[0] if "ParamsUnit" in subset.columns else None
-            func = subset["FitFunction"].iloc[0]
-            fit = func(x, *params)
+            if fit_spec is None:
+                fit_function_label = subset["FitFunctionLabel"].iloc[0]
+                params = subset["Params"].iloc[0]
+                params_format = subset["ParamsFormat"].iloc[0]
+                params_labels = subset["ParamsLabel"].iloc[0]
+                params_error = subset["ParamsError"].iloc[0]
+                func = subset["FitFunction"].iloc[0]
+            else:
+                fit_function_label = fit_spec["name"].replace("_", " ").title()
+                params = fit_results[sdx]["Params"]
+                params_error = fit_results[sdx]["ParamsError"]
+                params_labels = fit_spec["params"]
+                params_format = [".3g"] * len(params)
+                if stored_fit_matches(subset, fit_spec) and len(subset["ParamsLabel"].iloc[0]) == len(params):
+                    params_labels = subset["ParamsLabel"].iloc[0]
+                    params_format = subset["ParamsFormat"].iloc[0]
+                else:
+                    params_units = None
+                func = fit_spec["function"]
+
+            if fit_spec is not None:
+                fit_products = fit_results[sdx]
+            elif getattr(args, "no_fit_cache", False):
+                fit_products = evaluate_fit_products(func, x, y, params)
+            else:
+                fit_products = cached_fit_products(
+                    func, x, y, params, cache_dir=getattr(args, "fit_cache_dir", None)
+                )
+            fit = fit_products["Fit"]
             y_error = None
 
             if params_units is None or (
@@ -265,23 +406,21 @@ def main():
             ):  # Only add legend for the first iterable to avoid duplicates
 
                 # Draw the fit line
-                fit_x = np.linspace(np.min(x), np.max(x), 1000)
                 plot_data(
                     args,
                     ax_top,
-                    fit_x,
-                    y=func(fit_x, *params),
+                    fit_products["CurveX"],
+                    y=fit_products["CurveY"],
                     label="Fit",
                     color="red",
                     plot_type="plot",
                     linestyle="-",
                 )
 
-                # Compute residuals only for valid (finite, nonzero fit) points
+                # Residuals are only defined for valid (finite, nonzero fit) points
                 diff = y - fit
-                mask = np.isfinite(fit) & (fit != 0) & np.isfinite(diff)
-                residuals = np.full_like(diff, np.nan)
-                residuals[mask] = diff[mask] / fit[mask]
+                residuals = fit_products["Residuals"]
+                mask = np.isfinite(residuals)
 
                 if args.errory and y_error is not None:
                     residuals_error = np.full_like(y, np.nan)
@@ -491,6 +630,10 @@ def main():
         )
         save_figure_to_paths(fig, args.output, output_file, default_output_dir, rprint)
 
+    # Stored fit products are evicted once per run, not once per row.
+    if not getattr(args, "no_fit_cache", False):
+        evict_fit_cache(getattr(args, "fit_cache_dir", None))
+
 
 if __name__ == "__main__":
     main()
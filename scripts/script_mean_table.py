@@ -10,14 +10,20 @@ from _bootstrap import ensure_src_path
 
 ensure_src_path()
 
+import json
+import shlex
+
 from lib import *
 from lib.functions import resolution, gaussian, exponential_decay
 from lib.selection import prepare_selection, filter_dataframe
 from lib.imports import import_data
 from lib.format import format_with_error
+from lib.tables import aggregate_mean_with_error
+from lib.categorical import map_categories, normalize_categorical_columns
 from lib.exports import make_name_from_args
 from lib.plot import apply_note_to_figure
 from common_args import add_common_args
+from rich import print as rprint
 
 # Import with args parser
 parser = argparse.ArgumentParser(
@@ -90,37 +96,56 @@ parser.add_argument(
     help="Index of the columns to italicize in the table",
 ),
 
+parser.add_argument(
+    "--tables",
+    type=str,
+    default=None,
+    help="JSON list of table specs or *_scripts.txt command list; every table is built from one load per datafile",
+)
+
 
 args = parser.parse_args()
 
+# Options forwarded from a multi-table command line to specs that do not set them
+TABLE_SPEC_FORWARDED = ("output", "debug")
 
-def main():
+
+def load_table_data(args):
     """
-    Main function to process simulation configurations, load data files,
-    and generate tables based on the provided arguments.
+    Import the datafile and map Geometry/Config to the labels used in the tables.
     """
     df = import_data(args)
-
-    # Check if the DataFrame is empty
     if df.empty:
-        print("No data to plot. Exiting.")
-        return
-
-    # Set default variable if none are provided
-    if args.variables is None:
-        args.variables = [""]
-        df[args.variable_name] = ""
+        return df
 
     # Capitalize all letters in df["Geometry"]
     df["Geometry"] = df["Geometry"].str.upper()
 
+    # Convert the raw names first, so the config_dict order of the categories
+    # carries over to the readable labels
+    df = normalize_categorical_columns(df)
+
     # Substitute the names in df["Config"] to be more readable with the config_dict
     if len(args.names) == 1:
-        df["Config"] = df["Config"].map(lambda x: config_dict.get(x, x))
+        df["Config"] = map_categories(df["Config"], config_dict)
     else:
         df["Config"] = df["Name"].str.split("_").str[0]
         df["Config"] = df["Config"].map(lambda x: particle_dict.get(x, x))
 
+    # Masks and groupbys on the key columns then compare integer codes
+    return normalize_categorical_columns(df)
+
+
+def build_table(df, args):
+    """
+    Build the pivoted mean table for one spec from an already loaded DataFrame.
+    The input DataFrame is not modified, so it can be shared between tables.
+    """
+    # Set default variable if none are provided
+    if args.variables is None:
+        args.variables = [""]
+        df = df.assign(**{args.variable_name: ""})
+
     subset = filter_dataframe(df, args)
     # variables = args.variables if args.variables is not None else [None]
     # iterables = this_df[args.iterable].unique() if args.iterable is not None else [None]
@@ -171,13 +196,14 @@ def main():
     if f"{args.y}Error" not in df_config.columns:
         df_config[f"{args.y}Error"] = df_config[args.y]
 
-    df_table = df_config.groupby(["Geometry", "Config", args.variable_name]).agg(
-        {
-            args.y: ["mean"],
-            f"{args.y}Error": lambda x: np.sqrt(np.sum(x**2)) / len(x),
-        }
+    df_table = aggregate_mean_with_error(
+        df_config,
+        ["Geometry", "Config", args.variable_name],
+        args.y,
+        f"{args.y}Error",
     )
-
+    # lib.format.format_with_error reads rows laid out like the former groupby().agg() result
+    df_table.columns = pd.MultiIndex.from_tuples([(args.y, "mean"), (f"{args.y}Error", "<lambda>")])
     df_table[args.y] = df_table.apply(
         lambda row: format_with_error(row, args=args), axis=1
     )
@@ -191,6 +217,7 @@ def main():
             columns=args.variable_name,
             values=[args.variable_title],
             aggfunc="first",
+            observed=True,
         )
 
     else:
@@ -199,6 +226,7 @@ def main():
             columns=args.variable_name,
             values=[args.y],
             aggfunc="first",
+            observed=True,
         )
 
     # Combine the "Geometry" and "Config" index into a single index called "Configuration"
@@ -231,8 +259,13 @@ def main():
     df_table = df_table.dropna(how="all")
 
     # Make the "Configuration" index a column and drop the index
-    df_table = df_table.reset_index()
+    return df_table.reset_index()
+
 
+def write_table(df_table, args):
+    """
+    Print the table and save it as LaTeX and HTML under output/tables.
+    """
     # Don't print the row index
     print(df_table.to_string(index=False))
 
@@ -310,5 +343,78 @@ def main():
     print(f"Saving HTML table to {html_output_path}")
 
 
+def load_table_specs(path, base_args):
+    """
+    Read table specs from a JSON list of option dicts or a *_scripts.txt file.
+
+    JSON entries override ``base_args`` (e.g. ``{"y": "Efficiency", "variables":
+    ["Energy"], "variable_title": "Eff.", "it": 1, "output": ["eff"]}``).
+    Command lists are parsed with this script's parser; lines that run another
+    script are skipped.
+    """
+    specs = []
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            entries = json.load(f)
+        for entry in entries:
+            unknown = sorted(set(entry) - set(vars(base_args)))
+            if unknown:
+                raise ValueError(f"Unknown table spec option(s) in {path}: {', '.join(unknown)}")
+            specs.append(argparse.Namespace(**{**vars(base_args), **entry, "tables": None}))
+        return specs
+
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    for line in lines:
+        tokens = shlex.split(line)
+        script = next((idx for idx, token in enumerate(tokens) if token.endswith(".py")), None)
+        if script is None or os.path.basename(tokens[script]) != os.path.basename(__file__):
+            rprint(f"[yellow]Warning:[/yellow] Skipping non mean-table command: {line}")
+            continue
+        spec = parser.parse_args(tokens[script + 1 :])
+        for key in TABLE_SPEC_FORWARDED:
+            if getattr(spec, key) == parser.get_default(key):
+                setattr(spec, key, getattr(base_args, key))
+        specs.append(spec)
+    return specs
+
+
+def run_tables(specs):
+    """
+    Build and save every spec, importing and mapping each datafile only once.
+    """
+    loaded = {}
+    for spec in specs:
+        key = (spec.datafile, tuple(spec.configs or ()), tuple(spec.names or ()))
+        if key not in loaded:
+            # Load every variable; each spec filters its own subset afterwards
+            loaded[key] = load_table_data(argparse.Namespace(**{**vars(spec), "variables": None}))
+        df = loaded[key]
+
+        if df.empty:
+            rprint(f"[yellow]Warning:[/yellow] No data for {spec.datafile}. Skipping table for {spec.y}.")
+            continue
+        write_table(build_table(df, spec), spec)
+
+
+def main():
+    """
+    Main function to process simulation configurations, load data files,
+    and generate tables based on the provided arguments.
+    """
+    if getattr(args, "tables", None) is not None:
+        run_tables(load_table_specs(args.tables, args))
+        return
+
+    df = load_table_data(args)
+
+    # Check if the DataFrame is empty
+    if df.empty:
+        print("No data to plot. Exiting.")
+        return
+
+    write_table(build_table(df, args), args)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def group_by_bins(x, y, edges, cumulative=False):
+    """Split ``y`` into groups by the bin of ``x`` with one binary search and one sort.
+
+    Bins are half-open, ``edges[i] <= x < edges[i + 1]``, like the
+    ``(x >= lo) & (x < hi)`` masks this replaces. With ``cumulative`` every
+    group holds all points with ``x >= edges[i]`` (threshold mode). Groups
+    are views into one reordered copy of ``y``, so memory stays ``O(n)``
+    instead of ``O(n * bins)``.
+
+    Args:
+        x: Values that select the bin
+        y: Values to group (same length as ``x``)
+        edges: Monotonically increasing bin edges
+        cumulative: Return suffix groups (``x >= edges[i]``) instead of bins
+
+    Returns:
+        list: ``len(edges) - 1`` arrays of ``y`` values, keeping the input
+        order within each bin
+    """
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have the same length")
+
+    edges = np.asarray(edges, dtype=float)
+    n_bins = edges.size - 1
+
+    # Points at or above the last edge land in an overflow bin (n_bins) that
+    # only the cumulative groups include.
+    index = np.searchsorted(edges, x, side="right") - 1
+    keep = np.isfinite(x) & (index >= 0)
+    if not keep.all():
+        index, y = index[keep], y[keep]
+
+    # A stable sort of small integers is a radix sort in numpy.
+    index = index.astype(np.int16 if n_bins < np.iinfo(np.int16).max else np.int64)
+    order = np.argsort(index, kind="stable")
+    y_sorted = y[order]
+    bounds = np.searchsorted(index[order], np.arange(n_bins + 1), side="left")
+
+    if cumulative:
+        return [y_sorted[start:] for start in bounds[:-1]]
+    return [y_sorted[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
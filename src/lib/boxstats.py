@@ -0,0 +1,136 @@
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from .binning import group_by_bins
+from .fitcache import load_cached_fit, store_cached_fit
+
+
+DEFAULT_BOX_STATS_CACHE_DIR = Path(__file__).resolve().parents[2] / "output" / "cache" / "boxstats"
+DEFAULT_MAX_FLIERS = 200
+# Bump when the statistics change so stale cache entries are not reused.
+BOX_STATS_VERSION = 1
+
+
+def _capped_sample(values, max_fliers):
+    """Return at most ``max_fliers`` evenly spaced entries of sorted ``values`` (extremes included)."""
+    if max_fliers is None or values.size <= max_fliers:
+        return values
+    if max_fliers <= 0:
+        return values[:0]
+    return values[np.unique(np.linspace(0, values.size - 1, max_fliers).round().astype(int))]
+
+
+def _empty_box(label):
+    stats = {key: np.nan for key in ("mean", "med", "q1", "q3", "iqr", "cilo", "cihi", "whislo", "whishi")}
+    stats.update(fliers=np.array([], dtype=float), n=0, label=label)
+    return stats
+
+
+def box_statistics(groups, whis=1.5, max_fliers=DEFAULT_MAX_FLIERS, labels=None):
+    """Compute ``Axes.bxp`` statistics for every group.
+
+    Matches ``matplotlib.cbook.boxplot_stats`` for a float ``whis``, except
+    that fliers are sorted and thinned to ``max_fliers`` evenly spaced
+    values (always keeping the extremes). Groups are processed one at a
+    time, so the extra memory is bounded by the largest group.
+
+    Args:
+        groups: Sequence of 1D arrays
+        whis: Whisker reach in units of the interquartile range
+        max_fliers: Cap on stored fliers per group (``None`` keeps all,
+            ``0`` skips the flier search for plots drawn without fliers)
+        labels: Optional label per group
+
+    Returns:
+        list: One dict per group with ``med``, ``q1``, ``q3``, ``whislo``,
+        ``whishi``, ``fliers``, ``mean``, ``iqr``, ``cilo``, ``cihi``, ``n``
+        and ``label``
+    """
+    labels = list(labels) if labels is not None else [None] * len(groups)
+    all_stats = []
+
+    for group, label in zip(groups, labels):
+        values = np.asarray(group, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            all_stats.append(_empty_box(label))
+            continue
+
+        # np.percentile partitions instead of sorting, so each pass is O(n).
+        q1, med, q3 = np.percentile(values, [25, 50, 75])
+        iqr = q3 - q1
+
+        inside_high = values[values <= q3 + whis * iqr]
+        whishi = inside_high.max() if inside_high.size and inside_high.max() >= q3 else q3
+        inside_low = values[values >= q1 - whis * iqr]
+        whislo = inside_low.min() if inside_low.size and inside_low.min() <= q1 else q1
+        if max_fliers == 0:
+            fliers = values[:0]
+        else:
+            fliers = np.sort(values[(values < whislo) | (values > whishi)])
+
+        notch = 1.57 * iqr / np.sqrt(values.size)
+        all_stats.append(
+            {
+                "mean": float(values.mean()),
+                "med": float(med),
+                "q1": float(q1),
+                "q3": float(q3),
+                "iqr": float(iqr),
+                "cilo": float(med - notch),
+                "cihi": float(med + notch),
+                "whislo": float(whislo),
+                "whishi": float(whishi),
+                "fliers": _capped_sample(fliers, max_fliers),
+                "n": int(values.size),
+                "label": label,
+            }
+        )
+
+    return all_stats
+
+
+def box_stats_cache_key(x, y, edges, cumulative=False, whis=1.5, max_fliers=DEFAULT_MAX_FLIERS):
+    """Hash the binned data and every setting that changes the statistics."""
+    digest = hashlib.sha1()
+    for value in (x, y, edges):
+        array = np.ascontiguousarray(np.asarray(value, dtype=float))
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    digest.update(repr((bool(cumulative), float(whis), max_fliers, BOX_STATS_VERSION)).encode())
+    return digest.hexdigest()
+
+
+def binned_box_statistics(
+    x,
+    y,
+    edges,
+    cumulative=False,
+    whis=1.5,
+    max_fliers=DEFAULT_MAX_FLIERS,
+    cache_dir=None,
+    use_cache=True,
+):
+    """Box statistics of ``y`` grouped by the ``x`` bins in ``edges``, cached on disk.
+
+    Groups come from :func:`lib.binning.group_by_bins`. Results are stored in
+    ``cache_dir`` (default ``output/cache/boxstats``) keyed by a hash of the
+    data and settings, so reruns over unchanged inputs skip the computation.
+
+    Returns:
+        list: Statistics per bin as returned by :func:`box_statistics`
+    """
+    key = None
+    if use_cache:
+        key = box_stats_cache_key(x, y, edges, cumulative, whis, max_fliers)
+        cached = load_cached_fit(key, cache_dir or DEFAULT_BOX_STATS_CACHE_DIR)
+        if cached is not None:
+            return cached
+
+    stats = box_statistics(group_by_bins(x, y, edges, cumulative=cumulative), whis=whis, max_fliers=max_fliers)
+
+    if use_cache:
+        store_cached_fit(key, stats, cache_dir or DEFAULT_BOX_STATS_CACHE_DIR)
+    return stats
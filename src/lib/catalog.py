@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .categorical import CATEGORICAL_COLUMNS
+
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[2] / "input" / "data"
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parents[2] / "output" / "cache" / "data_catalog.json"
+CATALOG_VERSION = 1
+CATALOG_SUFFIXES = (".pkl", ".pickle")
+# Columns whose distinct values are always summarized (masks and groupbys use them)
+KEY_COLUMNS = CATEGORICAL_COLUMNS
+# Other columns are summarized when they have at most this many distinct values
+MAX_DISTINCT_VALUES = 64
+MAX_KEY_DISTINCT_VALUES = 2000
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _is_array_cell(value):
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def summarize_column(series, key_column=False):
+    """Summarize one column: dtype, array-cell lengths and (capped) distinct values.
+
+    Returns:
+        dict: ``dtype``, ``n_distinct`` (``None`` for array cells),
+        ``distinct`` (sorted values or ``None`` when above the cap) and, for
+        columns holding lists/arrays, ``array_lengths`` as ``[min, max]``
+    """
+    summary = {"dtype": str(series.dtype), "n_distinct": None, "distinct": None}
+    values = series.dropna()
+    if series.dtype == object and len(values) and values.map(_is_array_cell).any():
+        lengths = values.map(lambda cell: len(cell) if _is_array_cell(cell) else 1).to_numpy()
+        summary["array_lengths"] = [int(lengths.min()), int(lengths.max())]
+        return summary
+
+    try:
+        uniques = pd.unique(values)
+    except TypeError:
+        return summary
+    summary["n_distinct"] = int(len(uniques))
+    cap = MAX_KEY_DISTINCT_VALUES if key_column else MAX_DISTINCT_VALUES
+    if len(uniques) <= cap:
+        summary["distinct"] = sorted((_json_value(value) for value in uniques), key=lambda value: (str(type(value)), value))
+    return summary
+
+
+def summarize_dataframe(df):
+    """Return the catalog entry (rows and per-column summaries) of a DataFrame."""
+    return {
+        "rows": int(len(df)),
+        "columns": {
+            str(column): summarize_column(df[column], key_column=column in KEY_COLUMNS)
+            for column in df.columns
+        },
+    }
+
+
+def _load_datafile(path):
+    data = pd.read_pickle(path)
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+
+def build_catalog(data_dir=None, catalog_path=None, force=False, paths=None):
+    """Scan the data directory and refresh the catalog incrementally.
+
+    Files whose modification time and size match the stored entry are not
+    loaded again; removed files are dropped. The catalog is a small JSON
+    file written atomically.
+
+    Args:
+        data_dir: Directory to scan (default ``input/data``)
+        catalog_path: Catalog file (default ``output/cache/data_catalog.json``)
+        force: Summarize the scanned (or given) files again
+        paths: Only refresh these datafiles (others keep their entries)
+
+    Returns:
+        dict: The catalog with a ``files`` mapping keyed by file name
+    """
+    data_dir = Path(data_dir or DEFAULT_DATA_DIR)
+    catalog_path = Path(catalog_path or DEFAULT_CATALOG_PATH)
+    catalog = load_catalog(catalog_path)
+    previous = catalog.get("files", {}) if catalog.get("version") == CATALOG_VERSION else {}
+
+    if paths is None:
+        found = sorted(path for path in data_dir.glob("*") if path.suffix in CATALOG_SUFFIXES and path.is_file())
+        files = {}
+    else:
+        found = [Path(path) for path in paths]
+        files = dict(previous)
+
+    for path in found:
+        stamp = _file_stamp(path)
+        entry = None if force else previous.get(path.name)
+        if entry is None or entry.get("stamp") != stamp:
+            entry = {"stamp": stamp, **summarize_dataframe(_load_datafile(path))}
+        files[path.name] = entry
+
+    catalog = {"version": CATALOG_VERSION, "data_dir": str(data_dir), "files": files}
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=catalog_path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(catalog, fh)
+    os.replace(tmp_path, catalog_path)
+    return catalog
+
+
+@lru_cache(maxsize=4)
+def _read_catalog(catalog_path, _mtime):
+    with open(catalog_path) as fh:
+        return json.load(fh)
+
+
+def load_catalog(catalog_path=None):
+    """Return the catalog (an empty dict if it does not exist), cached until the file changes."""
+    catalog_path = Path(catalog_path or DEFAULT_CATALOG_PATH)
+    try:
+        return _read_catalog(str(catalog_path), catalog_path.stat().st_mtime_ns)
+    except (OSError, ValueError):
+        return {}
+
+
+def describe_datafile(datafile, catalog_path=None, data_dir=None):
+    """Return the catalog entry of ``datafile`` (a path or a name in ``input/data``).
+
+    Returns ``None`` when the file is not cataloged or changed since, so
+    callers never act on stale metadata.
+    """
+    path = Path(datafile)
+    if not path.is_file():
+        data_dir = Path(data_dir or DEFAULT_DATA_DIR)
+        candidates = [data_dir / f"{datafile}{suffix}" for suffix in CATALOG_SUFFIXES]
+        path = next((candidate for candidate in candidates if candidate.is_file()), None)
+        if path is None:
+            return None
+
+    entry = load_catalog(catalog_path).get("files", {}).get(path.name)
+    if entry is None or entry.get("stamp") != _file_stamp(path):
+        return None
+    return entry
+
+
+def catalog_columns(datafile, catalog_path=None):
+    """Column names of ``datafile`` from the catalog, or ``None`` if unknown."""
+    entry = describe_datafile(datafile, catalog_path)
+    return None if entry is None else list(entry["columns"])
+
+
+def catalog_values(datafile, column, catalog_path=None):
+    """Distinct values of ``column`` in ``datafile`` from the catalog, or ``None`` if unknown."""
+    entry = describe_datafile(datafile, catalog_path)
+    if entry is None or column not in entry["columns"]:
+        return None
+    return entry["columns"][column]["distinct"]
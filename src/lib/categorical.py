@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+
+# Key columns repeated across thousands of rows and used in every mask/groupby
+CATEGORICAL_COLUMNS = ("Config", "Name", "Geometry", "Variable", "Component", "ParticleOrigin")
+# plot_params.json mappings whose key order defines the category order of a column (raw values)
+CATEGORY_ORDER_MAPPINGS = {"Config": "config_dict"}
+
+
+def category_orders():
+    """Return the preferred category order per column from the plot_params.json mappings.
+
+    The orders list raw values (e.g. ``hd_1x2x6``), so normalize before
+    relabelling a column and relabel with :func:`map_categories`.
+    """
+    from . import get_mapping_dict
+
+    orders = {}
+    for column, mapping_name in CATEGORY_ORDER_MAPPINGS.items():
+        mapping = get_mapping_dict(mapping_name)
+        if mapping:
+            orders[column] = list(mapping)
+    return orders
+
+
+def ordered_categories(values, order=None):
+    """Return the distinct ``values``: those listed in ``order`` first (in that order), then the rest sorted."""
+    present = pd.unique(values[pd.notna(values)])
+    listed = [value for value in (order or []) if value in set(present)]
+    remaining = sorted(set(present) - set(listed), key=lambda value: (str(type(value)), str(value)))
+    return listed + remaining
+
+
+def normalize_categorical_columns(df, columns=CATEGORICAL_COLUMNS, orders=None):
+    """Convert repeated string key columns to ``pandas.Categorical``.
+
+    Equality masks and groupbys on the converted columns compare integer
+    codes instead of Python strings, and each distinct value is stored once.
+    Categories follow ``orders`` (default: :func:`category_orders`) where a
+    column has one, so sorted groupby/pivot output keeps the configured
+    order. Columns that are missing, already categorical, or hold
+    unhashable cells (lists/arrays) are left unchanged. Group with
+    ``observed=True`` so unused categories do not create empty groups.
+
+    Args:
+        df: DataFrame to normalize (modified in place)
+        columns: Candidate column names
+        orders: Optional mapping of column name to preferred category order
+
+    Returns:
+        pandas.DataFrame: ``df``
+    """
+    if orders is None:
+        orders = category_orders()
+
+    for column in columns:
+        if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        if df[column].dtype != object and not pd.api.types.is_string_dtype(df[column].dtype):
+            continue
+        try:
+            categories = ordered_categories(df[column].to_numpy(), orders.get(column))
+        except TypeError:
+            continue
+        df[column] = pd.Categorical(df[column], categories=categories)
+    return df
+
+
+def map_categories(series, mapping):
+    """Relabel the values of ``series`` through ``mapping`` (unmapped values are kept).
+
+    A categorical ``series`` stays categorical and keeps its category order;
+    categories mapped to the same label are merged at the position of the
+    first one. Other series are mapped value by value.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.map(lambda value: mapping.get(value, value))
+
+    labels = [mapping.get(category, category) for category in series.cat.categories]
+    categories = list(dict.fromkeys(labels))
+    lookup = np.array([categories.index(label) for label in labels], dtype=int)
+    codes = series.cat.codes.to_numpy()
+    mapped = np.where(codes >= 0, lookup[np.maximum(codes, 0)], -1) if len(lookup) else codes
+    return pd.Series(pd.Categorical.from_codes(mapped, categories=categories), index=series.index, name=series.name)
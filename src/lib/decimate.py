@@ -0,0 +1,142 @@
+import numpy as np
+
+
+DECIMATE_METHODS = ("minmax", "lttb")
+
+# Series are only decimated when they have this many points per pixel
+# column or more; shorter series are drawn untouched.
+DECIMATE_MIN_POINTS_PER_PIXEL = 4
+
+
+def minmax_decimate(x, y, n_pixels):
+    """Keep the first, last, minimum and maximum point of every pixel column.
+
+    This (M4) reduction draws the same pixels as the full series for a line
+    rasterised at ``n_pixels`` columns, since every vertical extent and every
+    column boundary crossing is preserved.
+
+    Args:
+        x: Monotonically increasing x values
+        y: y values
+        n_pixels: Number of pixel columns spanned by ``x``
+
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_pixels = max(1, int(n_pixels))
+
+    span = x[-1] - x[0]
+    if x.size <= DECIMATE_MIN_POINTS_PER_PIXEL * n_pixels or span <= 0:
+        return np.arange(x.size)
+
+    columns = np.minimum(((x - x[0]) / span * n_pixels).astype(int), n_pixels - 1)
+    starts = np.flatnonzero(np.diff(columns, prepend=-1))
+    ends = np.append(starts[1:], x.size)
+    counts = ends - starts
+
+    positions = np.arange(x.size)
+    column_of = np.repeat(np.arange(starts.size), counts)
+    lowest = np.minimum.reduceat(y, starts)
+    highest = np.maximum.reduceat(y, starts)
+    argmin = np.minimum.reduceat(np.where(y == lowest[column_of], positions, x.size), starts)
+    argmax = np.minimum.reduceat(np.where(y == highest[column_of], positions, x.size), starts)
+
+    return np.unique(np.concatenate([starts, ends - 1, argmin, argmax]))
+
+
+def lttb_decimate(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, for every bucket in between, the
+    point spanning the largest triangle with the previously kept point and
+    the mean of the next bucket.
+
+    Args:
+        x: Monotonically increasing x values
+        y: y values
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_out = int(n_out)
+    if n_out >= x.size or n_out < 3:
+        return np.arange(x.size)
+
+    edges = np.linspace(1, x.size - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0] = 0
+    kept[-1] = x.size - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_lo, next_hi = hi, edges[bucket + 2] if bucket + 2 < edges.size else x.size
+        if next_hi <= next_lo:
+            next_hi = next_lo + 1
+        mean_x = x[next_lo:next_hi].mean()
+        mean_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[previous] - mean_x) * (y[lo:hi] - y[previous])
+            - (x[previous] - x[lo:hi]) * (mean_y - y[previous])
+        )
+        previous = lo + int(np.argmax(area))
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+def decimation_indices(x, y, n_pixels, method="minmax"):
+    """Return the indices of ``(x, y)`` to keep when drawn over ``n_pixels`` columns.
+
+    Series that are short, non-monotonic in x or contain non-finite values
+    (which matplotlib draws as gaps) are left alone and ``None`` is returned.
+
+    Args:
+        x, y: Series to decimate (``x`` in the coordinates pixels are uniform in)
+        n_pixels: Pixel columns available for the series
+        method: ``minmax`` (per-pixel extrema) or ``lttb``
+
+    Returns:
+        numpy.ndarray or None: Sorted indices to keep, or ``None`` to keep all
+    """
+    if method not in DECIMATE_METHODS:
+        raise ValueError(f"Unknown decimation method '{method}'. Use one of {', '.join(DECIMATE_METHODS)}.")
+
+    try:
+        x_array = np.asarray(x, dtype=float)
+        y_array = np.asarray(y, dtype=float)
+    except (TypeError, ValueError):
+        return None
+
+    n_pixels = max(1, int(n_pixels))
+    if (
+        x_array.ndim != 1
+        or x_array.shape != y_array.shape
+        or x_array.size < DECIMATE_MIN_POINTS_PER_PIXEL * n_pixels
+        or not np.all(np.isfinite(x_array))
+        or not np.all(np.isfinite(y_array))
+        or np.any(np.diff(x_array) < 0)
+    ):
+        return None
+
+    if method == "minmax":
+        return minmax_decimate(x_array, y_array, n_pixels)
+    return lttb_decimate(x_array, y_array, 2 * n_pixels)
+
+
+def decimate_series(x, y, n_pixels, method="minmax"):
+    """Reduce a long series to roughly the resolution it is drawn at.
+
+    Returns:
+        tuple: ``(x, y)``, decimated when :func:`decimation_indices` allows it
+    """
+    keep = decimation_indices(x, y, n_pixels, method)
+    if keep is None:
+        return x, y
+    return np.asarray(x, dtype=float)[keep], np.asarray(y, dtype=float)[keep]
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+DENSITY_REDUCTIONS = ("count", "mean", "max")
+
+
+def _finite_range(values, value_range=None):
+    if value_range is not None and len(value_range) == 2 and value_range[1] > value_range[0]:
+        return float(value_range[0]), float(value_range[1])
+
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    lo, hi = float(finite.min()), float(finite.max())
+    if hi <= lo:
+        return lo - 0.5, hi + 0.5
+    return lo, hi
+
+
+def aggregate_points(x, y, values=None, reduction="count", shape=(256, 256), x_range=None, y_range=None):
+    """Bin a point cloud onto a regular canvas and reduce every cell.
+
+    Points outside the ranges or with non-finite coordinates (or values) are
+    dropped. Empty cells are ``NaN`` so they render as background.
+
+    Args:
+        x, y: Point coordinates
+        values: Per-point values reduced by ``mean``/``max``
+        reduction: ``count``, ``mean`` or ``max``
+        shape: Canvas shape as ``(n_rows, n_cols)`` (y bins, x bins)
+        x_range, y_range: Canvas extent (defaults to the data range)
+
+    Returns:
+        tuple: ``(grid, x_edges, y_edges)`` with ``grid`` of shape ``shape``,
+        row ``i`` spanning ``y_edges[i]`` to ``y_edges[i + 1]``
+    """
+    if reduction not in DENSITY_REDUCTIONS:
+        raise ValueError(f"Unknown reduction '{reduction}'. Use one of {', '.join(DENSITY_REDUCTIONS)}.")
+    if reduction != "count" and values is None:
+        raise ValueError(f"Reduction '{reduction}' needs per-point values")
+
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    if x.shape != y.shape:
+        raise ValueError("x and y must have the same length")
+    values = None if values is None else np.asarray(values, dtype=float).ravel()
+
+    n_rows, n_cols = (max(1, int(n)) for n in shape)
+    x_lo, x_hi = _finite_range(x, x_range)
+    y_lo, y_hi = _finite_range(y, y_range)
+    x_edges = np.linspace(x_lo, x_hi, n_cols + 1)
+    y_edges = np.linspace(y_lo, y_hi, n_rows + 1)
+
+    cols = np.floor((x - x_lo) / (x_hi - x_lo) * n_cols)
+    rows = np.floor((y - y_lo) / (y_hi - y_lo) * n_rows)
+    # Points on the upper edge belong to the last cell, as in np.histogram2d.
+    cols[x == x_hi] = n_cols - 1
+    rows[y == y_hi] = n_rows - 1
+    keep = (cols >= 0) & (cols < n_cols) & (rows >= 0) & (rows < n_rows)
+    if reduction != "count":
+        keep &= np.isfinite(values)
+
+    flat = rows[keep].astype(np.intp) * n_cols + cols[keep].astype(np.intp)
+    size = n_rows * n_cols
+    counts = np.bincount(flat, minlength=size).astype(float)
+
+    if reduction == "count":
+        grid = counts
+    elif reduction == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid = np.bincount(flat, weights=values[keep], minlength=size) / counts
+    else:
+        grid = np.full(size, -np.inf)
+        np.maximum.at(grid, flat, values[keep])
+
+    grid = np.where(counts > 0, grid, np.nan)
+    return grid.reshape(n_rows, n_cols), x_edges, y_edges
@@ -0,0 +1,198 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# An event index is a directory next to the source pickle holding one
+# ``.npy`` file per column, with rows sorted by event. ``events.npy`` lists
+# the sorted event ids and ``offsets.npy`` the first row of every event, so
+# the hits of one event are a contiguous slice of each memory-mapped column.
+EVENT_INDEX_SUFFIX = ".events"
+EVENT_INDEX_VERSION = 1
+
+
+def event_index_path(datafile):
+    """Return the event index directory belonging to ``datafile``."""
+    datafile = Path(datafile)
+    return datafile.with_name(datafile.stem + EVENT_INDEX_SUFFIX)
+
+
+def _column_file(position):
+    return f"column_{position}.npy"
+
+
+def write_event_index(df, index_dir, event_column="Event"):
+    """Write ``df`` as an event-indexed column store.
+
+    Numeric columns are stored as plain arrays; other columns are stored as
+    integer codes with their categories kept in ``categories.pkl``. The
+    directory is written next to its final location and renamed into place.
+
+    Args:
+        df: DataFrame with one row per hit
+        index_dir: Target directory (replaced if it exists)
+        event_column: Column holding the event (or cluster) id
+
+    Returns:
+        pathlib.Path: ``index_dir``
+    """
+    if event_column not in df.columns:
+        raise ValueError(f"Column '{event_column}' not found; cannot build an event index")
+
+    index_dir = Path(index_dir)
+    keys = df[event_column].to_numpy()
+    if keys.dtype == object:
+        # Sort on the stored (string) keys so searchsorted in load_events holds.
+        keys = keys.astype(str)
+    order = np.argsort(keys, kind="stable")
+    df = df.iloc[order].reset_index(drop=True)
+    keys = keys[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if keys.size else np.array([], dtype=int)
+
+    staging = Path(tempfile.mkdtemp(prefix=index_dir.name + ".", dir=index_dir.parent))
+    try:
+        np.save(staging / "events.npy", keys[starts])
+        np.save(staging / "offsets.npy", np.append(starts, keys.size).astype(np.int64))
+
+        columns, categories = [], {}
+        for position, name in enumerate(df.columns):
+            values = df[name].to_numpy()
+            if values.dtype.kind in "biufcmM":
+                kind = "array"
+            else:
+                try:
+                    values, uniques = pd.factorize(df[name], use_na_sentinel=True)
+                except TypeError as exc:
+                    raise ValueError(f"Column '{name}' holds unhashable values and cannot be indexed") from exc
+                categories[position] = list(uniques)
+                kind = "categorical"
+            np.save(staging / _column_file(position), values)
+            columns.append({"name": name, "kind": kind})
+
+        with (staging / "categories.pkl").open("wb") as fh:
+            pickle.dump(categories, fh)
+        with (staging / "meta.json").open("w") as fh:
+            json.dump(
+                {
+                    "version": EVENT_INDEX_VERSION,
+                    "event_column": event_column,
+                    "n_rows": int(keys.size),
+                    "columns": columns,
+                },
+                fh,
+                indent=2,
+            )
+
+        if index_dir.exists():
+            shutil.rmtree(index_dir)
+        os.replace(staging, index_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    _open_event_index.cache_clear()
+    return index_dir
+
+
+@lru_cache(maxsize=8)
+def _open_event_index(index_dir, _mtime):
+    index_dir = Path(index_dir)
+    with (index_dir / "meta.json").open() as fh:
+        meta = json.load(fh)
+    with (index_dir / "categories.pkl").open("rb") as fh:
+        categories = pickle.load(fh)
+
+    arrays = [np.load(index_dir / _column_file(position), mmap_mode="r") for position in range(len(meta["columns"]))]
+    return {
+        "meta": meta,
+        "events": np.load(index_dir / "events.npy"),
+        "offsets": np.load(index_dir / "offsets.npy"),
+        "arrays": arrays,
+        "categories": {int(key): np.asarray(value, dtype=object) for key, value in categories.items()},
+    }
+
+
+def open_event_index(index_dir):
+    """Open (and cache) an event index; only the event table is read eagerly."""
+    index_dir = Path(index_dir)
+    return _open_event_index(str(index_dir), (index_dir / "meta.json").stat().st_mtime_ns)
+
+
+def list_events(index_dir):
+    """Return the sorted event ids stored in ``index_dir``."""
+    return open_event_index(index_dir)["events"]
+
+
+def load_events(index_dir, events, columns=None):
+    """Read the hits of ``events`` from an event index.
+
+    Only the rows of the requested events are read from the memory-mapped
+    columns, so the cost does not depend on the number of stored events.
+    Unknown event ids are ignored.
+
+    Args:
+        index_dir: Event index directory
+        events: Event id or sequence of event ids
+        columns: Optional subset of columns to read
+
+    Returns:
+        pandas.DataFrame: Hits of the requested events, in event order
+    """
+    index = open_event_index(index_dir)
+    keys, offsets = index["events"], index["offsets"]
+
+    requested = np.atleast_1d(np.asarray(events))
+    try:
+        requested = requested.astype(keys.dtype)
+    except (TypeError, ValueError):
+        requested = np.array([], dtype=keys.dtype)
+    positions = np.searchsorted(keys, requested)
+    found = positions < keys.size
+    found[found] = keys[positions[found]] == requested[found]
+    positions = np.unique(positions[found])
+
+    rows = [np.arange(offsets[p], offsets[p + 1]) for p in positions]
+    rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+
+    data = {}
+    for position, column in enumerate(index["meta"]["columns"]):
+        if columns is not None and column["name"] not in columns:
+            continue
+        values = np.asarray(index["arrays"][position][rows])
+        if column["kind"] == "categorical":
+            uniques = index["categories"][position]
+            decoded = np.full(values.size, None, dtype=object)
+            valid = values >= 0
+            decoded[valid] = uniques[values[valid]]
+            values = decoded
+        data[column["name"]] = values
+    return pd.DataFrame(data)
+
+
+def ensure_event_index(datafile, event_column="Event"):
+    """Return an up-to-date event index for a pickled hit table, building it if needed.
+
+    The index is rebuilt when it is missing, older than ``datafile`` or was
+    built for a different event column.
+    """
+    datafile = Path(datafile)
+    index_dir = event_index_path(datafile)
+    meta_path = index_dir / "meta.json"
+    if meta_path.exists() and meta_path.stat().st_mtime >= datafile.stat().st_mtime:
+        with meta_path.open() as fh:
+            meta = json.load(fh)
+        if meta.get("version") == EVENT_INDEX_VERSION and meta.get("event_column") == event_column:
+            return index_dir
+
+    with datafile.open("rb") as fh:
+        data = pickle.load(fh)
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    return write_event_index(df, index_dir, event_column=event_column)
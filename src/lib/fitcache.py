@@ -0,0 +1,193 @@
+import hashlib
+import inspect
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+
+DEFAULT_FIT_CACHE_DIR = Path(__file__).resolve().parents[2] / "output" / "fits" / "cache"
+DEFAULT_FIT_CACHE_MAX_ENTRIES = 5000
+DEFAULT_FIT_CACHE_MAX_MEGABYTES = 512
+FIT_CURVE_POINTS = 1000
+
+
+def fit_model_identity(function, name=None):
+    """Return a string identifying a model function and its current source.
+
+    Editing the function body changes the identity, so cached fits of an old
+    implementation are never reused.
+    """
+    try:
+        source = inspect.getsource(function)
+    except (OSError, TypeError):
+        code = getattr(function, "__code__", None)
+        source = code.co_code.hex() if code is not None else repr(function)
+
+    qualname = getattr(function, "__qualname__", type(function).__name__)
+    module = getattr(function, "__module__", "")
+    digest = hashlib.sha1(source.encode()).hexdigest()[:16]
+    prefix = f"{name}:" if name else ""
+    return f"{prefix}{module}.{qualname}:{digest}"
+
+
+def _update_array_hash(digest, value):
+    if value is None:
+        digest.update(b"none")
+        return
+    array = np.ascontiguousarray(np.asarray(value, dtype=float))
+    digest.update(str(array.shape).encode())
+    digest.update(array.tobytes())
+
+
+def fit_cache_key(x, y, error, model_identity, fit_range=None, p0=None, bounds=None):
+    """Hash the data arrays, model identity, fit range, initial guesses and bounds."""
+    digest = hashlib.sha1()
+    for value in (x, y, error):
+        _update_array_hash(digest, value)
+    digest.update(model_identity.encode())
+    _update_array_hash(digest, fit_range)
+    _update_array_hash(digest, p0)
+    if bounds is not None:
+        # curve_fit bounds are (lower, upper), each a scalar or one value per parameter
+        digest.update(b"bounds")
+        for bound in bounds:
+            _update_array_hash(digest, bound)
+    return digest.hexdigest()
+
+
+def _cache_path(key, cache_dir):
+    return Path(cache_dir) / key[:2] / f"{key}.pkl"
+
+
+def load_cached_fit(key, cache_dir=None):
+    """Return the cached entry for ``key`` or ``None``.
+
+    Hits refresh the file modification time, which drives LRU eviction.
+    """
+    path = _cache_path(key, cache_dir or DEFAULT_FIT_CACHE_DIR)
+    try:
+        with open(path, "rb") as handle:
+            entry = pickle.load(handle)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry
+
+
+def store_cached_fit(key, entry, cache_dir=None, max_entries=None, max_megabytes=None, evict=True):
+    """Write ``entry`` under ``key`` and evict least recently used entries.
+
+    Pass ``evict=False`` when storing a batch and call :func:`evict_fit_cache`
+    once afterwards.
+    """
+    cache_dir = cache_dir or DEFAULT_FIT_CACHE_DIR
+    path = _cache_path(key, cache_dir)
+    os.makedirs(path.parent, exist_ok=True)
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as handle:
+        pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    if evict:
+        evict_fit_cache(cache_dir, max_entries=max_entries, max_megabytes=max_megabytes)
+
+
+def evict_fit_cache(cache_dir=None, max_entries=None, max_megabytes=None):
+    """Drop the least recently used entries beyond the entry/size limits.
+
+    Returns:
+        int: Number of evicted entries
+    """
+    cache_dir = Path(cache_dir or DEFAULT_FIT_CACHE_DIR)
+    max_entries = DEFAULT_FIT_CACHE_MAX_ENTRIES if max_entries is None else int(max_entries)
+    max_bytes = (
+        DEFAULT_FIT_CACHE_MAX_MEGABYTES if max_megabytes is None else float(max_megabytes)
+    ) * 1024**2
+
+    entries = []
+    for path in cache_dir.glob("*/*.pkl"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    if len(entries) <= max_entries and total_bytes <= max_bytes:
+        return 0
+
+    evicted = 0
+    entries.sort()
+    while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+        _, size, path = entries.pop(0)
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total_bytes -= size
+        evicted += 1
+
+    return evicted
+
+
+def evaluate_fit_products(function, x, y, params, fit_range=None, curve_points=FIT_CURVE_POINTS):
+    """Evaluate a fitted model on the data points and on a dense curve.
+
+    Returns:
+        dict: ``Fit`` (model at the data x), ``Residuals`` ((y - fit)/fit,
+        NaN where undefined), ``CurveX`` and ``CurveY`` (dense curve over the
+        fit range, or over the data range without one)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    params = np.asarray(params, dtype=float)
+
+    if np.isnan(params).any():
+        fit = np.full_like(x, np.nan)
+    else:
+        fit = np.asarray(function(x, *params), dtype=float)
+
+    diff = y - fit
+    mask = np.isfinite(fit) & (fit != 0) & np.isfinite(diff)
+    residuals = np.full_like(diff, np.nan)
+    residuals[mask] = diff[mask] / fit[mask]
+
+    if fit_range is not None:
+        curve_x = np.linspace(fit_range[0], fit_range[1], curve_points)
+    elif x.size:
+        curve_x = np.linspace(np.nanmin(x), np.nanmax(x), curve_points)
+    else:
+        curve_x = np.array([], dtype=float)
+
+    if np.isnan(params).any():
+        curve_y = np.full_like(curve_x, np.nan)
+    else:
+        curve_y = np.asarray(function(curve_x, *params), dtype=float)
+
+    return {"Fit": fit, "Residuals": residuals, "CurveX": curve_x, "CurveY": curve_y}
+
+
+def cached_fit_products(function, x, y, params, error=None, fit_range=None, cache_dir=None, model_identity=None):
+    """Return :func:`evaluate_fit_products` for fixed parameters, via the cache.
+
+    Used when the parameters come from the input table rather than a refit;
+    the parameters take the place of the initial guesses in the cache key.
+    Entries are stored without eviction; call :func:`evict_fit_cache` once
+    after the last row.
+    """
+    identity = model_identity or fit_model_identity(function)
+    key = fit_cache_key(x, y, error, identity, fit_range=fit_range, p0=params)
+    entry = load_cached_fit(key, cache_dir)
+    if entry is not None:
+        return entry
+
+    entry = evaluate_fit_products(function, x, y, params, fit_range=fit_range)
+    store_cached_fit(key, entry, cache_dir, evict=False)
+    return entry
@@ -0,0 +1,362 @@
+import inspect
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .fitcache import (
+    evaluate_fit_products,
+    evict_fit_cache,
+    fit_cache_key,
+    fit_model_identity,
+    load_cached_fit,
+    store_cached_fit,
+)
+
+
+def _linear_basis(x):
+    return np.stack([x, np.ones_like(x)], axis=-1)
+
+
+def _quadratic_basis(x):
+    return np.stack([x**2, x, np.ones_like(x)], axis=-1)
+
+
+def _cubic_basis(x):
+    return np.stack([x**3, x**2, x, np.ones_like(x)], axis=-1)
+
+
+# Models that are linear in their parameters are solved in closed form for
+# every series at once. Parameter order matches the evaluated polynomial.
+LINEAR_FIT_MODELS = {
+    "linear": {"basis": _linear_basis, "params": ["m", "b"]},
+    "quadratic": {"basis": _quadratic_basis, "params": ["a", "b", "c"]},
+    "cubic": {"basis": _cubic_basis, "params": ["a", "b", "c", "d"]},
+}
+
+
+def resolve_fit_model(model):
+    """Resolve a model name to its fit description.
+
+    Names in ``LINEAR_FIT_MODELS`` are fitted by vectorized least squares; any
+    other name is looked up in ``lib.functions`` (e.g. ``resolution``,
+    ``gaussian``) and fitted with ``scipy.optimize.curve_fit``.
+
+    Returns:
+        dict: ``name``, ``kind`` (``linear``/``nonlinear``), ``function`` and
+        ``params`` (parameter names)
+    """
+    if model in LINEAR_FIT_MODELS:
+        spec = LINEAR_FIT_MODELS[model]
+        basis = spec["basis"]
+        return {
+            "name": model,
+            "kind": "linear",
+            "basis": basis,
+            "function": lambda x, *params: basis(np.asarray(x, dtype=float)) @ np.asarray(params, dtype=float),
+            "params": list(spec["params"]),
+        }
+
+    from lib import functions as fit_functions
+
+    function = getattr(fit_functions, model, None)
+    if not callable(function):
+        available = ", ".join(sorted(LINEAR_FIT_MODELS))
+        raise ValueError(
+            f"Unknown fit model '{model}'. Use one of {available} or a function defined in lib.functions."
+        )
+
+    params = list(inspect.signature(function).parameters)[1:]
+    return {
+        "name": model,
+        "kind": "nonlinear",
+        "function": function,
+        "params": params,
+    }
+
+
+def _select_fit_points(x, y, error=None, fit_range=None):
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    error = None if error is None else np.asarray(error, dtype=float).ravel()
+
+    mask = np.isfinite(x) & np.isfinite(y)
+    if error is not None:
+        mask &= np.isfinite(error) & (error > 0)
+    if fit_range is not None:
+        mask &= (x >= fit_range[0]) & (x <= fit_range[1])
+
+    return x[mask], y[mask], None if error is None else error[mask]
+
+
+def _empty_fit_result(n_params):
+    return {
+        "Params": np.full(n_params, np.nan),
+        "ParamsError": np.full(n_params, np.nan),
+        "ParamsCovariance": np.full((n_params, n_params), np.nan),
+        "Chi2": np.nan,
+        "NDoF": 0,
+    }
+
+
+def fit_linear_series(basis, xs, ys, errors=None, fit_range=None):
+    """Fit a linear-in-parameter model to many series with one batched solve.
+
+    Series are padded to a common length with zero weights, so all normal
+    equations are assembled and solved as stacked arrays. With errors the
+    covariance is absolute; without them it is scaled by chi2/ndof, matching
+    ``curve_fit``.
+
+    Returns:
+        list: One result dict per series (see :func:`fit_series_batch`)
+    """
+    errors = errors if errors is not None else [None] * len(xs)
+    points = [_select_fit_points(x, y, e, fit_range) for x, y, e in zip(xs, ys, errors)]
+
+    n_series = len(points)
+    n_params = basis(np.zeros(1)).shape[-1]
+    if n_series == 0:
+        return []
+
+    length = max(1, max(p[0].size for p in points))
+    x_pad = np.zeros((n_series, length))
+    y_pad = np.zeros((n_series, length))
+    w_pad = np.zeros((n_series, length))
+    for idx, (x, y, error) in enumerate(points):
+        x_pad[idx, : x.size] = x
+        y_pad[idx, : y.size] = y
+        w_pad[idx, : x.size] = 1.0 if error is None else 1.0 / error**2
+
+    design = basis(x_pad)
+    weighted = design * w_pad[..., None]
+    normal = np.einsum("snp,snq->spq", weighted, design)
+    rhs = np.einsum("snp,sn->sp", weighted, y_pad)
+
+    counts = np.array([p[0].size for p in points])
+    solvable = (counts >= n_params) & (np.linalg.matrix_rank(normal) == n_params)
+
+    params = np.full((n_series, n_params), np.nan)
+    covariance = np.full((n_series, n_params, n_params), np.nan)
+    if solvable.any():
+        params[solvable] = np.linalg.solve(normal[solvable], rhs[solvable][..., None])[..., 0]
+        covariance[solvable] = np.linalg.inv(normal[solvable])
+
+    residuals = y_pad - np.einsum("snp,sp->sn", design, np.nan_to_num(params))
+    chi2 = np.sum(w_pad * residuals**2, axis=1)
+    ndof = counts - n_params
+
+    results = []
+    for idx in range(n_series):
+        if not solvable[idx]:
+            results.append(_empty_fit_result(n_params))
+            continue
+
+        cov = covariance[idx]
+        if errors[idx] is None and ndof[idx] > 0:
+            cov = cov * chi2[idx] / ndof[idx]
+        results.append(
+            {
+                "Params": params[idx],
+                "ParamsError": np.sqrt(np.clip(np.diag(cov), 0, None)),
+                "ParamsCovariance": cov,
+                "Chi2": float(chi2[idx]),
+                "NDoF": int(ndof[idx]),
+            }
+        )
+
+    return results
+
+
+def _fit_nonlinear_chunk(function, n_params, chunk, p0=None, bounds=None, maxfev=10000):
+    """Fit consecutive series, warm-starting each from the previous solution."""
+    from scipy.optimize import curve_fit
+
+    results = []
+    guess = None if p0 is None else np.asarray(p0, dtype=float)
+    for x, y, error in chunk:
+        if x.size < n_params:
+            results.append(_empty_fit_result(n_params))
+            continue
+
+        try:
+            params, cov = curve_fit(
+                function,
+                x,
+                y,
+                p0=guess,
+                sigma=error,
+                absolute_sigma=error is not None,
+                bounds=bounds if bounds is not None else (-np.inf, np.inf),
+                # trf steps scale with max(1, |p|), so warm starts near zero do
+                # not freeze a parameter the way MINPACK's relative step does.
+                method="trf",
+                max_nfev=maxfev,
+            )
+        except (RuntimeError, ValueError, TypeError):
+            results.append(_empty_fit_result(n_params))
+            continue
+
+        model = function(x, *params)
+        weights = 1.0 if error is None else 1.0 / error**2
+        results.append(
+            {
+                "Params": params,
+                "ParamsError": np.sqrt(np.clip(np.diag(cov), 0, None)),
+                "ParamsCovariance": cov,
+                "Chi2": float(np.sum(weights * (y - model) ** 2)),
+                "NDoF": int(x.size - n_params),
+            }
+        )
+        if np.all(np.isfinite(params)):
+            guess = params
+
+    return results
+
+
+def fit_nonlinear_series(function, xs, ys, errors=None, fit_range=None, p0=None, bounds=None, workers=1):
+    """Fit a nonlinear model to many series with ``curve_fit``.
+
+    Series are split into contiguous chunks, one per worker process. Inside a
+    chunk each fit starts from the parameters of the previous series, which
+    keeps scans over a smoothly varying iterable (thresholds, energies) fast
+    and stable.
+    """
+    errors = errors if errors is not None else [None] * len(xs)
+    points = [_select_fit_points(x, y, e, fit_range) for x, y, e in zip(xs, ys, errors)]
+    n_params = len(inspect.signature(function).parameters) - 1
+
+    workers = max(1, min(int(workers or 1), len(points)))
+    if workers <= 1:
+        return _fit_nonlinear_chunk(function, n_params, points, p0=p0, bounds=bounds)
+
+    bounds_idx = np.linspace(0, len(points), workers + 1).astype(int)
+    chunks = [points[lo:hi] for lo, hi in zip(bounds_idx[:-1], bounds_idx[1:]) if hi > lo]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_fit_nonlinear_chunk, function, n_params, chunk, p0, bounds)
+            for chunk in chunks
+        ]
+        return [result for future in futures for result in future.result()]
+
+
+def fit_series_batch(
+    model,
+    xs,
+    ys,
+    errors=None,
+    fit_range=None,
+    p0=None,
+    bounds=None,
+    workers=1,
+    cache_dir=None,
+    use_cache=True,
+):
+    """Fit ``model`` to every series in one call.
+
+    Each series is first looked up in the fit cache (see ``lib.fitcache``),
+    keyed by its data, the model identity, the fit range, ``p0`` and
+    ``bounds``; only the misses are fitted, and their results are stored back.
+
+    Args:
+        model: Model name (see :func:`resolve_fit_model`)
+        xs, ys: Sequences of x and y arrays, one entry per series
+        errors: Optional sequence of y-error arrays (``None`` entries allowed)
+        fit_range: Optional ``(min, max)`` x-range used for the fit
+        p0: Initial guess for the first nonlinear fit
+        bounds: Optional ``curve_fit`` bounds for nonlinear fits
+        workers: Worker processes for nonlinear fits
+        cache_dir: Fit cache directory (defaults to ``output/fits/cache``)
+        use_cache: Disable to always refit
+
+    Returns:
+        tuple: ``(spec, results)`` where ``spec`` is the resolved model and
+        ``results`` holds one dict per series with ``Params``, ``ParamsError``,
+        ``ParamsCovariance``, ``Chi2``, ``NDoF`` and the fit products of
+        ``lib.fitcache.evaluate_fit_products``
+    """
+    spec = resolve_fit_model(model)
+    errors = list(errors) if errors is not None else [None] * len(xs)
+
+    keys = [None] * len(xs)
+    results = [None] * len(xs)
+    if use_cache:
+        identity = (
+            f"builtin:{spec['name']}"
+            if spec["kind"] == "linear"
+            else fit_model_identity(spec["function"], spec["name"])
+        )
+        for idx, (x, y, error) in enumerate(zip(xs, ys, errors)):
+            keys[idx] = fit_cache_key(x, y, error, identity, fit_range=fit_range, p0=p0, bounds=bounds)
+            results[idx] = load_cached_fit(keys[idx], cache_dir)
+
+    missing = [idx for idx, result in enumerate(results) if result is None]
+    if not missing:
+        return spec, results
+
+    miss_xs = [xs[idx] for idx in missing]
+    miss_ys = [ys[idx] for idx in missing]
+    miss_errors = [errors[idx] for idx in missing]
+    if all(error is None for error in miss_errors):
+        miss_errors = None
+
+    if spec["kind"] == "linear":
+        fitted = fit_linear_series(spec["basis"], miss_xs, miss_ys, errors=miss_errors, fit_range=fit_range)
+    else:
+        fitted = fit_nonlinear_series(
+            spec["function"],
+            miss_xs,
+            miss_ys,
+            errors=miss_errors,
+            fit_range=fit_range,
+            p0=p0,
+            bounds=bounds,
+            workers=workers,
+        )
+
+    for idx, result in zip(missing, fitted):
+        result.update(
+            evaluate_fit_products(spec["function"], xs[idx], ys[idx], result["Params"], fit_range=fit_range)
+        )
+        results[idx] = result
+        if use_cache:
+            store_cached_fit(keys[idx], result, cache_dir, evict=False)
+
+    if use_cache:
+        evict_fit_cache(cache_dir)
+
+    return spec, results
+
+
+def save_fit_results(path, keys, spec, results, fit_range=None):
+    """Write fitted parameters, errors and covariances to a pickled table.
+
+    Args:
+        path: Output ``.pkl`` path
+        keys: One dict of identifying columns (Config, Name, iterable...) per result
+        spec: Resolved model from :func:`fit_series_batch`
+        results: Fit results from :func:`fit_series_batch`
+        fit_range: Fit range used, stored alongside the parameters
+
+    Returns:
+        pandas.DataFrame: The table that was written
+    """
+    rows = []
+    for key, result in zip(keys, results):
+        row = dict(key)
+        row.update(
+            {
+                "FitModel": spec["name"],
+                "FitRange": None if fit_range is None else tuple(fit_range),
+                "ParamsLabel": list(spec["params"]),
+                **result,
+            }
+        )
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as handle:
+        pickle.dump(table, handle)
+    return table
@@ -0,0 +1,210 @@
+import os
+import pickle
+import re
+from functools import lru_cache
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+GRID_REF_PREFIX = "npy:"
+GRID_STORE_SUFFIX = ".grids"
+
+
+def default_grid_dir():
+    """Return the directory grid references are resolved against (``input/data``)."""
+    return Path(__file__).resolve().parents[2] / "input" / "data"
+
+
+def is_grid_ref(value):
+    return isinstance(value, str) and value.startswith(GRID_REF_PREFIX)
+
+
+def make_grid_ref(block_path, index=None):
+    ref = f"{GRID_REF_PREFIX}{Path(block_path).as_posix()}"
+    if index is not None:
+        ref += f"#{int(index)}"
+    return ref
+
+
+def parse_grid_ref(ref):
+    """Split a grid reference into its block path and optional row index."""
+    if not is_grid_ref(ref):
+        raise ValueError(f"Not a grid reference: {ref!r}")
+
+    block_path, _, index = ref[len(GRID_REF_PREFIX):].partition("#")
+    return block_path, int(index) if index else None
+
+
+@lru_cache(maxsize=64)
+def open_grid_block(path):
+    """Memory-map a stored ``.npy`` block read-only.
+
+    Blocks are cached per path so repeated references into the same block
+    share a single mapping.
+    """
+    return np.load(path, mmap_mode="r", allow_pickle=False)
+
+
+def resolve_grid(value, base_dir=None):
+    """Return the array referenced by ``value`` as a zero-copy memory-mapped view.
+
+    Args:
+        value: Grid reference string (``npy:<block>.npy#<row>``)
+        base_dir: Directory relative block paths are resolved against
+            (defaults to ``input/data``)
+
+    Returns:
+        numpy.ndarray: Read-only view into the memory-mapped block
+    """
+    block_path, index = parse_grid_ref(value)
+    path = Path(block_path)
+    if not path.is_absolute():
+        path = Path(base_dir if base_dir is not None else default_grid_dir()) / path
+
+    block = open_grid_block(str(path))
+    return block if index is None else block[index]
+
+
+def as_float_array(value, base_dir=None):
+    """Return ``value`` as a float array, resolving grid references on the fly.
+
+    Float64 arrays and memory-mapped blocks are returned without copying.
+    """
+    if is_grid_ref(value):
+        value = resolve_grid(value, base_dir=base_dir)
+    return np.asarray(value, dtype=float)
+
+
+def store_grid_columns(df, columns, store_name, base_dir=None):
+    """Move array cells of ``columns`` into memory-mapped ``.npy`` blocks.
+
+    Cells of the same column that share a shape are stacked into one block
+    ``<base_dir>/<store_name>.grids/<column>_<n>.npy`` and replaced by a
+    reference string that :func:`resolve_grid` maps back to a zero-copy view.
+    Cells that are already references or are not array-like are left untouched.
+
+    Args:
+        df: DataFrame with array-valued cells
+        columns: Column names to externalise
+        store_name: Store name, usually the datafile basename
+        base_dir: Directory the store is created in (defaults to ``input/data``)
+
+    Returns:
+        pandas.DataFrame: Copy of ``df`` with the array cells replaced by references
+    """
+    base_dir = Path(base_dir if base_dir is not None else default_grid_dir())
+    store_dir = Path(f"{store_name}{GRID_STORE_SUFFIX}")
+    os.makedirs(base_dir / store_dir, exist_ok=True)
+    open_grid_block.cache_clear()
+
+    stored = df.copy()
+    for column in columns:
+        if column not in stored.columns:
+            continue
+
+        # Blocks of a previous write would otherwise linger next to the new ones.
+        block_name = re.compile(rf"{re.escape(str(column))}_\d+\.npy")
+        for stale in (base_dir / store_dir).iterdir():
+            if block_name.fullmatch(stale.name):
+                stale.unlink()
+
+        blocks = {}
+        for position, value in enumerate(stored[column]):
+            if value is None or is_grid_ref(value) or np.isscalar(value):
+                continue
+            array = np.asarray(value, dtype=float)
+            blocks.setdefault(array.shape, []).append((position, array))
+
+        refs = list(stored[column])
+        for block_idx, entries in enumerate(blocks.values()):
+            block_path = store_dir / f"{column}_{block_idx}.npy"
+            np.save(base_dir / block_path, np.stack([array for _, array in entries]))
+            for row_idx, (position, _) in enumerate(entries):
+                refs[position] = make_grid_ref(block_path, row_idx)
+
+        stored[column] = pd.Series(refs, index=stored.index, dtype=object)
+
+    open_grid_block.cache_clear()
+    return stored
+
+
+def array_columns(df):
+    """Return the columns of ``df`` whose cells hold arrays (or lists)."""
+    columns = []
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        values = df[column].dropna()
+        if len(values) and values.map(lambda value: isinstance(value, (list, tuple, np.ndarray))).all():
+            columns.append(column)
+    return columns
+
+
+def convert_grid_datafile(path, columns=None, output_name=None):
+    """Write a copy of a pickled datafile whose grid cells live in a grid store.
+
+    The arrays go to ``<output_name>.grids/`` next to ``path`` and the
+    remaining (small) frame is pickled as ``<output_name>.pkl``, so loading it
+    with ``--datafile <output_name>`` no longer unpickles every grid. Grid
+    references resolve against ``input/data``, so convert files stored there.
+
+    Args:
+        path: Pickled DataFrame (or dict of columns)
+        columns: Columns to externalise (default: every array-valued column)
+        output_name: Name of the converted datafile (default ``<stem>_grids``)
+
+    Returns:
+        tuple: ``(pickle path, list of converted columns)``
+    """
+    path = Path(path)
+    output_name = output_name or f"{path.stem}_grids"
+    with path.open("rb") as fh:
+        data = pickle.load(fh)
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    columns = array_columns(df) if columns is None else [column for column in columns if column in df.columns]
+
+    stored = store_grid_columns(df, columns, output_name, base_dir=path.parent)
+    output_path = path.with_name(f"{output_name}.pkl")
+    stored.to_pickle(output_path)
+    return output_path, columns
+
+
+def share_grid(value):
+    """Expose a grid cell to worker processes without pickling its contents.
+
+    Grid references are passed through unchanged since workers can map the
+    block themselves; in-memory arrays are copied once into a shared memory
+    segment.
+
+    Returns:
+        tuple: ``(segment, descriptor)`` where ``segment`` is the owning
+        ``SharedMemory`` (``None`` for references) and ``descriptor`` is the
+        picklable handle accepted by :func:`open_shared_grid`
+    """
+    if is_grid_ref(value):
+        return None, value
+
+    array = as_float_array(value)
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    shared[...] = array
+    del shared
+    return segment, (segment.name, array.shape, array.dtype.str)
+
+
+def open_shared_grid(descriptor, base_dir=None):
+    """Attach to a grid exposed by :func:`share_grid`.
+
+    Returns:
+        tuple: ``(segment, array)``; close ``segment`` (when not ``None``) once
+        every view into ``array`` has been released
+    """
+    if is_grid_ref(descriptor):
+        return None, resolve_grid(descriptor, base_dir=base_dir)
+
+    name, shape, dtype = descriptor
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
@@ -0,0 +1,229 @@
+import numpy as np
+
+
+# Pairwise operations between a reference line ``r`` and another line ``o``.
+# ``value`` evaluates the operation and ``partials`` returns the derivatives
+# with respect to ``(r, o)`` used for first-order error propagation. All
+# callables broadcast, so one call covers every (reference, line) pair.
+PAIRWISE_OPERATIONS = {
+    "subtract": {
+        "value": lambda r, o: o - r,
+        "partials": lambda r, o: (-np.ones_like(r * o), np.ones_like(r * o)),
+        "label": "{label} - {ref}",
+    },
+    "add": {
+        "value": lambda r, o: o + r,
+        "partials": lambda r, o: (np.ones_like(r * o), np.ones_like(r * o)),
+        "label": "{label} + {ref}",
+    },
+    "ratio": {
+        "value": lambda r, o: o / r,
+        "partials": lambda r, o: (-o / r**2, 1.0 / r),
+        "label": "{label}/{ref}",
+    },
+    "relative_difference": {
+        "value": lambda r, o: 100.0 * (o - r) / r,
+        "partials": lambda r, o: (-100.0 * o / r**2, 100.0 / r),
+        "label": "({label} - {ref})/{ref} [%]",
+    },
+    "absolute_relative_difference": {
+        "value": lambda r, o: 100.0 * np.abs((o - r) / r),
+        "partials": lambda r, o: (-100.0 * o / r**2, 100.0 / r),
+        "label": "|{label} - {ref}|/{ref} [%]",
+    },
+    "asymmetry": {
+        "value": lambda r, o: (r - o) / (0.5 * (r + o)),
+        "partials": lambda r, o: (4.0 * o / (r + o) ** 2, -4.0 * r / (r + o) ** 2),
+        "label": "({ref} - {label})/(0.5*({ref}+{label}))",
+    },
+}
+
+REDUCTION_OPERATIONS = ("sum", "mean", "rms")
+
+
+def _finite_or_nan(values):
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, np.nan)
+
+
+def _same_grid(x, grid):
+    return x.shape == grid.shape and np.allclose(x, grid, equal_nan=True)
+
+
+def common_x_grid(xs):
+    """Return the shared x grid of ``xs``.
+
+    Identical grids are returned as they are; otherwise the sorted union of
+    all finite x values is used.
+    """
+    xs = [np.asarray(x, dtype=float) for x in xs]
+    if not xs:
+        return np.array([], dtype=float)
+    if all(_same_grid(x, xs[0]) for x in xs[1:]):
+        return xs[0]
+
+    merged = np.concatenate(xs)
+    return np.unique(merged[np.isfinite(merged)])
+
+
+def stack_lines(xs, ys, errors=None, x_grid=None):
+    """Stack lines into 2D arrays on a common x grid.
+
+    Lines already on the grid are copied in place; the others are linearly
+    interpolated and set to NaN outside their own x range.
+
+    Args:
+        xs, ys: Sequences of x and y arrays, one entry per line
+        errors: Optional sequence of y-error arrays (``None`` entries allowed)
+        x_grid: Target grid (defaults to :func:`common_x_grid`)
+
+    Returns:
+        tuple: ``(x_grid, values, errors)`` with ``values`` and ``errors`` of
+        shape ``(n_lines, n_points)``; ``errors`` is ``None`` without inputs
+    """
+    xs = [np.asarray(x, dtype=float) for x in xs]
+    ys = [np.asarray(y, dtype=float) for y in ys]
+    if len(xs) != len(ys):
+        raise ValueError("xs and ys must have the same length")
+
+    grid = common_x_grid(xs) if x_grid is None else np.asarray(x_grid, dtype=float)
+    has_errors = errors is not None and any(e is not None for e in errors)
+    errors = list(errors) if errors is not None else [None] * len(ys)
+
+    values = np.full((len(ys), grid.size), np.nan)
+    stacked_errors = np.full_like(values, np.nan) if has_errors else None
+
+    for idx, (x, y, error) in enumerate(zip(xs, ys, errors)):
+        error = None if error is None else np.asarray(error, dtype=float)
+        if _same_grid(x, grid):
+            values[idx] = y
+            if has_errors and error is not None:
+                stacked_errors[idx] = error
+            continue
+
+        order = np.argsort(x, kind="stable")
+        values[idx] = np.interp(grid, x[order], y[order], left=np.nan, right=np.nan)
+        if has_errors and error is not None:
+            stacked_errors[idx] = np.interp(
+                grid, x[order], error[order], left=np.nan, right=np.nan
+            )
+
+    return grid, values, stacked_errors
+
+
+def resolve_references(references, n_lines):
+    """Normalise a reference selection to an index array.
+
+    ``None`` or ``"all"`` selects every line; integers are clamped to the
+    valid range like ``--reference`` always has been.
+    """
+    if references is None or (isinstance(references, str) and references == "all"):
+        return np.arange(n_lines)
+
+    indices = np.atleast_1d(np.asarray(references, dtype=int))
+    return np.clip(indices, 0, max(n_lines - 1, 0))
+
+
+def compute_line_operation(values, operation, references=0, errors=None):
+    """Apply ``operation`` to stacked lines in a single broadcast expression.
+
+    Args:
+        values: Array of shape ``(n_lines, n_points)``
+        operation: Name from ``PAIRWISE_OPERATIONS`` or ``REDUCTION_OPERATIONS``
+        references: Reference index, sequence of indices or ``"all"``
+        errors: Optional uncertainties with the shape of ``values``; they are
+            treated as uncorrelated and propagated to first order
+
+    Returns:
+        dict: ``values`` and ``errors`` (``None`` without inputs). Pairwise
+        operations yield shape ``(n_refs, n_lines, n_points)`` indexed by
+        ``references`` (also returned); reductions yield ``(n_points,)``
+    """
+    op = operation.lower()
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    errors = None if errors is None else np.atleast_2d(np.asarray(errors, dtype=float))
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if op in REDUCTION_OPERATIONS:
+            count = values.shape[0]
+            if op == "sum":
+                result = np.sum(values, axis=0)
+                variance = None if errors is None else np.sum(errors**2, axis=0)
+            elif op == "mean":
+                result = np.mean(values, axis=0)
+                variance = None if errors is None else np.sum(errors**2, axis=0) / count**2
+            else:
+                result = np.sqrt(np.mean(values**2, axis=0))
+                variance = (
+                    None
+                    if errors is None
+                    else np.sum((values * errors) ** 2, axis=0) / (count * result) ** 2
+                )
+            return {
+                "values": result,
+                "errors": None if variance is None else _finite_or_nan(np.sqrt(variance)),
+                "references": None,
+            }
+
+        if op not in PAIRWISE_OPERATIONS:
+            raise ValueError(f"Unsupported pairwise operation: {operation}")
+
+        spec = PAIRWISE_OPERATIONS[op]
+        ref_idx = resolve_references(references, values.shape[0])
+        reference = values[ref_idx][:, None, :]
+        other = values[None, :, :]
+        result = _finite_or_nan(spec["value"](reference, other))
+
+        result_errors = None
+        if errors is not None:
+            d_ref, d_other = spec["partials"](reference, other)
+            variance = (d_ref * errors[ref_idx][:, None, :]) ** 2 + (d_other * errors[None, :, :]) ** 2
+            result_errors = _finite_or_nan(np.sqrt(variance))
+
+    return {"values": result, "errors": result_errors, "references": ref_idx}
+
+
+def line_operation_series(labels, values, operation, references=0, errors=None):
+    """Compute ``operation`` and flatten the result into labelled series.
+
+    Pairs of a line with itself are dropped. Series are ordered by reference,
+    then by line.
+
+    Returns:
+        list: Dicts with ``label``, ``values``, ``errors``, ``index`` (line
+        index, ``None`` for reductions) and ``reference``
+    """
+    if len(labels) != len(values):
+        raise ValueError("labels and values must have the same length")
+    if len(values) == 0:
+        return []
+
+    op = operation.lower()
+    result = compute_line_operation(values, op, references=references, errors=errors)
+    if op in REDUCTION_OPERATIONS:
+        return [
+            {
+                "label": op,
+                "values": result["values"],
+                "errors": result["errors"],
+                "index": None,
+                "reference": None,
+            }
+        ]
+
+    template = PAIRWISE_OPERATIONS[op]["label"]
+    series = []
+    for rdx, ref_idx in enumerate(result["references"]):
+        for idx, label in enumerate(labels):
+            if idx == ref_idx:
+                continue
+            series.append(
+                {
+                    "label": template.format(label=label, ref=labels[ref_idx]),
+                    "values": result["values"][rdx, idx],
+                    "errors": None if result["errors"] is None else result["errors"][rdx, idx],
+                    "index": idx,
+                    "reference": int(ref_idx),
+                }
+            )
+    return series
@@ -2,6 +2,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from typing import Any
 
+from .decimate import decimation_indices
+from .density import aggregate_points
 from . import (
     default_linewidth,
     legend_style,
@@ -124,7 +126,8 @@ def _apply_plot_style(kwargs, plot_style):
         return
     kwargs["ls"] = plot_style
 
-from matplotlib.colors import LogNorm
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import LogNorm, Normalize
 from matplotlib.ticker import FuncFormatter
 
 
@@ -243,6 +246,189 @@ def apply_legend_style(
     return ax.legend(**style)
 
 
+# Histogram keyword arguments that a decimated step outline can reproduce.
+_DECIMATABLE_STEP_KWARGS = {"linewidth", "lw", "ls", "linestyle", "alpha", "zorder", "histtype", "align"}
+
+
+def _axes_pixel_size(ax):
+    """Return the ``(width, height)`` of ``ax`` in pixels at the larger of the figure and save DPI."""
+    fig = ax.figure
+    dpi = float(fig.dpi)
+    save_dpi = figure_save_dpi(fig) or plt.rcParams.get("savefig.dpi", "figure")
+    if save_dpi != "figure":
+        dpi = max(dpi, float(save_dpi))
+    position = ax.get_position()
+    return position.width * fig.get_figwidth() * dpi, position.height * fig.get_figheight() * dpi
+
+
+def _decimation_pixels(args, ax, x):
+    """Return the pixel columns available to ``x`` on ``ax`` when saved.
+
+    Uses the larger of the figure and ``savefig`` DPI, and scales up when
+    ``--rangex`` zooms into part of the data range.
+    """
+    pixels = _axes_pixel_size(ax)[0]
+
+    rangex = getattr(args, "rangex", None)
+    if rangex is not None and len(rangex) == 2 and rangex[1] > rangex[0]:
+        span = float(np.nanmax(x) - np.nanmin(x))
+        pixels *= max(1.0, span / float(rangex[1] - rangex[0]))
+    return max(1, int(np.ceil(pixels)))
+
+
+def _maybe_decimate(args, ax, x, y, line_kwargs=None):
+    """Apply the ``--decimate`` method to a line series, if requested.
+
+    Markers and ``steps-*`` draw styles would change visibly when points are
+    dropped, so such series are left untouched.
+    """
+    method = getattr(args, "decimate", None)
+    if not method or y is None:
+        return x, y
+
+    line_kwargs = line_kwargs or {}
+    if line_kwargs.get("marker") not in (None, "", "None", "none"):
+        return x, y
+    if str(line_kwargs.get("drawstyle", line_kwargs.get("ds", "default"))).startswith("steps"):
+        return x, y
+
+    try:
+        x_array = np.asarray(x, dtype=float)
+        y_array = np.asarray(y, dtype=float)
+    except (TypeError, ValueError):
+        return x, y
+
+    if x_array.ndim != 1 or x_array.size == 0:
+        return x, y
+
+    x_pixels = x_array
+    if getattr(args, "logx", False) or ax.get_xscale() == "log":
+        if np.any(x_array <= 0):
+            return x, y
+        x_pixels = np.log10(x_array)
+
+    keep = decimation_indices(x_pixels, y_array, _decimation_pixels(args, ax, x_array), method)
+    if keep is None:
+        return x, y
+    return x_array[keep], y_array[keep]
+
+
+def _decimated_step(args, ax, x_edges, y, label, color, hist_kwargs):
+    """Draw a step histogram as a decimated outline; return ``False`` when not applicable."""
+    if not getattr(args, "decimate", None) or x_edges is None or y is None:
+        return False
+    if not set(hist_kwargs) <= _DECIMATABLE_STEP_KWARGS:
+        return False
+    if hist_kwargs.get("histtype", "step") != "step" or hist_kwargs.get("align", "mid") != "mid":
+        return False
+
+    try:
+        edges = np.asarray(x_edges, dtype=float)
+        values = np.asarray(y, dtype=float)
+    except (TypeError, ValueError):
+        return False
+    if edges.ndim != 1 or values.ndim != 1 or edges.size != values.size + 1:
+        return False
+
+    # Same outline as hist(histtype="step"): drops to zero at both ends.
+    outline = _edge_step_vertices(edges, values)
+    outline_x = np.concatenate([[edges[0]], outline[:, 0], [edges[-1]]])
+    outline_y = np.concatenate([[0.0], outline[:, 1], [0.0]])
+    decimated_x, decimated_y = _maybe_decimate(args, ax, outline_x, outline_y)
+    if decimated_x is outline_x:
+        return False
+
+    line_kwargs = {key: value for key, value in hist_kwargs.items() if key not in {"histtype", "align"}}
+    ax.plot(decimated_x, decimated_y, label=label, color=color, **line_kwargs)
+    return True
+
+
+def _artist_point_count(artist):
+    """Return the number of markers, vertices or mesh cells ``artist`` draws."""
+    if hasattr(artist, "get_children") and not hasattr(artist, "draw"):
+        # Containers (errorbar, bar) only group their children.
+        return max((_artist_point_count(child) for child in artist.get_children()), default=0)
+    if hasattr(artist, "get_coordinates"):
+        array = artist.get_array()
+        return 0 if array is None else int(np.size(array))
+    if hasattr(artist, "get_offsets") and len(artist.get_offsets()) > 1:
+        return len(artist.get_offsets())
+    if hasattr(artist, "get_segments"):
+        return len(artist.get_segments())
+    if hasattr(artist, "get_xydata"):
+        return len(artist.get_xydata())
+    if hasattr(artist, "get_paths"):
+        return len(artist.get_paths())
+    return 0
+
+
+def rasterize_dense_artist(artist, threshold, n_points=None):
+    """Rasterize ``artist`` in vector outputs when it draws more than ``threshold`` points.
+
+    Only the artist itself is rasterized; axes, labels, text and legend
+    handles stay vector. Containers returned by ``errorbar``/``bar`` are
+    handled child by child.
+
+    Args:
+        artist: Matplotlib artist or container
+        threshold: Point-count threshold (``None`` or ``0`` disables)
+        n_points: Point count to compare, counted from the artist if omitted
+
+    Returns:
+        bool: ``True`` if the artist was rasterized
+    """
+    if artist is None or not threshold or threshold <= 0:
+        return False
+    if n_points is None:
+        n_points = _artist_point_count(artist)
+    if n_points <= threshold:
+        return False
+
+    children = artist.get_children() if not hasattr(artist, "draw") else [artist]
+    for child in children:
+        child.set_rasterized(True)
+    return True
+
+
+def _artist_figure(artist):
+    if not hasattr(artist, "draw"):
+        # Containers (errorbar, bar) only group their children.
+        artist = next(iter(artist.get_children()), None)
+    return getattr(artist, "figure", None)
+
+
+def figure_save_dpi(fig):
+    """Return the ``--rasterize_dpi`` recorded on ``fig`` by :func:`apply_rasterize_options`, or ``None``."""
+    return getattr(fig, "_rasterize_dpi", None)
+
+
+def figure_save_context(fig):
+    """Context manager that saves ``fig`` at its recorded ``--rasterize_dpi``.
+
+    ``savefig.dpi`` is only overridden inside the context, so figures saved
+    later in the same process keep their own DPI.
+    """
+    dpi = figure_save_dpi(fig)
+    return plt.rc_context({"savefig.dpi": dpi} if dpi else {})
+
+
+def apply_rasterize_options(args, artist, n_points=None):
+    """Apply ``--rasterize_threshold``/``--rasterize_dpi`` to ``artist``.
+
+    Matplotlib rasterizes every layer of a figure at the DPI it is saved
+    with, so once a layer is actually rasterized ``--rasterize_dpi`` is
+    recorded on the artist's figure (see :func:`figure_save_dpi`) for the
+    caller to save that figure with.
+    """
+    if not rasterize_dense_artist(artist, getattr(args, "rasterize_threshold", None), n_points):
+        return False
+    dpi = getattr(args, "rasterize_dpi", None)
+    figure = _artist_figure(artist)
+    if dpi and figure is not None:
+        figure._rasterize_dpi = dpi
+    return True
+
+
 def plot_data(
     args,
     ax,
@@ -262,6 +448,14 @@ def plot_data(
 
     Supported ``plot_style`` options: ``-``, ``--``, ``:``, ``-.``,
     ``solid``, ``dashed``, ``dotted``, ``dashdot``.
+
+    With ``args.decimate`` (``minmax`` or ``lttb``) long ``plot``, ``line``
+    and ``step`` series are reduced to the resolution of the axes before
+    they are handed to matplotlib.
+
+    With ``args.rasterize_threshold`` the ``scatter``, ``scatter_points``,
+    ``hist2d`` and ``image`` artists drawing more points (or mesh cells) than
+    the threshold are rasterized in vector outputs at ``args.rasterize_dpi``.
     """
 
     plot_type = plot_type or getattr(args, "plot_type", None)
@@ -278,7 +472,7 @@ def plot_data(
 
     if plot_type == "scatter":
         kwargs.setdefault("linewidth", default_linewidth)
-        ax.errorbar(
+        container = ax.errorbar(
             x,
             y,
             yerr=errory if getattr(args, "errory", False) else None,
@@ -287,6 +481,7 @@ def plot_data(
             color=color,
             **kwargs,
         )
+        apply_rasterize_options(args, container)
         return None
 
     if plot_type == "line":
@@ -318,6 +513,7 @@ def plot_data(
         else:
             plot_kwargs = dict(kwargs)
             _apply_plot_style(plot_kwargs, resolved_plot_style)
+            x, y = _maybe_decimate(args, ax, x, y, plot_kwargs)
             ax.plot(x, y, label=label, color=color, **plot_kwargs)
         return None
 
@@ -325,6 +521,8 @@ def plot_data(
         hist_kwargs = dict(kwargs)
         hist_kwargs.setdefault("linewidth", default_linewidth)
         _apply_plot_style(hist_kwargs, resolved_plot_style)
+        if _decimated_step(args, ax, x_edges, y, label, color, hist_kwargs):
+            return None
         ax.hist(
             x,
             bins=x_edges,
@@ -341,6 +539,7 @@ def plot_data(
         plot_kwargs = dict(kwargs)
         plot_kwargs.setdefault("linewidth", default_linewidth)
         _apply_plot_style(plot_kwargs, resolved_plot_style)
+        x, y = _maybe_decimate(args, ax, x, y, plot_kwargs)
         ax.plot(x, y, label=label, color=color, **plot_kwargs)
         return None
 
@@ -360,7 +559,9 @@ def plot_data(
         )
 
     if plot_type == "scatter_points":
-        return ax.scatter(x, y, label=label, color=color, **kwargs)
+        collection = ax.scatter(x, y, label=label, color=color, **kwargs)
+        apply_rasterize_options(args, collection)
+        return collection
 
     if plot_type == "bar":
         kwargs.setdefault("linewidth", default_linewidth)
@@ -374,11 +575,15 @@ def plot_data(
         )
 
     if plot_type == "boxplot":
+        box_stats = kwargs.pop("box_stats", None)
+        if box_stats is not None:
+            # Precomputed statistics (see lib.boxstats) skip matplotlib's own quantile pass.
+            return ax.bxp(box_stats, label=label, **kwargs)
         boxplot_data = kwargs.pop("boxplot_data", y)
         return ax.boxplot(boxplot_data, label=label, **kwargs)
 
     if plot_type == "hist2d":
-        return ax.hist2d(
+        hist2d = ax.hist2d(
             x,
             y,
             bins=kwargs.pop("bins", getattr(args, "bins", None)),
@@ -387,15 +592,172 @@ def plot_data(
             density=kwargs.pop("density", getattr(args, "density", False)),
             **kwargs,
         )
+        apply_rasterize_options(args, hist2d[3])
+        return hist2d
 
     if plot_type == "image":
         z = kwargs.pop("z", None)
         norm = LogNorm() if getattr(args, "logz", False) else None
-        return ax.pcolormesh(x, y, z, norm=norm, shading="auto", **kwargs)
+        mesh = ax.pcolormesh(x, y, z, norm=norm, shading="auto", **kwargs)
+        apply_rasterize_options(args, mesh)
+        return mesh
 
     raise ValueError(f"Unknown plot type: {plot_type}")
 
 
+def _steps_mid_vertices(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size < 2:
+        return np.column_stack([x, y])
+
+    mids = 0.5 * (x[:-1] + x[1:])
+    step_x = np.concatenate([[x[0]], np.repeat(mids, 2), [x[-1]]])
+    return np.column_stack([step_x, np.repeat(y, 2)])
+
+
+def _edge_step_vertices(x_edges, y):
+    x_edges = np.asarray(x_edges, dtype=float)
+    y = np.asarray(y, dtype=float)
+    step_x = np.repeat(x_edges, 2)[1:-1]
+    return np.column_stack([step_x, np.repeat(y, 2)])
+
+
+def plot_line_collection(
+    ax,
+    xs,
+    ys,
+    values,
+    x_edges=None,
+    drawstyle=None,
+    cmap="viridis",
+    linestyle=None,
+    colorbar=True,
+    colorbar_label=None,
+    **kwargs,
+):
+    """Draw many series as a single colormapped ``LineCollection``.
+
+    Render cost stays flat in the number of series, so scans over hundreds of
+    iterable values can be drawn without dropping lines. Each series is
+    colored by its entry in ``values``; non-numeric values are mapped to
+    their position and labelled on the colorbar.
+
+    Args:
+        ax: Target axes
+        xs, ys: Sequences of x and y arrays, one entry per series
+        values: Iterable value of each series (drives the colormap)
+        x_edges: Optional sequence of bin edges per series; draws histogram steps
+        drawstyle: ``steps-mid`` to match ``plot(..., drawstyle="steps-mid")``
+        cmap: Matplotlib colormap name
+        linestyle: Line style applied to every series
+        colorbar: Add a colorbar next to ``ax``
+        colorbar_label: Colorbar label
+
+    Returns:
+        matplotlib.collections.LineCollection: The added collection
+    """
+    segments = []
+    for sdx, (x, y) in enumerate(zip(xs, ys)):
+        edges = None if x_edges is None else x_edges[sdx]
+        if edges is not None and len(edges) == len(y) + 1:
+            segments.append(_edge_step_vertices(edges, y))
+        elif drawstyle == "steps-mid" or edges is not None:
+            segments.append(_steps_mid_vertices(x, y))
+        else:
+            segments.append(np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)]))
+
+    try:
+        color_values = np.asarray(values, dtype=float)
+        tick_labels = None
+    except (TypeError, ValueError):
+        color_values = np.arange(len(values), dtype=float)
+        tick_labels = [str(value) for value in values]
+
+    finite = color_values[np.isfinite(color_values)]
+    vmin, vmax = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+    if vmin == vmax:
+        vmin, vmax = vmin - 0.5, vmax + 0.5
+
+    kwargs.setdefault("linewidths", default_linewidth)
+    resolved_style = _resolve_plot_style(linestyle)
+    if resolved_style == "None":
+        # Collections draw a "None" dash pattern as solid; hide the lines instead.
+        kwargs["linewidths"] = 0
+    elif resolved_style is not None:
+        kwargs.setdefault("linestyles", resolved_style)
+
+    collection = LineCollection(
+        segments,
+        cmap=cmap,
+        norm=Normalize(vmin=vmin, vmax=vmax),
+        **kwargs,
+    )
+    collection.set_array(color_values)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+
+    if colorbar:
+        cbar = ax.figure.colorbar(collection, ax=ax, label=colorbar_label)
+        if tick_labels is not None:
+            ticks = np.unique(np.linspace(0, len(tick_labels) - 1, min(len(tick_labels), 10)).round().astype(int))
+            cbar.set_ticks(ticks)
+            cbar.set_ticklabels([tick_labels[tick] for tick in ticks])
+
+    return collection
+
+
+def plot_density_image(
+    ax,
+    x,
+    y,
+    values=None,
+    reduction="count",
+    x_range=None,
+    y_range=None,
+    shape=None,
+    cmap="viridis",
+    norm=None,
+    **kwargs,
+):
+    """Draw a point cloud as a pixel-resolution image instead of one marker per point.
+
+    Points are binned onto a canvas matching the pixel size of ``ax`` (at the
+    save DPI) and every pixel is reduced by ``count``, ``mean`` or ``max`` of
+    ``values``. Empty pixels are left transparent.
+
+    Args:
+        ax: Target axes
+        x, y: Point coordinates
+        values: Per-point values for ``mean``/``max``
+        reduction: ``count``, ``mean`` or ``max``
+        x_range, y_range: Canvas extent (defaults to the data range)
+        shape: Canvas shape ``(n_rows, n_cols)`` (defaults to the axes pixels)
+        cmap: Matplotlib colormap name
+        norm: Optional matplotlib norm
+
+    Returns:
+        matplotlib.image.AxesImage: The added image
+    """
+    if shape is None:
+        width, height = _axes_pixel_size(ax)
+        shape = (max(1, int(np.ceil(height))), max(1, int(np.ceil(width))))
+
+    grid, x_edges, y_edges = aggregate_points(
+        x, y, values=values, reduction=reduction, shape=shape, x_range=x_range, y_range=y_range
+    )
+    kwargs.setdefault("interpolation", "nearest")
+    return ax.imshow(
+        grid,
+        origin="lower",
+        extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+        aspect="auto",
+        cmap=cmap,
+        norm=norm,
+        **kwargs,
+    )
+
+
 def add_note_to_axes(ax, note_text, fontsize=None):
     """Add a text annotation to the best position on an axes.
     
@@ -589,6 +951,59 @@ def draw_horizontal_lines(ax, values, labels=None, styles=None, colors=None, fon
             place_horizontal_label(ax, v, label, fontsize=fontsize)
 
 
+def _add_full_height_collection(ax, collection, x_values):
+    """Add an x-data/y-axes collection to *ax* and autoscale x like ``axvline``/``axvspan``."""
+    collection.set_transform(ax.get_xaxis_transform())
+    ax.add_collection(collection, autolim=False)
+    if x_values.size:
+        ax.update_datalim(np.column_stack([x_values, np.zeros_like(x_values)]), updatey=False)
+        ax.autoscale_view(scaley=False)
+    return collection
+
+
+def draw_vertical_spans(ax, starts, ends, color="gray", alpha=0.14, zorder=1, **kwargs):
+    """Shade any number of full-height x ranges on *ax* as one ``PolyCollection``.
+
+    Equivalent to one ``axvspan`` per ``(start, end)`` pair; pairs with a
+    non-finite edge are skipped.
+    """
+    starts = np.asarray(starts, dtype=float).ravel()
+    ends = np.asarray(ends, dtype=float).ravel()
+    count = min(starts.size, ends.size)
+    starts, ends = starts[:count], ends[:count]
+    keep = np.isfinite(starts) & np.isfinite(ends)
+    starts, ends = starts[keep], ends[keep]
+
+    verts = np.empty((starts.size, 4, 2))
+    verts[:, :, 0] = np.column_stack([starts, starts, ends, ends])
+    verts[:, :, 1] = [0.0, 1.0, 1.0, 0.0]
+    collection = PolyCollection(verts, facecolors=color, edgecolors="none", alpha=alpha, zorder=zorder, **kwargs)
+    return _add_full_height_collection(ax, collection, np.concatenate([starts, ends]))
+
+
+def draw_vertical_line_collection(ax, values, color="gray", linestyle="--", linewidth=0.8, alpha=1.0, zorder=2, **kwargs):
+    """Draw any number of full-height vertical lines on *ax* as one ``LineCollection``.
+
+    Equivalent to one ``axvline`` per value; non-finite values are skipped.
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    values = values[np.isfinite(values)]
+
+    segments = np.empty((values.size, 2, 2))
+    segments[:, :, 0] = values[:, None]
+    segments[:, :, 1] = [0.0, 1.0]
+    collection = LineCollection(
+        segments,
+        colors=color,
+        linestyles=linestyle,
+        linewidths=linewidth,
+        alpha=alpha,
+        zorder=zorder,
+        **kwargs,
+    )
+    return _add_full_height_collection(ax, collection, values)
+
+
 def place_vertical_label(ax, x_value, label_text, fontsize=None, pad_fraction=0.02):
     """Place a label next to a vertical line at `x_value` in the least-populated vertical gap.
 
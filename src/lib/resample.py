@@ -0,0 +1,206 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+
+RESAMPLE_MODES = ("linear", "step", "integral")
+
+# Every mode is expressed as a gather: target bin ``t`` takes
+# ``sum_k weights[t, k] * values[indices[t, k]]``. ``covered`` marks target
+# points that have support in the source grid; the others receive ``fill``.
+ResampleWeights = namedtuple("ResampleWeights", ["indices", "weights", "covered"])
+
+
+def _as_grid(x):
+    return np.ascontiguousarray(np.asarray(x, dtype=float).ravel())
+
+
+def _grid_key(x):
+    return x.tobytes()
+
+
+@lru_cache(maxsize=256)
+def _cached_bin_edges(key):
+    x = np.frombuffer(key, dtype=float)
+    if x.size == 1:
+        return np.array([x[0] - 0.5, x[0] + 0.5])
+
+    widths = np.diff(x)
+    if np.allclose(widths, widths[0]):
+        return np.linspace(x[0] - widths[0] / 2, x[-1] + widths[0] / 2, x.size + 1)
+
+    return np.concatenate(
+        [
+            [x[0] - widths[0] / 2],
+            x[:-1] + widths / 2,
+            [x[-1] + widths[-1] / 2],
+        ]
+    )
+
+
+def bin_edges_from_centers(x):
+    """Return bin edges for bin centers ``x``.
+
+    Uniform grids get evenly spaced edges; otherwise edges sit halfway between
+    neighbouring centers and the outer bins are extrapolated. Results are
+    cached per grid and returned read-only.
+
+    Args:
+        x: Bin centers (at least one value)
+
+    Returns:
+        numpy.ndarray: ``len(x) + 1`` edges
+    """
+    x = _as_grid(x)
+    if x.size == 0:
+        raise ValueError("Cannot derive bin edges from an empty grid")
+
+    edges = _cached_bin_edges(_grid_key(x))
+    edges.flags.writeable = False
+    return edges
+
+
+def _linear_weights(source, target):
+    if source.size == 1:
+        indices = np.zeros((target.size, 2), dtype=int)
+        weights = np.column_stack([np.ones(target.size), np.zeros(target.size)])
+        return indices, weights, target == source[0]
+
+    upper = np.clip(np.searchsorted(source, target, side="right"), 1, source.size - 1)
+    lower = upper - 1
+    span = source[upper] - source[lower]
+    fraction = np.where(span > 0, (target - source[lower]) / np.where(span > 0, span, 1.0), 0.0)
+    fraction = np.clip(fraction, 0.0, 1.0)
+
+    indices = np.column_stack([lower, upper])
+    weights = np.column_stack([1.0 - fraction, fraction])
+    covered = (target >= source[0]) & (target <= source[-1])
+    return indices, weights, covered
+
+
+def _step_weights(source, target):
+    edges = _cached_bin_edges(_grid_key(source))
+    bins = np.searchsorted(edges, target, side="right") - 1
+    covered = (target >= edges[0]) & (target <= edges[-1])
+    bins = np.clip(bins, 0, source.size - 1)
+    return bins[:, None], np.ones((target.size, 1)), covered
+
+
+def _integral_weights(source, target):
+    source_edges = _cached_bin_edges(_grid_key(source))
+    target_edges = _cached_bin_edges(_grid_key(target))
+    lo_edges, hi_edges = target_edges[:-1], target_edges[1:]
+
+    first = np.clip(np.searchsorted(source_edges, lo_edges, side="right") - 1, 0, source.size - 1)
+    last = np.clip(np.searchsorted(source_edges, hi_edges, side="left") - 1, 0, source.size - 1)
+    width = max(1, int(np.max(last - first + 1)))
+
+    indices = np.minimum(first[:, None] + np.arange(width), source.size - 1)
+    overlap = np.minimum(hi_edges[:, None], source_edges[indices + 1]) - np.maximum(
+        lo_edges[:, None], source_edges[indices]
+    )
+    in_range = np.arange(width) <= (last - first)[:, None]
+    weights = np.where(in_range, np.clip(overlap, 0.0, None), 0.0)
+    weights /= np.diff(source_edges)[indices]
+    return indices, weights, weights.sum(axis=1) > 0
+
+
+_WEIGHT_BUILDERS = {
+    "linear": _linear_weights,
+    "step": _step_weights,
+    "integral": _integral_weights,
+}
+
+
+@lru_cache(maxsize=128)
+def _cached_resample_weights(source_key, target_key, mode):
+    source = np.frombuffer(source_key, dtype=float)
+    target = np.frombuffer(target_key, dtype=float)
+
+    order = np.argsort(source, kind="stable")
+    indices, weights, covered = _WEIGHT_BUILDERS[mode](source[order], target)
+    return ResampleWeights(order[indices], weights, covered)
+
+
+def resample_weights(source_x, target_x, mode="linear"):
+    """Return the cached gather indices and weights mapping ``source_x`` onto ``target_x``.
+
+    Args:
+        source_x: Source grid (bin centers; any order)
+        target_x: Target grid (bin centers, increasing for ``integral``)
+        mode: ``linear`` (interpolate between neighbours), ``step`` (value of
+            the source bin containing the target point) or ``integral``
+            (redistribute bin contents by overlap so totals are preserved)
+
+    Returns:
+        ResampleWeights: ``indices`` and ``weights`` of shape
+        ``(len(target_x), k)`` and the boolean ``covered`` mask
+    """
+    if mode not in _WEIGHT_BUILDERS:
+        raise ValueError(f"Unknown resample mode '{mode}'. Use one of {', '.join(RESAMPLE_MODES)}.")
+
+    source = _as_grid(source_x)
+    target = _as_grid(target_x)
+    if source.size == 0:
+        raise ValueError("Cannot resample from an empty grid")
+
+    return _cached_resample_weights(_grid_key(source), _grid_key(target), mode)
+
+
+def _apply_weights(values, resample, fill, quadrature=False):
+    values = np.asarray(values, dtype=float)
+    gathered = values[..., resample.indices]
+    if quadrature:
+        result = np.sqrt(np.sum((gathered * resample.weights) ** 2, axis=-1))
+    else:
+        result = np.sum(gathered * resample.weights, axis=-1)
+    return np.where(resample.covered, result, fill)
+
+
+def resample_series(xs, ys, target_x, errors=None, mode="linear", fill=0.0):
+    """Map any number of ``(x, y, errors)`` series onto one target grid.
+
+    Series that share a source grid are resampled together in a single
+    gather. Errors may be ``None``, one array (symmetric) or a pair of
+    arrays (asymmetric lower/upper); they are interpolated like the values in
+    ``linear`` and ``step`` mode and added in quadrature in ``integral`` mode.
+
+    Args:
+        xs, ys: Sequences of source grids and values, one entry per series
+        target_x: Shared target grid
+        errors: Optional sequence of per-series errors
+        mode: Resampling mode (see :func:`resample_weights`)
+        fill: Value used outside the source range
+
+    Returns:
+        tuple: ``(values, errors)`` where ``values`` has shape
+        ``(n_series, len(target_x))`` and ``errors`` is a list with one entry
+        per series in the input layout (``None`` without errors)
+    """
+    if len(xs) != len(ys):
+        raise ValueError("xs and ys must have the same length")
+    if mode not in _WEIGHT_BUILDERS:
+        raise ValueError(f"Unknown resample mode '{mode}'. Use one of {', '.join(RESAMPLE_MODES)}.")
+
+    target = _as_grid(target_x)
+    errors = list(errors) if errors is not None else [None] * len(ys)
+    values = np.full((len(ys), target.size), float(fill))
+    resampled_errors = [None] * len(ys)
+
+    groups = {}
+    for idx, x in enumerate(xs):
+        groups.setdefault(_grid_key(_as_grid(x)), []).append(idx)
+
+    for key, members in groups.items():
+        if not key:
+            raise ValueError("Cannot resample from an empty grid")
+        weights = _cached_resample_weights(key, _grid_key(target), mode)
+        values[members] = _apply_weights(np.vstack([ys[idx] for idx in members]), weights, fill)
+        for idx in members:
+            if errors[idx] is not None:
+                resampled_errors[idx] = _apply_weights(
+                    errors[idx], weights, fill, quadrature=mode == "integral"
+                )
+
+    return values, resampled_errors
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+def aggregate_mean_with_error(df, keys, value_column, error_column):
+    """Group ``df`` by ``keys`` and reduce to the mean and its combined error.
+
+    The error of each group is ``sqrt(sum(error**2)) / n``, computed with
+    built-in groupby reductions instead of a per-group Python callable.
+    Like the former ``np.sum`` over each group's Series (which dispatches to
+    ``Series.sum``), NaN values and errors are skipped, while ``n`` counts
+    every row of the group.
+
+    Args:
+        df: Input rows (values may be object dtype after ``explode``)
+        keys: Column name(s) to group by
+        value_column: Column averaged per group
+        error_column: Column of per-row uncertainties
+
+    Returns:
+        pandas.DataFrame: Indexed by ``keys`` with ``value_column`` (mean)
+        and ``error_column`` (combined error) columns
+    """
+    values = pd.to_numeric(df[value_column], errors="coerce").astype(float)
+    errors = pd.to_numeric(df[error_column], errors="coerce").astype(float)
+    work = pd.DataFrame(
+        {"_value": values.to_numpy(), "_squared": (errors**2).to_numpy()},
+        index=df.index,
+    )
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    for key in keys:
+        # .values keeps a Categorical key, so the groupby compares its codes
+        work[key] = df[key].values
+
+    # observed=True: unused categories of Categorical keys must not add empty groups
+    grouped = work.groupby(keys, sort=True, observed=True)
+    result = pd.DataFrame(
+        {
+            value_column: grouped["_value"].mean(),
+            error_column: np.sqrt(grouped["_squared"].sum()) / grouped["_value"].size(),
+        }
+    )
+    return result
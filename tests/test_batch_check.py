@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+import batch_check  # noqa: E402
+
+
+MACRO = """
+import argparse
+parser = argparse.ArgumentParser()
+parser.add_argument("--datafile", required=True)
+parser.add_argument("--configs", nargs="+", default=None)
+parser.add_argument("-x", required=True)
+parser.add_argument("--iterable", default=None)
+args = parser.parse_args()
+raise RuntimeError("the macro body must not run during --check")
+"""
+
+
+@pytest.fixture
+def batch_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch_check, "CATALOG_PATH", str(tmp_path / "catalog.json"))
+    (tmp_path / "input" / "data").mkdir(parents=True)
+    (tmp_path / "macro.py").write_text(MACRO)
+    pd.DataFrame({"Config": ["hd_1x2x6"], "Energy": [1.0], "Angle": [0.1]}).to_pickle(
+        tmp_path / "input" / "data" / "reco.pkl"
+    )
+    return tmp_path
+
+
+def test_check_line_reports_argparse_and_datafile_problems(batch_dir):
+    assert batch_check.check_line("macro.py --datafile reco -x Energy") == []
+    assert "required" in batch_check.check_line("macro.py --datafile reco")[0]
+    assert batch_check.check_line("macro.py --datafile other -x Energy")[0].startswith("Datafile 'other' not found")
+    assert batch_check.check_line("missing.py --datafile reco -x Energy") == ["Macro missing.py not found"]
+
+
+def test_check_line_validates_columns_and_configs_against_catalog(batch_dir):
+    line = "macro.py --datafile reco -x Enrgy --iterable Angle --configs hd_1x2x6 vd"
+
+    assert batch_check.check_line(line) == []
+    batch_check.build_data_catalog()
+
+    assert batch_check.check_line(line) == [
+        "Column 'Enrgy' (--x) not in reco",
+        "Config 'vd' (--configs) not in reco",
+    ]
+
+
+def test_catalog_entry_is_ignored_once_the_datafile_changes(batch_dir):
+    batch_check.build_data_catalog()
+    pd.DataFrame({"Config": ["hd_1x2x6"], "Energy": [1.0]}).to_pickle(batch_dir / "input" / "data" / "reco.pkl")
+
+    assert batch_check.read_schema("input/data/reco.pkl") is None
+
+
+def test_report_check_returns_nonzero_with_problems(batch_dir, capsys):
+    exit_code = batch_check.report_check(["macro.py --datafile reco -x Energy", "macro.py --datafile nope -x Energy"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 1
+    assert "line 2" in out and "1 of 2 lines have problems" in out
+    assert "not checked" in out
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.binning import group_by_bins
+
+
+def test_group_by_bins_matches_half_open_masks():
+    rng = np.random.default_rng(8)
+    x = rng.integers(0, 20, size=2_000)
+    y = rng.normal(size=x.size)
+    edges = np.array([-0.5, 2.5, 3.5, 9.5, 18.5])
+
+    groups = group_by_bins(x, y, edges)
+
+    for i, group in enumerate(groups):
+        lo, hi = edges[i], edges[i + 1]
+        np.testing.assert_allclose(np.sort(group), np.sort(y[(x >= lo) & (x < hi)]))
+
+
+def test_group_by_bins_cumulative_returns_suffix_views():
+    x = np.array([3.0, np.nan, 1.0, 2.0, 5.0])
+    y = np.array([30.0, 99.0, 10.0, 20.0, 50.0])
+
+    groups = group_by_bins(x, y, [0.0, 2.0, 4.0, 6.0], cumulative=True)
+
+    assert [sorted(group.tolist()) for group in groups] == [[10.0, 20.0, 30.0, 50.0], [20.0, 30.0, 50.0], [50.0]]
+    assert all(group.base is groups[0].base for group in groups)
+
+
+def test_group_by_bins_excludes_upper_edge_and_keeps_empty_bins():
+    x = np.array([0.0, 0.5, 1.0])
+    y = np.array([1.0, 2.0, 3.0])
+
+    groups = group_by_bins(x, y, [0.0, 0.5, 1.0, 2.0])
+
+    assert [group.tolist() for group in groups] == [[1.0], [2.0], [3.0]]
+    assert group_by_bins(x, y, [5.0, 6.0])[0].size == 0
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib import cbook
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.boxstats import binned_box_statistics, box_statistics
+from lib.plot import plot_data
+
+
+def test_box_statistics_match_matplotlib():
+    rng = np.random.default_rng(9)
+    groups = [rng.standard_cauchy(size=n) for n in (1, 2, 7, 500)]
+
+    ours = box_statistics(groups, max_fliers=None)
+    reference = cbook.boxplot_stats(groups)
+
+    for mine, theirs in zip(ours, reference):
+        for key in ("mean", "med", "q1", "q3", "iqr", "cilo", "cihi", "whislo", "whishi"):
+            assert mine[key] == pytest.approx(theirs[key]), key
+        np.testing.assert_allclose(np.sort(mine["fliers"]), np.sort(theirs["fliers"]))
+
+
+def test_box_statistics_cap_fliers_and_handle_empty_groups():
+    values = np.concatenate([np.linspace(-1.0, 1.0, 1_000), np.linspace(20.0, 10.0, 300), [-50.0]])
+
+    stats, empty = box_statistics([values, np.array([np.nan])], max_fliers=10)
+
+    assert stats["fliers"].size == 10
+    assert stats["fliers"][0] == -50.0 and stats["fliers"][-1] == 20.0
+    assert empty["n"] == 0 and np.isnan(empty["med"]) and empty["fliers"].size == 0
+
+
+def test_binned_box_statistics_reuses_cached_result(tmp_path, monkeypatch):
+    rng = np.random.default_rng(10)
+    x = rng.uniform(0.0, 10.0, size=1_000)
+    y = rng.normal(size=x.size)
+    edges = np.linspace(0.0, 10.0, 6)
+
+    first = binned_box_statistics(x, y, edges, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 1
+
+    import lib.boxstats as boxstats
+
+    monkeypatch.setattr(boxstats, "box_statistics", lambda *args, **kwargs: pytest.fail("cache miss"))
+    second = binned_box_statistics(x, y, edges, cache_dir=tmp_path)
+    assert [box["med"] for box in second] == [box["med"] for box in first]
+
+
+def test_plot_data_draws_precomputed_box_stats():
+    stats = box_statistics([np.arange(10.0), np.arange(5.0, 30.0)])
+    fig, ax = plt.subplots()
+
+    artists = plot_data(SimpleNamespace(plot_style=None), ax, [1, 2], box_stats=stats, plot_type="boxplot", positions=[1, 2])
+
+    assert len(artists["boxes"]) == 2
+    np.testing.assert_allclose(artists["medians"][1].get_ydata(), [17.0, 17.0])
+    plt.close(fig)
+
+
+def test_box_statistics_skip_fliers_when_capped_at_zero():
+    values = np.concatenate([np.linspace(0.0, 1.0, 101), [-50.0, 20.0]])
+
+    stats, = box_statistics([values], max_fliers=0)
+
+    assert stats["fliers"].size == 0
+    assert stats["whislo"] == 0.0 and stats["whishi"] == 1.0
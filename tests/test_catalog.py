@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+import lib.catalog as catalog  # noqa: E402
+from lib.catalog import build_catalog, catalog_columns, catalog_values, describe_datafile  # noqa: E402
+
+
+def _write_data(data_dir, name="reco", rows=6):
+    df = pd.DataFrame(
+        {
+            "Config": ["hd_1x2x6", "vd_1x8x14"] * (rows // 2),
+            "Name": ["marley"] * rows,
+            "Energy": np.linspace(0.0, 1.0, rows),
+            "Threshold": [1, 2, 3] * (rows // 3),
+            "Hits": [np.arange(idx + 1) for idx in range(rows)],
+        }
+    )
+    df.to_pickle(data_dir / f"{name}.pkl")
+    return df
+
+
+def test_build_catalog_summarizes_schema_and_distinct_values(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_data(data_dir)
+    catalog_path = tmp_path / "catalog.json"
+
+    build_catalog(data_dir, catalog_path)
+    entry = describe_datafile(data_dir / "reco.pkl", catalog_path)
+
+    assert entry["rows"] == 6
+    assert entry["columns"]["Config"]["distinct"] == ["hd_1x2x6", "vd_1x8x14"]
+    assert entry["columns"]["Threshold"] == {"dtype": "int64", "n_distinct": 3, "distinct": [1, 2, 3]}
+    assert entry["columns"]["Hits"]["array_lengths"] == [1, 6]
+    assert entry["columns"]["Energy"]["n_distinct"] == 6
+    assert describe_datafile("reco", catalog_path, data_dir=data_dir) == entry
+
+
+def test_high_cardinality_columns_keep_only_the_count(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_data(data_dir, rows=12)
+    monkeypatch.setattr(catalog, "MAX_DISTINCT_VALUES", 4)
+
+    entry = build_catalog(data_dir, tmp_path / "catalog.json")["files"]["reco.pkl"]
+
+    assert entry["columns"]["Energy"]["distinct"] is None
+    assert entry["columns"]["Energy"]["n_distinct"] == 12
+    assert entry["columns"]["Name"]["distinct"] == ["marley"]
+
+
+def test_build_catalog_refreshes_only_changed_files(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_data(data_dir, "first")
+    _write_data(data_dir, "second")
+    catalog_path = tmp_path / "catalog.json"
+    build_catalog(data_dir, catalog_path)
+
+    loaded = []
+    original = catalog._load_datafile
+    monkeypatch.setattr(catalog, "_load_datafile", lambda path: loaded.append(Path(path).name) or original(path))
+    _write_data(data_dir, "second", rows=12)
+    (data_dir / "first.pkl").unlink()
+    _write_data(data_dir, "third")
+
+    files = build_catalog(data_dir, catalog_path)["files"]
+
+    assert sorted(loaded) == ["second.pkl", "third.pkl"]
+    assert sorted(files) == ["second.pkl", "third.pkl"]
+    assert files["second.pkl"]["rows"] == 12
+
+
+def test_forced_refresh_of_given_paths_keeps_other_entries(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_data(data_dir, "first")
+    _write_data(data_dir, "second")
+    catalog_path = tmp_path / "catalog.json"
+    build_catalog(data_dir, catalog_path)
+
+    loaded = []
+    original = catalog._load_datafile
+    monkeypatch.setattr(catalog, "_load_datafile", lambda path: loaded.append(Path(path).name) or original(path))
+
+    files = build_catalog(data_dir, catalog_path, force=True, paths=[data_dir / "first.pkl"])["files"]
+
+    assert loaded == ["first.pkl"]
+    assert sorted(files) == ["first.pkl", "second.pkl"]
+
+
+def test_stale_entries_are_not_returned(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_data(data_dir)
+    catalog_path = tmp_path / "catalog.json"
+    build_catalog(data_dir, catalog_path)
+
+    _write_data(data_dir, rows=12)
+
+    assert describe_datafile(data_dir / "reco.pkl", catalog_path) is None
+    assert catalog_columns(data_dir / "reco.pkl", catalog_path) is None
+    assert catalog_values(data_dir / "missing.pkl", "Config", catalog_path) is None
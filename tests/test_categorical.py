@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+from lib.categorical import map_categories, normalize_categorical_columns, ordered_categories  # noqa: E402
+from lib.tables import aggregate_mean_with_error  # noqa: E402
+
+
+def _key_df(rows=3000):
+    configs = np.array(["vd_1x8x14_3view_30deg_nominal", "hd_1x2x6", "hd_1x2x6_lateralAPA"])
+    return pd.DataFrame(
+        {
+            "Config": configs[np.arange(rows) % 3],
+            "Name": ["marley_official"] * rows,
+            "Variable": np.where(np.arange(rows) % 2, "Energy", "Angle"),
+            "Hits": [[1, 2]] * rows,
+            "Value": np.arange(rows, dtype=float),
+        }
+    )
+
+
+def test_key_columns_become_categorical_with_configured_order():
+    df = _key_df()
+    object_bytes = df["Config"].memory_usage(deep=True)
+
+    normalize_categorical_columns(df, orders={"Config": ["hd_1x2x6", "hd_1x2x6_lateralAPA", "unused"]})
+
+    assert list(df["Config"].cat.categories) == ["hd_1x2x6", "hd_1x2x6_lateralAPA", "vd_1x8x14_3view_30deg_nominal"]
+    assert list(df["Variable"].cat.categories) == ["Angle", "Energy"]
+    assert df["Config"].memory_usage(deep=True) < object_bytes / 5
+    assert df["Hits"].dtype == object
+    assert df["Value"].dtype == float
+    assert (df["Config"] == "hd_1x2x6").sum() == 1000
+
+
+def test_columns_with_unhashable_cells_and_missing_values_are_handled():
+    df = pd.DataFrame({"Config": [["a"], ["b"]], "Name": ["x", None]})
+
+    normalize_categorical_columns(df, orders={})
+
+    assert df["Config"].dtype == object
+    assert list(df["Name"].cat.categories) == ["x"]
+    assert df["Name"].isna().tolist() == [False, True]
+    assert ordered_categories(np.array(["b", "a", "c"], dtype=object), ["c"]) == ["c", "a", "b"]
+
+
+def test_grouping_after_filtering_skips_unused_categories():
+    df = normalize_categorical_columns(_key_df(12).assign(ValueError=1.0), orders={})
+    subset = df[df["Config"] == "hd_1x2x6"]
+
+    table = aggregate_mean_with_error(subset, ["Config", "Variable"], "Value", "ValueError")
+
+    assert table.index.tolist() == [("hd_1x2x6", "Angle"), ("hd_1x2x6", "Energy")]
+    assert table["Value"].tolist() == [7.0, 4.0]
+
+
+def test_mapped_labels_keep_the_raw_category_order():
+    df = normalize_categorical_columns(
+        _key_df(6), orders={"Config": ["hd_1x2x6", "hd_1x2x6_lateralAPA", "vd_1x8x14_3view_30deg_nominal"]}
+    )
+    mapping = {"hd_1x2x6": "Signal", "hd_1x2x6_lateralAPA": "Lateral", "vd_1x8x14_3view_30deg_nominal": "Signal"}
+
+    df["Config"] = map_categories(df["Config"], mapping)
+    table = aggregate_mean_with_error(df.assign(ValueError=1.0), "Config", "Value", "ValueError")
+
+    assert list(df["Config"].cat.categories) == ["Signal", "Lateral"]
+    assert df["Config"].tolist() == ["Signal", "Signal", "Lateral"] * 2
+    assert isinstance(table.index, pd.CategoricalIndex)
+    assert table.index.tolist() == ["Signal", "Lateral"]
+    assert table["Value"].tolist() == [2.0, 3.5]
@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.decimate import decimate_series, decimation_indices, lttb_decimate, minmax_decimate
+from lib.plot import plot_data
+
+
+def _render(x, y, decimate, plot_type="plot", x_edges=None):
+    # Pin the style and line width so the comparison does not depend on the
+    # local matplotlibrc or plot_params.json.
+    with plt.style.context("default"):
+        fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+        args = SimpleNamespace(decimate=decimate, plot_style="-", rangex=None, logx=False, align="mid")
+        plot_data(args, ax, x, x_edges=x_edges, y=y, color="C0", plot_type=plot_type, linewidth=1.5)
+        ax.set_xlim(x[0] if x_edges is None else x_edges[0], x[-1] if x_edges is None else x_edges[-1])
+        ax.set_ylim(-5, 5)
+        ax.set_axis_off()
+        fig.canvas.draw()
+        image = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(int)
+        artists = list(ax.lines) + list(ax.patches)
+        plt.close(fig)
+    return image, artists
+
+
+def _ink(image):
+    return np.any(np.abs(image - 255) > 64, axis=-1)
+
+
+def _dilate(mask):
+    padded = np.pad(mask, 1)
+    rows, cols = mask.shape
+    return np.any([padded[dr : dr + rows, dc : dc + cols] for dr in range(3) for dc in range(3)], axis=0)
+
+
+def _misplaced_ink(full, reduced):
+    """Fraction of pixels inked in one rendering but more than one pixel away
+    from any ink of the other. Anti-aliasing differences along the line edges
+    do not count, so the measure does not depend on the rendering backend."""
+    full_ink, reduced_ink = _ink(full), _ink(reduced)
+    return np.mean((full_ink & ~_dilate(reduced_ink)) | (reduced_ink & ~_dilate(full_ink)))
+
+
+def test_minmax_decimate_keeps_extrema_of_every_column():
+    rng = np.random.default_rng(1)
+    x = np.linspace(0.0, 1.0, 10_000)
+    y = rng.normal(size=x.size)
+
+    keep = minmax_decimate(x, y, 100)
+
+    assert keep.size <= 400
+    assert keep[0] == 0 and keep[-1] == x.size - 1
+    columns = np.minimum((x * 100).astype(int), 99)
+    for column in (0, 37, 99):
+        in_column = np.flatnonzero(columns == column)
+        assert in_column[np.argmax(y[in_column])] in keep
+        assert in_column[np.argmin(y[in_column])] in keep
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(1000.0)
+    y = np.zeros_like(x)
+    y[517] = 10.0
+
+    keep = lttb_decimate(x, y, 50)
+
+    assert keep.size == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert 517 in keep
+
+
+def test_short_or_gapped_series_are_left_untouched():
+    x = np.linspace(0.0, 1.0, 100)
+    assert decimation_indices(x, x, 100) is None
+
+    x = np.linspace(0.0, 1.0, 10_000)
+    y = np.sin(x)
+    y[10] = np.nan
+    decimated_x, decimated_y = decimate_series(x, y, 50)
+    assert decimated_x is x and decimated_y is y
+
+
+def test_plot_data_decimation_is_visually_lossless():
+    rng = np.random.default_rng(7)
+    x = np.linspace(0.0, 100.0, 400_000)
+    y = np.sin(x) + rng.normal(scale=0.5, size=x.size)
+
+    full, full_artists = _render(x, y, None)
+    reduced, reduced_artists = _render(x, y, "minmax")
+
+    assert full_artists[0].get_xdata().size == x.size
+    assert reduced_artists[0].get_xdata().size < x.size // 50
+    assert _misplaced_ink(full, reduced) < 0.0005
+
+
+def test_plot_data_decimates_step_outline():
+    x_edges = np.linspace(0.0, 10.0, 40_001)
+    centers = 0.5 * (x_edges[:-1] + x_edges[1:])
+    y = np.cos(centers) * 4
+
+    full, full_artists = _render(centers, y, None, plot_type="step", x_edges=x_edges)
+    reduced, reduced_artists = _render(centers, y, "minmax", plot_type="step", x_edges=x_edges)
+
+    assert reduced_artists[0].get_xdata().size < 2 * x_edges.size // 50
+    assert _misplaced_ink(full, reduced) < 0.0005
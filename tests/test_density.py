@@ -0,0 +1,61 @@
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.density import aggregate_points
+from lib.plot import plot_density_image
+
+
+def test_aggregate_points_matches_histogram2d_counts():
+    rng = np.random.default_rng(5)
+    x, y = rng.uniform(0.0, 1.0, size=(2, 5_000))
+
+    grid, x_edges, y_edges = aggregate_points(x, y, shape=(8, 16), x_range=(0, 1), y_range=(0, 1))
+    expected, _, _ = np.histogram2d(y, x, bins=[y_edges, x_edges])
+
+    np.testing.assert_allclose(np.nan_to_num(grid), expected)
+    assert np.isnan(grid).sum() == (expected == 0).sum()
+
+
+def test_aggregate_points_reduces_mean_and_max_and_drops_out_of_range():
+    x = np.array([0.1, 0.2, 0.9, 5.0, np.nan])
+    y = np.array([0.1, 0.2, 0.9, 0.5, 0.5])
+    values = np.array([1.0, 3.0, 7.0, 100.0, 100.0])
+
+    mean, _, _ = aggregate_points(x, y, values, "mean", shape=(2, 2), x_range=(0, 1), y_range=(0, 1))
+    peak, _, _ = aggregate_points(x, y, values, "max", shape=(2, 2), x_range=(0, 1), y_range=(0, 1))
+
+    np.testing.assert_allclose(mean, [[2.0, np.nan], [np.nan, 7.0]])
+    np.testing.assert_allclose(peak, [[3.0, np.nan], [np.nan, 7.0]])
+
+    with pytest.raises(ValueError):
+        aggregate_points(x, y, reduction="mean")
+
+
+def test_plot_density_image_renders_a_million_points_quickly():
+    rng = np.random.default_rng(6)
+    x, y = rng.normal(size=(2, 1_000_000))
+    energy = rng.exponential(size=x.size)
+
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+    start = time.perf_counter()
+    image = plot_density_image(ax, x, y, values=energy, reduction="mean")
+    fig.canvas.draw()
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+
+    n_rows, n_cols = image.get_array().shape
+    assert n_cols == pytest.approx(ax.get_position().width * 400, abs=1)
+    assert n_rows == pytest.approx(ax.get_position().height * 300, abs=1)
+    assert elapsed < 2.0
@@ -0,0 +1,76 @@
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.event_index import ensure_event_index, event_index_path, list_events, load_events, write_event_index
+
+
+def _hits():
+    return pd.DataFrame(
+        {
+            "Event": [3, 1, 3, 2, 1, 3],
+            "X": [0.3, 0.1, 0.31, 0.2, 0.11, 0.32],
+            "PDG": ["e-", "mu-", "e-", None, "gamma", "mu-"],
+        }
+    )
+
+
+def test_load_events_reads_only_requested_events(tmp_path):
+    index_dir = write_event_index(_hits(), tmp_path / "display.events")
+
+    np.testing.assert_array_equal(list_events(index_dir), [1, 2, 3])
+
+    hits = load_events(index_dir, ["3", "2", "99"])
+    assert hits["Event"].tolist() == [2, 3, 3, 3]
+    np.testing.assert_allclose(hits["X"], [0.2, 0.3, 0.31, 0.32])
+    assert pd.isna(hits["PDG"].iloc[0])
+    assert hits["PDG"].iloc[1:].tolist() == ["e-", "e-", "mu-"]
+
+    assert load_events(index_dir, [1], columns=["X"]).columns.tolist() == ["X"]
+    assert load_events(index_dir, "not-an-event").empty
+
+
+def test_ensure_event_index_builds_once_and_rebuilds_stale_index(tmp_path):
+    datafile = tmp_path / "display.pkl"
+    with datafile.open("wb") as fh:
+        pickle.dump(_hits(), fh)
+
+    index_dir = ensure_event_index(datafile)
+    assert index_dir == event_index_path(datafile)
+    built = (index_dir / "meta.json").stat().st_mtime_ns
+    assert ensure_event_index(datafile) == index_dir
+    assert (index_dir / "meta.json").stat().st_mtime_ns == built
+
+    updated = _hits().assign(Event=[7, 7, 7, 8, 8, 8])
+    with datafile.open("wb") as fh:
+        pickle.dump(updated, fh)
+    future = (index_dir / "meta.json").stat().st_mtime + 10
+    os.utime(datafile, (future, future))
+
+    ensure_event_index(datafile)
+    np.testing.assert_array_equal(list_events(index_dir), [7, 8])
+
+
+def test_write_event_index_requires_event_column(tmp_path):
+    with pytest.raises(ValueError):
+        write_event_index(_hits().drop(columns="Event"), tmp_path / "display.events")
+
+
+def test_object_event_ids_with_multi_digit_numbers_are_all_found(tmp_path):
+    hits = pd.DataFrame({"Event": np.array([10, 2, 10, 3], dtype=object), "X": [1.0, 2.0, 1.1, 3.0]})
+    index_dir = write_event_index(hits, tmp_path / "display.events")
+
+    loaded = load_events(index_dir, ["2", "3", "10"])
+
+    assert sorted(loaded["Event"].tolist()) == [2, 3, 10, 10]
+    np.testing.assert_allclose(sorted(loaded["X"]), [1.0, 1.1, 2.0, 3.0])
+    assert load_events(index_dir, 10)["X"].tolist() == [1.0, 1.1]
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.fitting import fit_nonlinear_series, fit_series_batch
+
+
+def _gaussian(x, amplitude, mean, sigma):
+    return amplitude * np.exp(-0.5 * ((x - mean) / sigma) ** 2)
+
+
+def test_fit_series_batch_solves_linear_series_of_different_lengths(tmp_path):
+    xs = [np.linspace(0.0, 10.0, 20), np.linspace(0.0, 5.0, 7), np.array([1.0])]
+    ys = [2.0 * xs[0] + 1.0, -1.0 * xs[1] + 4.0, np.array([3.0])]
+    errors = [np.full(20, 0.5), np.full(7, 0.5), np.array([0.5])]
+
+    spec, results = fit_series_batch("linear", xs, ys, errors=errors, cache_dir=tmp_path)
+
+    assert spec["kind"] == "linear"
+    assert np.allclose(results[0]["Params"], [2.0, 1.0])
+    assert np.allclose(results[1]["Params"], [-1.0, 4.0])
+    assert results[1]["NDoF"] == 5
+    assert np.isnan(results[2]["Params"]).all()
+
+    design = np.stack([xs[0], np.ones_like(xs[0])], axis=-1) / 0.5
+    expected_cov = np.linalg.inv(design.T @ design)
+    assert np.allclose(results[0]["ParamsCovariance"], expected_cov)
+
+
+def test_fit_nonlinear_series_warm_starts_along_the_scan():
+    x = np.linspace(-5.0, 5.0, 81)
+    means = [0.0, 0.4, 0.8, 1.2]
+    ys = [_gaussian(x, 10.0, mean, 1.0) for mean in means]
+
+    results = fit_nonlinear_series(
+        _gaussian, [x] * len(ys), ys, fit_range=(-4.0, 4.0), p0=[8.0, 0.0, 1.5]
+    )
+
+    assert np.allclose([r["Params"][1] for r in results], means, atol=1e-6)
+    assert all(r["ParamsCovariance"].shape == (3, 3) for r in results)
+
+
+def test_fit_series_batch_reuses_cached_fits(monkeypatch, tmp_path):
+    import lib.fitting as fitting_module
+
+    x = np.linspace(0.0, 10.0, 30)
+    xs, ys = [x, x], [3.0 * x - 2.0, 0.5 * x + 1.0]
+
+    _spec, first = fit_series_batch("linear", xs, ys, fit_range=(1.0, 9.0), cache_dir=tmp_path)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("cached series should not be refitted")
+
+    monkeypatch.setattr(fitting_module, "fit_linear_series", _fail)
+    _spec, second = fit_series_batch("linear", xs, ys, fit_range=(1.0, 9.0), cache_dir=tmp_path)
+
+    assert np.allclose(second[0]["Params"], [3.0, -2.0])
+    assert np.allclose(second[1]["CurveY"], first[1]["CurveY"])
+    assert np.allclose(second[1]["CurveX"][[0, -1]], [1.0, 9.0])
+
+
+def test_evict_fit_cache_drops_least_recently_used_entries(tmp_path):
+    import os
+
+    from lib.fitcache import evict_fit_cache, load_cached_fit, store_cached_fit
+
+    for idx, key in enumerate(["aa01", "bb02", "cc03"]):
+        store_cached_fit(key, {"Params": np.array([idx])}, tmp_path, evict=False)
+        os.utime(tmp_path / key[:2] / f"{key}.pkl", (idx, idx))
+
+    assert evict_fit_cache(tmp_path, max_entries=2) == 1
+    assert load_cached_fit("aa01", tmp_path) is None
+    assert load_cached_fit("cc03", tmp_path)["Params"][0] == 2
+
+
+def test_fit_cache_key_depends_on_bounds():
+    from lib.fitcache import fit_cache_key
+
+    x = np.linspace(0.0, 1.0, 5)
+    unbounded = fit_cache_key(x, x, None, "model")
+
+    assert fit_cache_key(x, x, None, "model", bounds=None) == unbounded
+    assert fit_cache_key(x, x, None, "model", bounds=(0.0, 1.0)) != unbounded
+    assert fit_cache_key(x, x, None, "model", bounds=(0.0, 1.0)) != fit_cache_key(
+        x, x, None, "model", bounds=(0.0, [1.0, 2.0])
+    )
+
+
+def test_cached_fit_products_does_not_evict_per_row(monkeypatch, tmp_path):
+    import lib.fitcache as fitcache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached_fit_products should leave eviction to the caller")
+
+    monkeypatch.setattr(fitcache, "evict_fit_cache", fail)
+    x = np.linspace(0.0, 1.0, 5)
+    products = fitcache.cached_fit_products(lambda x, m: m * x, x, 2 * x, [2.0], cache_dir=tmp_path)
+
+    assert np.allclose(products["Fit"], 2 * x)
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 1
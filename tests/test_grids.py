@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.grids import (
+    as_float_array,
+    convert_grid_datafile,
+    is_grid_ref,
+    open_shared_grid,
+    resolve_grid,
+    share_grid,
+    store_grid_columns,
+)
+
+
+def test_store_grid_columns_round_trips_through_memory_mapped_views(tmp_path):
+    z_a = np.array([[1.0, 2.0, 0.5], [0.2, 3.0, 0.1]])
+    z_b = np.array([[0.5, 1.0, 0.2], [0.1, 0.4, 0.3]])
+    z_c = np.arange(4.0).reshape(2, 2)
+    df = pd.DataFrame(
+        [
+            {"Config": "cfg_a", "ZGrid": z_a},
+            {"Config": "cfg_b", "ZGrid": z_b},
+            {"Config": "cfg_c", "ZGrid": z_c},
+        ]
+    )
+
+    stored = store_grid_columns(df, ["ZGrid"], "contours", base_dir=tmp_path)
+
+    assert all(is_grid_ref(value) for value in stored["ZGrid"])
+    assert len(list((tmp_path / "contours.grids").glob("*.npy"))) == 2
+
+    view = resolve_grid(stored["ZGrid"].iloc[1], base_dir=tmp_path)
+    assert isinstance(view.base, np.memmap)
+    assert not view.flags.writeable
+    assert np.array_equal(view, z_b)
+
+    resolved = as_float_array(stored["ZGrid"].iloc[2], base_dir=tmp_path)
+    assert not resolved.flags.owndata
+    assert np.array_equal(resolved, z_c)
+
+
+def test_as_float_array_does_not_copy_float_arrays():
+    z = np.ones((3, 4))
+
+    assert as_float_array(z) is z
+
+
+def test_share_grid_exposes_arrays_and_passes_references_through():
+    z = np.array([[1.0, 2.0], [3.0, 4.0]])
+    segment, descriptor = share_grid(z)
+    try:
+        worker_segment, shared = open_shared_grid(descriptor)
+        assert np.array_equal(shared, z)
+        del shared
+        worker_segment.close()
+    finally:
+        segment.close()
+        segment.unlink()
+
+    assert share_grid("npy:contours.grids/ZGrid_0.npy#1") == (
+        None,
+        "npy:contours.grids/ZGrid_0.npy#1",
+    )
+
+
+def test_store_grid_columns_removes_stale_blocks_on_rewrite(tmp_path):
+    df = pd.DataFrame(
+        {"ZGrid": [np.ones((2, 2)), np.ones((3, 3)), np.ones((4, 4))], "XGrid": [np.ones(2)] * 3}
+    )
+    store_grid_columns(df, ["ZGrid", "XGrid"], "contours", base_dir=tmp_path)
+    assert len(list((tmp_path / "contours.grids").glob("ZGrid_*.npy"))) == 3
+
+    stored = store_grid_columns(df.iloc[:1], ["ZGrid"], "contours", base_dir=tmp_path)
+
+    assert sorted(path.name for path in (tmp_path / "contours.grids").glob("*.npy")) == [
+        "XGrid_0.npy",
+        "ZGrid_0.npy",
+    ]
+    assert np.array_equal(resolve_grid(stored["ZGrid"].iloc[0], base_dir=tmp_path), np.ones((2, 2)))
+
+
+def test_convert_grid_datafile_writes_reference_frame(tmp_path):
+    z = np.arange(6.0).reshape(2, 3)
+    df = pd.DataFrame([{"Config": "cfg_a", "XGrid": np.arange(3.0), "ZGrid": z, "Value": 1.5}])
+    df.to_pickle(tmp_path / "contours.pkl")
+
+    output_path, columns = convert_grid_datafile(tmp_path / "contours.pkl")
+
+    assert output_path == tmp_path / "contours_grids.pkl"
+    assert columns == ["XGrid", "ZGrid"]
+    converted = pd.read_pickle(output_path)
+    assert converted["Value"].iloc[0] == 1.5
+    assert is_grid_ref(converted["ZGrid"].iloc[0])
+    assert np.array_equal(resolve_grid(converted["ZGrid"].iloc[0], base_dir=tmp_path), z)
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.operations import compute_line_operation, line_operation_series, stack_lines
+
+
+def test_stack_lines_resamples_misaligned_lines_onto_reference_grid():
+    x_ref = np.array([0.0, 1.0, 2.0, 3.0])
+    x_other = np.array([2.5, 0.5, 1.5])
+    y_other = np.array([5.0, 1.0, 3.0])
+
+    grid, values, errors = stack_lines(
+        [x_ref, x_other],
+        [np.ones(4), y_other],
+        errors=[np.full(4, 0.1), None],
+        x_grid=x_ref,
+    )
+
+    assert grid is x_ref
+    np.testing.assert_allclose(values[0], np.ones(4))
+    np.testing.assert_allclose(values[1], [np.nan, 2.0, 4.0, np.nan])
+    np.testing.assert_allclose(errors[0], np.full(4, 0.1))
+    assert np.isnan(errors[1]).all()
+
+
+def test_compute_line_operation_broadcasts_against_all_references():
+    values = np.array([[1.0, 2.0], [2.0, 4.0], [4.0, 0.0]])
+
+    result = compute_line_operation(values, "ratio", references="all")
+
+    assert result["values"].shape == (3, 3, 2)
+    np.testing.assert_allclose(result["values"][0, 1], [2.0, 2.0])
+    np.testing.assert_allclose(result["values"][1, 2], [2.0, 0.0])
+    assert np.isnan(result["values"][2, 0, 1])
+
+
+def test_compute_line_operation_propagates_uncertainties():
+    values = np.array([[4.0], [2.0]])
+    errors = np.array([[0.4], [0.1]])
+
+    ratio = compute_line_operation(values, "ratio", references=0, errors=errors)
+    expected = 0.5 * np.sqrt((0.1 / 2.0) ** 2 + (0.4 / 4.0) ** 2)
+    np.testing.assert_allclose(ratio["errors"][0, 1], [expected])
+
+    asymmetry = compute_line_operation(values, "asymmetry", references=0, errors=errors)
+    d_ref, d_other = 4.0 * 2.0 / 36.0, -4.0 * 4.0 / 36.0
+    np.testing.assert_allclose(
+        asymmetry["errors"][0, 1], [np.hypot(d_ref * 0.4, d_other * 0.1)]
+    )
+
+    total = compute_line_operation(values, "sum", errors=errors)
+    np.testing.assert_allclose(total["errors"], [np.hypot(0.4, 0.1)])
+
+
+def test_line_operation_series_drops_self_pairs_and_labels_references():
+    values = np.array([[1.0, 2.0], [2.0, 2.0], [3.0, 1.0]])
+
+    series = line_operation_series(["a", "b", "c"], values, "subtract", references="all")
+
+    assert [entry["label"] for entry in series] == [
+        "b - a",
+        "c - a",
+        "a - b",
+        "c - b",
+        "a - c",
+        "b - c",
+    ]
+    assert [entry["index"] for entry in series] == [1, 2, 0, 2, 0, 1]
+    np.testing.assert_allclose(series[3]["values"], [1.0, -1.0])
+
+
+def test_compute_line_operation_rejects_unknown_operation():
+    with pytest.raises(ValueError):
+        compute_line_operation(np.ones((2, 2)), "product")
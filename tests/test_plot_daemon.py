@@ -0,0 +1,93 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+import plot_daemon  # noqa: E402
+
+
+def test_cached_import_loads_once_and_returns_copies():
+    calls = []
+
+    def import_data(args):
+        calls.append(args.datafile)
+        return pd.DataFrame({"Energy": [1.0, 2.0]})
+
+    cached = plot_daemon.make_cached_import(import_data, max_datasets=1)
+    args = SimpleNamespace(datafile="missing_dataset", configs=["hd"], names=["marley"], variables=None, select=None)
+
+    first = cached(args)
+    first["Energy"] = 0.0
+    second = cached(SimpleNamespace(**{**vars(args), "y": "Other"}))
+    cached(SimpleNamespace(**{**vars(args), "configs": ["vd"]}))
+    cached(args)
+
+    assert second["Energy"].tolist() == [1.0, 2.0]
+    assert calls == ["missing_dataset"] * 3
+    assert len(cached.cache) == 1
+
+
+def test_datafile_stamp_ignores_derived_files_of_the_datafile(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "input" / "data"
+    data_dir.mkdir(parents=True)
+    (data_dir / "reco.pkl").write_bytes(b"data")
+    (data_dir / "reco_grids.pkl").write_bytes(b"converted")
+
+    stamp = plot_daemon._datafile_stamp("reco")
+
+    assert [path for path, _ in stamp] == [str(Path("input") / "data" / "reco.pkl")]
+
+
+def test_run_macro_captures_output_and_saved_figures(tmp_path):
+    script = tmp_path / "macro.py"
+    script.write_text(
+        "import sys\n"
+        "import matplotlib.pyplot as plt\n"
+        "plt.rcParams['savefig.dpi'] = 17\n"
+        "fig, ax = plt.subplots()\n"
+        "fig.savefig(sys.argv[1])\n"
+        "print('rendered', sys.argv[1])\n"
+        "sys.exit(3)\n"
+    )
+    target = tmp_path / "out.png"
+
+    returncode, output, outputs = plot_daemon.run_macro([str(script), str(target)], cwd=str(tmp_path))
+
+    import matplotlib.pyplot as plt
+
+    assert returncode == 3
+    assert f"rendered {target}" in output
+    assert outputs == [str(target)] and target.exists()
+    assert plt.rcParams["savefig.dpi"] != 17
+    assert plt.get_fignums() == []
+
+
+def test_client_runs_macros_through_socket(monkeypatch, tmp_path):
+    monkeypatch.setattr(plot_daemon, "warm_up", lambda max_datasets: None)
+    socket_path = str(tmp_path / "daemon.sock")
+    script = tmp_path / "macro.py"
+    script.write_text("import sys\nprint('args', sys.argv[1:])\n")
+
+    server = threading.Thread(target=plot_daemon.serve, args=(socket_path,), daemon=True)
+    server.start()
+    for _ in range(100):
+        if plot_daemon.daemon_available(socket_path):
+            break
+        time.sleep(0.02)
+
+    returncode, output, outputs = plot_daemon.run_via_daemon([str(script), "--x", "1"], socket_path)
+    plot_daemon.send_request({"command": "shutdown"}, socket_path)
+    server.join(timeout=5)
+
+    assert returncode == 0
+    assert "args ['--x', '1']" in output
+    assert outputs == []
+    assert not server.is_alive()
+    assert not Path(socket_path).exists()
@@ -0,0 +1,92 @@
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.plot import figure_save_context, figure_save_dpi, plot_data, rasterize_dense_artist
+
+
+def _args(threshold, dpi=None):
+    return SimpleNamespace(
+        rasterize_threshold=threshold,
+        rasterize_dpi=dpi,
+        plot_style=None,
+        errory=False,
+        logz=False,
+        bins=10,
+        density=False,
+    )
+
+
+def _pdf_size(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="pdf")
+    return buffer.tell()
+
+
+def test_dense_scatter_points_are_rasterized_in_pdf():
+    rng = np.random.default_rng(3)
+    x, y = rng.normal(size=(2, 20_000))
+    sizes = {}
+    for threshold in (None, 1000):
+        fig, ax = plt.subplots()
+        collection = plot_data(_args(threshold), ax, x, y=y, label="hits", plot_type="scatter_points")
+        legend = ax.legend()
+        assert collection.get_rasterized() is (threshold is not None)
+        assert not any(handle.get_rasterized() for handle in legend.legend_handles)
+        assert not ax.xaxis.get_rasterized()
+        sizes[threshold] = _pdf_size(fig)
+        plt.close(fig)
+
+    assert sizes[1000] < sizes[None] / 5
+
+
+def test_rasterization_applies_to_scatter_hist2d_and_image_paths():
+    rng = np.random.default_rng(4)
+    x, y = rng.normal(size=(2, 500))
+    args = _args(100)
+
+    fig, ax = plt.subplots()
+    plot_data(args, ax, x, y=y, plot_type="scatter")
+    assert all(line.get_rasterized() for line in ax.lines)
+
+    hist2d = plot_data(args, ax, x, y=y, plot_type="hist2d", bins=20)
+    assert hist2d[3].get_rasterized()
+
+    small = plot_data(args, ax, np.arange(5), y=np.arange(4), plot_type="image", z=np.ones((4, 5)))
+    assert not small.get_rasterized()
+    plt.close(fig)
+
+
+def test_rasterize_dense_artist_respects_threshold_and_dpi():
+    fig, ax = plt.subplots()
+    collection = ax.scatter(np.arange(10), np.arange(10))
+
+    assert not rasterize_dense_artist(collection, None)
+    assert not rasterize_dense_artist(collection, 10)
+    assert rasterize_dense_artist(collection, 9)
+    assert collection.get_rasterized()
+
+    save_dpi = plt.rcParams["savefig.dpi"]
+    mesh = plot_data(_args(5, dpi=123), ax, np.arange(4), y=np.arange(4), plot_type="image", z=np.ones((4, 4)))
+    assert mesh.get_rasterized()
+    assert figure_save_dpi(fig) == 123
+    assert plt.rcParams["savefig.dpi"] == save_dpi
+    with figure_save_context(fig):
+        assert plt.rcParams["savefig.dpi"] == 123
+    assert plt.rcParams["savefig.dpi"] == save_dpi
+
+    other, other_ax = plt.subplots()
+    assert figure_save_dpi(other) is None
+    plt.close(other)
+    plt.close(fig)
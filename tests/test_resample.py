@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.resample import bin_edges_from_centers, resample_series, resample_weights
+
+
+def test_linear_mode_matches_interp_with_zero_fill():
+    x = np.array([1.0, 2.0, 4.0, 5.0])
+    y = np.array([2.0, 4.0, 1.0, 3.0])
+    target = np.array([0.0, 1.5, 3.0, 5.0, 6.0])
+
+    values, errors = resample_series([x, x[::-1]], [y, y[::-1]], target, errors=[y, None])
+
+    expected = np.interp(target, x, y, left=0.0, right=0.0)
+    np.testing.assert_allclose(values[0], expected)
+    np.testing.assert_allclose(values[1], expected)
+    np.testing.assert_allclose(errors[0], expected)
+    assert errors[1] is None
+
+
+def test_step_mode_takes_value_of_containing_bin():
+    x = np.array([1.0, 2.0, 3.0])
+    values, _ = resample_series([x], [np.array([10.0, 20.0, 30.0])], np.array([0.4, 0.6, 1.9, 3.4, 3.6]), mode="step")
+
+    np.testing.assert_allclose(values[0], [0.0, 10.0, 20.0, 30.0, 0.0])
+
+
+def test_integral_mode_preserves_bin_contents():
+    fine = np.linspace(0.125, 3.875, 16)
+    coarse = np.array([0.5, 1.5, 2.5, 3.5])
+    contents = np.arange(16.0)
+    errors = np.ones(16)
+
+    values, resampled_errors = resample_series([fine], [contents], coarse, errors=[errors], mode="integral")
+
+    np.testing.assert_allclose(values[0], contents.reshape(4, 4).sum(axis=1))
+    np.testing.assert_allclose(resampled_errors[0], np.full(4, 2.0))
+
+    back, _ = resample_series([coarse], values, fine, mode="integral")
+    assert back.sum() == pytest.approx(contents.sum())
+
+
+def test_weights_and_edges_are_cached_per_grid():
+    x = np.array([0.0, 1.0, 3.0])
+
+    assert resample_weights(x, np.array([0.5]), "linear") is resample_weights(x.copy(), np.array([0.5]), "linear")
+    edges = bin_edges_from_centers(x)
+    np.testing.assert_allclose(edges, [-0.5, 0.5, 2.0, 4.0])
+    assert not edges.flags.writeable
+
+    with pytest.raises(ValueError):
+        resample_weights(x, x, "cubic")
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from run_history import expected_seconds, load_history, longest_first, normalize_command, record_runs  # noqa: E402
+
+
+def test_normalize_command_ignores_whitespace_and_quoting():
+    assert normalize_command("scripts/a.py   --datafile 'x'  -y E") == normalize_command(
+        "scripts/a.py --datafile x -y E"
+    )
+
+
+def test_record_runs_smooths_time_and_keeps_latest_peak(tmp_path):
+    path = str(tmp_path / "cache" / "history.json")
+
+    record_runs([("a.py  -y E", 10.0, 100.0)], path)
+    history = record_runs([("a.py -y E", 20.0, None)], path)
+
+    entry = history[normalize_command("a.py -y E")]
+    assert entry["runs"] == 2
+    assert entry["seconds"] == pytest.approx(15.0)
+    assert entry["last_seconds"] == 20.0
+    assert entry["peak_rss_mb"] == 100.0
+    assert load_history(path) == history
+    assert expected_seconds(history, "a.py -y E") == pytest.approx(15.0)
+
+
+def test_longest_first_runs_unmeasured_lines_before_known_ones():
+    history = {"fast.py": {"seconds": 1.0}, "slow.py": {"seconds": 9.0}}
+
+    assert longest_first(["fast.py", "new.py", "slow.py", "other.py"], history) == [
+        "new.py",
+        "other.py",
+        "slow.py",
+        "fast.py",
+    ]
+
+
+def test_load_history_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text("{not json")
+
+    assert load_history(str(path)) == {}
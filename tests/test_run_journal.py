@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from run_journal import append_journal, input_fingerprint, load_journal, plan_resume, reset_journal  # noqa: E402
+
+
+def test_fingerprint_changes_with_inputs_but_not_whitespace():
+    state = {"input/data/a.pkl": (1, 10)}
+
+    assert input_fingerprint("a.py  -y E", state) == input_fingerprint("a.py -y E", state)
+    assert input_fingerprint("a.py -y E", state) != input_fingerprint("a.py -y E", {"input/data/a.pkl": (2, 10)})
+
+
+def test_load_journal_keeps_latest_record_and_skips_torn_line(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    reset_journal(path)
+    append_journal(path, "a.py", 1, 1.0, [], "f1")
+    append_journal(path, "a.py", 0, 2.0, [], "f2")
+    with open(path, "a") as f:
+        f.write('{"line": "b.py", "sta')
+
+    journal = load_journal(path)
+
+    assert list(journal) == ["a.py"]
+    assert journal["a.py"]["status"] == "ok" and journal["a.py"]["fingerprint"] == "f2"
+
+
+def test_plan_resume_skips_done_lines_and_retries_failures_first(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    output = tmp_path / "figure.png"
+    output.write_bytes(b"png")
+    append_journal(path, "done.py", 0, 1.0, [str(output)], "same")
+    append_journal(path, "changed.py", 0, 1.0, [], "old")
+    append_journal(path, "lost.py", 0, 1.0, [str(tmp_path / "deleted.png")], "same")
+    append_journal(path, "failed.py", 1, 1.0, [], "same")
+    scripts = ["new.py", "done.py", "changed.py", "lost.py", "failed.py"]
+
+    to_run, done = plan_resume(scripts, load_journal(path), {line: "same" for line in scripts})
+
+    assert done == ["done.py"]
+    assert to_run == ["failed.py", "new.py", "changed.py", "lost.py"]
@@ -0,0 +1,82 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from run_memory import (  # noqa: E402
+    DATAFILE_MEMORY_FACTOR,
+    MemoryBudget,
+    estimate_peak_mb,
+    is_memory_kill,
+    parse_memory_budget,
+)
+
+
+def test_estimate_prefers_history_and_scales_with_datafile_size(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input" / "data").mkdir(parents=True)
+    (tmp_path / "input" / "data" / "big.pkl").write_bytes(b"\0" * (2 * 1024 * 1024))
+    history = {"a.py --datafile big": {"peak_rss_mb": 4000.0}}
+
+    assert estimate_peak_mb("a.py  --datafile big", history) == 4000.0
+    assert estimate_peak_mb("b.py --datafile big", history, base_mb=100) == pytest.approx(
+        100 + 2 * DATAFILE_MEMORY_FACTOR
+    )
+    assert estimate_peak_mb("b.py --datafile missing", {}, base_mb=100) == 100
+
+
+def test_parse_memory_budget_and_memory_kill_detection():
+    assert parse_memory_budget(None) is None
+    assert parse_memory_budget("1500") == 1500.0
+    assert is_memory_kill(-9) and is_memory_kill(137)
+    assert is_memory_kill(1, "Traceback ...\nMemoryError")
+    assert not is_memory_kill(1, "KeyError: 'Energy'")
+    assert not is_memory_kill(0, "Warning: caught MemoryError, retrying with smaller chunks")
+
+
+def test_memory_budget_limits_concurrent_usage():
+    budget = MemoryBudget(1000)
+    peak = []
+    lock = threading.Lock()
+
+    def job(mb):
+        reserved = budget.acquire(mb)
+        with lock:
+            peak.append(budget.used_mb)
+        time.sleep(0.01)
+        budget.release(reserved)
+
+    threads = [threading.Thread(target=job, args=(mb,)) for mb in (600, 600, 300, 300, 5000)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert max(peak) <= 1000
+    assert budget.running == 0 and budget.used_mb == 0
+
+
+def test_exclusive_request_waits_for_running_jobs_and_blocks_new_ones():
+    budget = MemoryBudget(1000)
+    first = budget.acquire(100)
+    order = []
+
+    exclusive = threading.Thread(target=lambda: order.append(("exclusive", budget.acquire(100, exclusive=True))))
+    exclusive.start()
+    time.sleep(0.05)
+    small = threading.Thread(target=lambda: order.append(("small", budget.acquire(100))))
+    small.start()
+    time.sleep(0.05)
+    assert order == []
+
+    budget.release(first)
+    exclusive.join(timeout=5)
+    assert order == [("exclusive", 1000)]
+    budget.release(1000)
+    small.join(timeout=5)
+    assert order[-1] == ("small", 100)
@@ -0,0 +1,164 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+
+def _load_runner(monkeypatch, *extra_args):
+    monkeypatch.setattr(sys, "argv", ["run_plot_scripts.py", *extra_args])
+    repo_root = Path(__file__).resolve().parents[1]
+    monkeypatch.syspath_prepend(str(repo_root))
+    module = importlib.import_module("run_plot_scripts")
+    return importlib.reload(module)
+
+
+def test_script_dependencies_resolve_macro_configs_and_datafile(monkeypatch):
+    runner = _load_runner(monkeypatch)
+
+    patterns = runner.script_dependencies(
+        "scripts/script_compare_hist1d.py --datafile Reco_Energy --configs hd_1x2x6 -y Energy"
+    )
+
+    assert patterns[0] == "scripts/script_compare_hist1d.py"
+    assert os.path.join("config", "*.json") in patterns
+    assert os.path.join("src", "lib", "*.py") in patterns
+    assert patterns[-1] == os.path.join("input", "data", "Reco_Energy.*")
+
+
+def test_snapshot_scripts_sees_new_datafile_only_for_its_lines(monkeypatch, tmp_path):
+    runner = _load_runner(monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input" / "data").mkdir(parents=True)
+    dependencies = {
+        "a.py --datafile first": runner.script_dependencies("a.py --datafile first"),
+        "a.py --datafile second": runner.script_dependencies("a.py --datafile second"),
+    }
+
+    before = runner.snapshot_scripts(dependencies)
+    (tmp_path / "input" / "data" / "second.pkl").write_bytes(b"new")
+    after = runner.snapshot_scripts(dependencies)
+
+    assert before["a.py --datafile first"] == after["a.py --datafile first"]
+    assert before["a.py --datafile second"] != after["a.py --datafile second"]
+
+
+def test_run_batch_in_parallel_returns_records_in_file_order(monkeypatch, tmp_path):
+    runner = _load_runner(monkeypatch, "--history", str(tmp_path / "history.json"))
+    monkeypatch.setattr(
+        runner,
+        "run_script",
+        lambda script_name, socket_path=None, stream=True: (int("fail" in script_name), script_name, 12.0),
+    )
+
+    records = runner.run_batch(["first.py", "fail.py", "third.py"], [], jobs=3)
+
+    assert [record[0] for record in records] == ["first.py", "fail.py", "third.py"]
+    assert [record[1] for record in records] == [0, 1, 0]
+    history = runner.load_history(str(tmp_path / "history.json"))
+    assert history["fail.py"]["peak_rss_mb"] == 12.0
+    assert history["first.py"]["runs"] == 1
+
+
+class _InlineExecutor:
+    def __init__(self, max_workers):
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, script_name):
+        from concurrent.futures import Future
+
+        self.submitted.append(script_name)
+        future = Future()
+        future.set_result(fn(script_name))
+        return future
+
+
+def test_run_batch_submits_longest_lines_first(monkeypatch, tmp_path):
+    history_file = str(tmp_path / "history.json")
+    runner = _load_runner(monkeypatch, "--history", history_file)
+    runner.record_runs([("short.py", 1.0, None), ("long.py", 30.0, None)], history_file)
+    started = []
+    monkeypatch.setattr(
+        runner,
+        "run_script",
+        lambda script_name, socket_path=None, stream=True: started.append(script_name) or (0, "", None),
+    )
+    monkeypatch.setattr(runner, "ThreadPoolExecutor", _InlineExecutor)
+
+    records = runner.run_batch(["short.py", "long.py", "new.py"], [], jobs=2)
+
+    assert started == ["new.py", "long.py", "short.py"]
+    assert [record[0] for record in records] == ["short.py", "long.py", "new.py"]
+    assert runner.load_history(history_file)["long.py"]["runs"] == 2
+
+
+def test_watch_batch_reruns_only_lines_with_changed_inputs(monkeypatch, tmp_path):
+    runner = _load_runner(monkeypatch, "--watch")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "input" / "data").mkdir(parents=True)
+    (tmp_path / "input" / "data" / "first.pkl").write_bytes(b"1")
+    (tmp_path / "input" / "data" / "second.pkl").write_bytes(b"2")
+    script_file = tmp_path / "batch_scripts.txt"
+    script_file.write_text("a.py --datafile first\na.py --datafile second\n")
+
+    polls = iter(range(10))
+
+    def fake_sleep(seconds):
+        poll = next(polls)
+        if poll == 0:
+            (tmp_path / "input" / "data" / "second.pkl").write_bytes(b"changed")
+        elif poll == 3:
+            raise KeyboardInterrupt
+
+    reruns = []
+    monkeypatch.setattr(runner.time, "sleep", fake_sleep)
+    monkeypatch.setattr(runner, "run_batch", lambda scripts, outputs, jobs=1: reruns.append(scripts) or [])
+
+    runner.watch_batch(str(script_file), [], interval=0, debounce=0)
+
+    assert reruns == [["a.py --datafile second"]]
+
+
+def test_run_batch_requeues_memory_killed_line_alone(monkeypatch, tmp_path):
+    runner = _load_runner(
+        monkeypatch, "--history", str(tmp_path / "history.json"), "--mem_budget", "1000"
+    )
+    attempts = []
+
+    def fake_run_script(script_name, socket_path=None, stream=True):
+        attempts.append(script_name)
+        if script_name == "big.py" and attempts.count("big.py") == 1:
+            return -9, "", 900.0
+        return 0, "", 150.0
+
+    monkeypatch.setattr(runner, "run_script", fake_run_script)
+
+    records = runner.run_batch(["big.py", "small.py"], [], jobs=2)
+
+    assert attempts.count("big.py") == 2
+    assert [record[1] for record in records] == [0, 0]
+    assert runner.load_history(str(tmp_path / "history.json"))["big.py"]["runs"] == 2
+
+
+def test_run_batch_journals_each_line_and_runs_failures_first(monkeypatch, tmp_path):
+    runner = _load_runner(monkeypatch, "--no_history")
+    journal = str(tmp_path / "journal.jsonl")
+    started = []
+    monkeypatch.setattr(
+        runner,
+        "run_script",
+        lambda script_name, socket_path=None, stream=True: started.append(script_name)
+        or (int(script_name == "b.py"), "", None),
+    )
+
+    records = runner.run_batch(["a.py", "b.py", "c.py"], [], journal=journal, first=["c.py"])
+
+    entries = runner.load_journal(journal)
+    assert started == ["c.py", "a.py", "b.py"]
+    assert [record[0] for record in records] == ["a.py", "b.py", "c.py"]
+    assert {line: entry["status"] for line, entry in entries.items()} == {"a.py": "ok", "b.py": "failed", "c.py": "ok"}
@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from run_reports import (  # noqa: E402
+    extract_output_paths,
+    merge_reports,
+    parse_shard,
+    print_summary,
+    shard_lines,
+    write_report,
+)
+
+
+SCRIPTS = [f"scripts/script_compare_hist1d.py --datafile data_{idx} -y Energy" for idx in range(40)]
+
+
+def test_parse_shard_accepts_one_based_index():
+    assert parse_shard("2/3") == (2, 3)
+    for value in ("0/3", "4/3", "a/b", "1"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+def test_hash_shards_partition_the_batch_in_file_order():
+    shards = [shard_lines(SCRIPTS, index, 3) for index in (1, 2, 3)]
+
+    assert sorted(line for shard in shards for line in shard) == sorted(SCRIPTS)
+    assert all(shard == [line for line in SCRIPTS if line in shard] for shard in shards)
+    assert all(shard for shard in shards)
+    # Whitespace does not change the assignment
+    index = next(idx for idx, shard in enumerate(shards, start=1) if SCRIPTS[0] in shard)
+    spaced = SCRIPTS[0].replace(" ", "  ")
+    assert shard_lines([spaced], index, 3) == [spaced]
+
+
+def test_weighted_shards_balance_recorded_cost():
+    history = {line: {"seconds": 100.0 if idx < 2 else 1.0} for idx, line in enumerate(SCRIPTS)}
+
+    shards = [shard_lines(SCRIPTS, index, 2, history=history) for index in (1, 2)]
+
+    assert sorted(line for shard in shards for line in shard) == sorted(SCRIPTS)
+    assert (SCRIPTS[0] in shards[0]) != (SCRIPTS[1] in shards[0])
+    assert abs(len(shards[0]) - len(shards[1])) <= 1
+
+
+def test_reports_merge_into_failed_summary(tmp_path, capsys):
+    figure = tmp_path / "energy.png"
+    figure.write_bytes(b"png")
+    first = write_report(
+        str(tmp_path / "shard1.json"),
+        "plots",
+        "thesis",
+        (1, 3),
+        [("a.py", 0, f"Saving figure to {figure}", 1.5, 200.0)],
+        started=0.0,
+    )
+    second = write_report(
+        str(tmp_path / "shard2.json"),
+        "plots",
+        "thesis",
+        (2, 3),
+        [("b.py", 1, "Traceback\nKeyError: 'Energy'", 0.5, None)],
+        started=0.0,
+    )
+
+    merged = merge_reports([json.loads((tmp_path / name).read_text()) for name in ("shard1.json", "shard2.json")])
+
+    assert first["lines"][0]["outputs"] == [str(figure)]
+    assert second["lines"][0]["output_tail"].endswith("KeyError: 'Energy'")
+    assert merged["missing_shards"] == [3]
+    assert [line["line"] for line in merged["lines"]] == ["a.py", "b.py"]
+    assert print_summary(merged) == 1
+    out = capsys.readouterr().out
+    assert "Missing reports for shard(s) [3]" in out
+    assert "b.py" in out
+
+
+def test_extract_output_paths_keeps_existing_files_only(tmp_path):
+    table = tmp_path / "table.tex"
+    table.write_text("x")
+
+    assert extract_output_paths(f"Saving table to {table}\nSaving to {tmp_path}/missing.png") == [str(table)]
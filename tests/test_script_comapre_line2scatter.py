@@ -201,4 +201,87 @@ def test_main_without_iterable_column(monkeypatch, plot_artifact_dir):
     module.main()
 
     assert output_file.exists()
-    assert output_file.stat().st_size > 0
\ No newline at end of file
+    assert output_file.stat().st_size > 0
+
+def test_rasterize_dpi_is_used_only_when_a_scatter_is_rasterized(monkeypatch, plot_artifact_dir):
+    from PIL import Image
+
+    df = pd.DataFrame(
+        [
+            {
+                "TimeNS": np.array([0.0, 1.0, 2.0, 3.0]),
+                "UpperY": np.array([0.1, 0.2, 0.3, 0.4]),
+                "OphitPeakNS": np.array([0.75, 2.25]),
+                "OphitAreaPE": np.array([3.0, 1.5]),
+            }
+        ]
+    )
+    dpis = {}
+    for threshold in ("1000", "1"):
+        module = _load_module(monkeypatch)
+        output_file = plot_artifact_dir / f"waveform_rasterize_{threshold}.png"
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "script_comapre_line2scatter.py",
+                "--datafile",
+                "mock.pkl",
+                "--output",
+                str(output_file),
+                "--rasterize_threshold",
+                threshold,
+            ],
+        )
+        monkeypatch.setattr(module, "load_df", lambda _path: df)
+
+        module.main()
+
+        with Image.open(output_file) as image:
+            dpis[threshold] = round(image.info["dpi"][0])
+
+    assert dpis == {"1000": 180, "1": 300}
+
+
+def test_overlay_windows_draws_one_collection_per_kind(monkeypatch):
+    import matplotlib.pyplot as plt
+
+    module = _load_module(monkeypatch)
+    n_windows = 2_000
+    starts = np.linspace(0.0, 1_000.0, n_windows)
+    row = pd.Series(
+        {
+            "OpHitStartNS": starts,
+            "OpHitEndNS": starts + 0.2,
+            "OpHitPeakNS": starts + 0.1,
+        }
+    )
+
+    fig, ax = plt.subplots()
+    module._overlay_windows(ax, row, "OpHitStartNS", "OpHitEndNS", "OpHitPeakNS", "C3")
+
+    spans, peaks = ax.collections
+    assert len(spans.get_paths()) == n_windows
+    assert len(peaks.get_segments()) == n_windows
+    assert len(ax.patches) == 0 and len(ax.lines) == 0
+    assert ax.get_xlim()[0] <= 0.0 and ax.get_xlim()[1] >= 1_000.2
+    plt.close(fig)
+
+
+def test_lower_series_columns_are_resolved_once_per_schema(monkeypatch):
+    module = _load_module(monkeypatch)
+    df = pd.DataFrame(
+        {
+            "OpHitPeakNS": [[1.0], [2.0]],
+            "OpHitAreaPE": [[3.0], [4.0]],
+            "OpHitStartNS": [[0.5], [1.5]],
+            "OpHitEndNS": [[1.5], [2.5]],
+        }
+    )
+    module._resolve_lower_series_columns_for_schema.cache_clear()
+
+    resolved = [module._resolve_lower_series_columns(row, "OpHit") for _, row in df.iterrows()]
+
+    assert resolved[0] == resolved[1] == ("OpHitPeakNS", "OpHitAreaPE", "OpHitStartNS", "OpHitEndNS", "OpHitPeakNS")
+    info = module._resolve_lower_series_columns_for_schema.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
@@ -603,3 +603,51 @@ def test_main_non_monotonic_reversal_with_missing_errory_does_not_crash(
     main()
 
     assert _get_combined_call(calls)
+
+
+def test_main_projection_resamples_values_and_errors(monkeypatch, plot_artifact_dir):
+    module, main = _load_module_and_main(monkeypatch)
+    args = _mk_args(plot_artifact_dir, operation="sum", errory=True)
+    args.project = ["hd_cfg_b"]
+    args.project_offset = 1.0
+    args.project_mode = "linear"
+
+    x = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    y1 = np.ones_like(x)
+    y2 = x.copy()
+    e1 = np.full_like(x, 1.0)
+    e2 = np.full_like(x, 2.0)
+
+    df = pd.DataFrame(
+        [
+            {
+                "Config": "hd_cfg_a",
+                "Name": "name_a",
+                "Variable": "v",
+                "Values": x,
+                "Counts": y1,
+                "CountsError": e1,
+            },
+            {
+                "Config": "hd_cfg_b",
+                "Name": "name_b",
+                "Variable": "v",
+                "Values": x,
+                "Counts": y2,
+                "CountsError": e2,
+            },
+        ]
+    )
+
+    calls = _patch_common(monkeypatch, module, args, df)
+    main()
+
+    projected = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    projected_error = np.array([0.0, 2.0, 2.0, 2.0, 2.0])
+    c = _get_combined_call(calls)
+    assert np.allclose(c["y"], y1 + y2 + projected)
+    assert np.allclose(c["errory"], np.sqrt(e1**2 + e2**2 + projected_error**2))
+
+    projected_line = [call for call in calls if call["label"] and "(Projected)" in call["label"]]
+    assert len(projected_line) == 1
+    assert np.allclose(projected_line[0]["y"], y2 + projected)
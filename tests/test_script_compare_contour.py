@@ -8,7 +8,11 @@ import pandas as pd
 
 
 def _load_module_and_main(monkeypatch):
-    monkeypatch.setattr(sys, "argv", ["script_compare_contour.py", "--datafile", "mock"])
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["script_compare_contour.py", "--datafile", "mock", "-x", "XGrid", "-y", "YGrid", "-z", "ZGrid"],
+    )
 
     repo_root = Path(__file__).resolve().parents[1]
     scripts_dir = repo_root / "scripts"
@@ -119,6 +123,18 @@ class _DummyFig:
     def suptitle(self, *args, **kwargs):
         self.suptitle_calls.append({"args": args, "kwargs": kwargs})
 
+    def get_figwidth(self):
+        return 6.0
+
+    def get_figheight(self):
+        return 4.0
+
+    def subplots_adjust(self, **kwargs):
+        pass
+
+    def savefig(self, path, **kwargs):
+        Path(path).write_bytes(b"test contour artifact")
+
 
 def _mk_args(tmp_path, operation=None, background="all"):
     return SimpleNamespace(
@@ -167,6 +183,9 @@ def _patch_common(
     fig=None,
     stub_render=True,
 ):
+    # Options the test does not set keep the parser defaults.
+    for key, value in vars(module.args).items():
+        vars(args).setdefault(key, value)
     monkeypatch.setattr(module, "args", args, raising=False)
     monkeypatch.setattr(module, "import_data", lambda _args: df)
     monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df)
@@ -344,3 +363,100 @@ def test_main_interpolates_nan_entries_before_contouring(monkeypatch, plot_artif
     assert len(axis.contour_calls) == 2
     assert np.isfinite(axis.contour_calls[0]["z"]).all()
     assert np.isfinite(axis.contour_calls[1]["z"]).all()
+
+
+def test_main_reads_memory_mapped_grid_references(monkeypatch, plot_artifact_dir, tmp_path):
+    module, main = _load_module_and_main(monkeypatch)
+    import lib.grids as grids_module
+
+    args = _mk_args(plot_artifact_dir, operation=None, background="all")
+
+    z_a = np.array([[1.0, 2.0, 0.5], [0.2, 3.0, 0.1]])
+    z_b = np.array([[0.5, 1.0, 0.2], [0.1, 0.4, 0.3]])
+    x, y, df = _example_dataframe(z_a, z_b)
+    stored = grids_module.store_grid_columns(
+        df, ["XGrid", "YGrid", "ZGrid"], "contours", base_dir=tmp_path
+    )
+    monkeypatch.setattr(grids_module, "default_grid_dir", lambda: tmp_path)
+
+    axis, _fig = _patch_common(
+        monkeypatch,
+        module,
+        args,
+        stored,
+        artifact_name="test_script_compare_contour.grid_refs",
+        stub_render=True,
+    )
+    main()
+
+    assert np.allclose(axis.pcolormesh_calls[0]["x"], x)
+    assert np.allclose(axis.pcolormesh_calls[0]["z"], z_a + z_b)
+    assert len(axis.contour_calls) == 2
+    assert np.allclose(axis.contour_calls[1]["z"], z_b)
+
+
+def test_main_prepares_config_grids_in_worker_pool(monkeypatch, plot_artifact_dir):
+    module, main = _load_module_and_main(monkeypatch)
+    args = _mk_args(plot_artifact_dir, operation="squared_sum", background="all")
+    args.workers = 2
+
+    z_a = np.array([[1.0, np.nan, 0.5], [0.2, 3.0, 0.1]])
+    z_b = np.array([[0.5, 1.0, 0.2], [0.1, 0.4, 0.3]])
+    _x, _y, df = _example_dataframe(z_a, z_b)
+
+    axis, _fig = _patch_common(
+        monkeypatch,
+        module,
+        args,
+        df,
+        artifact_name="test_script_compare_contour.workers",
+        stub_render=True,
+    )
+    main()
+
+    serial_grids = [
+        module.prepare_config_grid(module.config_grid_cells(df[df["Config"] == config]))
+        for config in ["cfg_a", "cfg_b"]
+    ]
+
+    assert len(axis.contour_calls) == 3
+    assert np.allclose(axis.contour_calls[0]["z"], serial_grids[0]["contour_image"])
+    assert np.allclose(axis.contour_calls[1]["z"], z_b)
+    assert np.allclose(
+        axis.pcolormesh_calls[0]["z"], serial_grids[0]["z"] + serial_grids[1]["z"]
+    )
+
+
+def test_prepare_config_grids_falls_back_when_a_worker_crashes(monkeypatch, plot_artifact_dir):
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    module, _main = _load_module_and_main(monkeypatch)
+    args = _mk_args(plot_artifact_dir)
+    args.workers = 2
+
+    class _BrokenPool:
+        def __init__(self, *a, **k):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, *a, **k):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+    z_a = np.array([[1.0, 2.0, 0.5], [0.2, 3.0, 0.1]])
+    z_b = np.array([[0.5, 1.0, 0.2], [0.1, 0.4, 0.3]])
+    _x, _y, df = _example_dataframe(z_a, z_b)
+    _patch_common(monkeypatch, module, args, df, artifact_name="unused")
+    monkeypatch.setattr(module, "ProcessPoolExecutor", _BrokenPool)
+
+    grids = module.prepare_config_grids([df[df["Config"] == config] for config in ["cfg_a", "cfg_b"]])
+
+    assert np.allclose(grids[0]["z"], module.normalize_image(z_a))
+    assert np.allclose(grids[1]["z"], module.normalize_image(z_b))
@@ -142,3 +142,78 @@ def test_main_plots_histogram_for_each_iterable(monkeypatch, plot_artifact_dir):
     output_file = plot_artifact_dir / "test_script_compare_hist1d.png"
     assert output_file.exists()
     assert output_file.stat().st_size > 0
+
+
+def test_main_draws_many_iterables_as_single_collection(monkeypatch, plot_artifact_dir):
+    module, main = _load_module_and_main(monkeypatch)
+
+    args = SimpleNamespace(
+        datafile="mock",
+        configs=["cfg_a"],
+        names=["sample_a"],
+        variables=None,
+        x=["Values"],
+        operation="subtract",
+        iterable="Category",
+        weight=None,
+        reduce=False,
+        collection_threshold=5,
+        collection_cmap="plasma",
+        select=None,
+        save_values=None,
+        bins=10,
+        percentile=None,
+        labelx="X",
+        labely="Counts",
+        logx=False,
+        logy=False,
+        rangex=None,
+        rangey=None,
+        title=None,
+        output=str(plot_artifact_dir / "artifact-root"),
+        debug=False,
+    )
+
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        [
+            {
+                "Config": "cfg_a",
+                "Name": "sample_a",
+                "Category": f"run_{idx}",
+                "Values": rng.normal(0.5, 0.1, 200),
+            }
+            for idx in range(12)
+        ]
+    )
+
+    collections = []
+    original_collection = module.plot_line_collection
+
+    def recording_collection(ax, xs, ys, values, **kwargs):
+        collection = original_collection(ax, xs, ys, values, **kwargs)
+        collections.append((values, collection))
+        return collection
+
+    monkeypatch.setattr(module, "args", args, raising=False)
+    monkeypatch.setattr(module, "import_data", lambda _args: df)
+    monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df)
+    monkeypatch.setattr(module, "prepare_import", lambda _args: (_args.configs, _args.names))
+    monkeypatch.setattr(module, "make_subtitle_from_args", lambda _args, _idx: "sub")
+    monkeypatch.setattr(module, "make_title_from_args", lambda _args: "title")
+    monkeypatch.setattr(
+        module,
+        "make_name_from_args",
+        lambda _args, _idx, prefix, suffix: "test_script_compare_hist1d.png",
+    )
+    monkeypatch.setattr(module, "rprint", lambda *a, **k: None)
+    monkeypatch.setattr(module, "plot_line_collection", recording_collection)
+
+    main()
+
+    assert len(collections) == 1
+    values, collection = collections[0]
+    assert list(values) == [f"run_{idx}" for idx in range(12)]
+    assert len(collection.get_segments()) == 12
+    # steps-mid vertices: two per bin
+    assert collection.get_segments()[0].shape == (20, 2)
@@ -584,3 +584,100 @@ def test_main_reverses_stack_order_when_requested(monkeypatch, plot_artifact_dir
     assert [call["label"] for call in top_calls] == ["second", "first"]
     np.testing.assert_allclose(top_calls[0]["bottom"], np.zeros_like(x, dtype=float))
     np.testing.assert_allclose(top_calls[1]["bottom"], np.array([2.0, 2.0, 2.0, 2.0]))
+
+
+def test_main_resamples_misaligned_lines_against_all_references(monkeypatch, plot_artifact_dir):
+    module, main = _load_module_and_main(monkeypatch)
+
+    args = SimpleNamespace(
+        datafile="mock",
+        configs=["cfg_a"],
+        names=["sample_a"],
+        variables=None,
+        iterable="Component",
+        select=None,
+        save_values=None,
+        x="Energy",
+        y="Counts",
+        operation="ratio",
+        default_operation=None,
+        reference=0,
+        reference_value=None,
+        all_references=True,
+        errory=True,
+        reduce=False,
+        labelx="X",
+        labely="Y",
+        labelz=None,
+        bottom_labely=None,
+        logx=False,
+        logy=False,
+        rangex=None,
+        rangey=None,
+        bottom_rangey=None,
+        plot_style="-",
+        plot_type="line",
+        title=None,
+        output=str(plot_artifact_dir / "artifact-root"),
+        debug=False,
+        vertical=None,
+        horizontal=None,
+        vertical_label=None,
+        horizontal_label=None,
+        no_lower_plot=False,
+    )
+
+    df = pd.DataFrame(
+        [
+            {
+                "Config": "cfg_a",
+                "Name": "sample_a",
+                "Component": "day",
+                "Energy": np.array([1.0, 2.0, 3.0]),
+                "Counts": np.array([2.0, 2.0, 2.0]),
+                "CountsError": np.array([0.2, 0.2, 0.2]),
+            },
+            {
+                "Config": "cfg_a",
+                "Name": "sample_a",
+                "Component": "night",
+                "Energy": np.array([0.5, 1.5, 2.5, 3.5]),
+                "Counts": np.array([4.0, 4.0, 4.0, 4.0]),
+                "CountsError": np.array([0.4, 0.4, 0.4, 0.4]),
+            },
+        ]
+    )
+
+    calls = []
+
+    monkeypatch.setattr(module, "args", args, raising=False)
+    monkeypatch.setattr(module, "import_data", lambda _args: df)
+    monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df)
+    monkeypatch.setattr(
+        module, "prepare_import", lambda _args: (_args.configs, _args.names)
+    )
+    monkeypatch.setattr(module, "make_title_from_args", lambda _args: "title")
+    monkeypatch.setattr(
+        module,
+        "make_name_from_args",
+        lambda _args, _idx, prefix, suffix: "test_script_compare_line_operation.png",
+    )
+    monkeypatch.setattr(module, "rprint", lambda *a, **k: None)
+    monkeypatch.setattr(
+        module,
+        "plot_data",
+        lambda *a, **k: calls.append({"ax": a[1], "x": a[2], "y": k.get("y"), "errory": k.get("errory")}),
+    )
+    monkeypatch.setattr(module, "apply_legend_style", lambda *a, **k: None)
+
+    main()
+
+    top_ax = calls[0]["ax"]
+    bottom_calls = [call for call in calls if call["ax"] is not top_ax]
+
+    assert len([call for call in calls if call["ax"] is top_ax]) == 2
+    assert len(bottom_calls) == 2
+    np.testing.assert_allclose(bottom_calls[0]["x"], [1.0, 2.0, 3.0])
+    np.testing.assert_allclose(bottom_calls[0]["y"], [2.0, 2.0, 2.0])
+    np.testing.assert_allclose(bottom_calls[1]["y"], [0.5, 0.5, 0.5])
+    np.testing.assert_allclose(bottom_calls[0]["errory"], np.full(3, 2.0 * np.hypot(0.1, 0.1)))
@@ -0,0 +1,80 @@
+import importlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def _load_module(monkeypatch, *extra_args):
+    monkeypatch.setattr(sys, "argv", ["script_event_display.py", "--datafile", "mock", *extra_args])
+
+    repo_root = Path(__file__).resolve().parents[1]
+    scripts_dir = repo_root / "scripts"
+    monkeypatch.syspath_prepend(str(scripts_dir))
+    monkeypatch.syspath_prepend(str(repo_root))
+
+    module = importlib.import_module("scripts.script_event_display")
+    return importlib.reload(module)
+
+
+def _display_df(n_hits=20_000):
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(
+        {
+            "X": rng.uniform(0.0, 10.0, n_hits),
+            "Y": rng.uniform(-5.0, 5.0, n_hits),
+            "Z": rng.uniform(0.0, 50.0, n_hits),
+            "E": rng.exponential(2.0, n_hits),
+        }
+    )
+
+
+def _run_main(module, monkeypatch, df):
+    saved = []
+    monkeypatch.setattr(module, "_load_display_df", lambda args: df)
+    monkeypatch.setattr(module, "filter_dataframe", lambda frame, args: frame)
+    monkeypatch.setattr(module, "prepare_import", lambda args: (None, None))
+    monkeypatch.setattr(module, "make_title_from_args", lambda args: "Event")
+    monkeypatch.setattr(module, "make_name_from_args", lambda args, kdx, prefix=None, suffix=None: suffix)
+    monkeypatch.setattr(module, "save_figure_to_paths", lambda fig, *args: saved.append(fig))
+    module.main()
+    return saved
+
+
+def test_main_aggregate_mean_draws_images_with_shared_colorbar(monkeypatch):
+    module = _load_module(monkeypatch, "--aggregate", "mean", "--colorby", "E")
+
+    saved = _run_main(module, monkeypatch, _display_df())
+
+    assert len(saved) == 1
+    ax_left, ax_right, cbar_ax = saved[0].axes
+    for ax in (ax_left, ax_right):
+        assert len(ax.collections) == 0
+        assert len(ax.images) == 1
+    assert ax_left.images[0].norm is ax_right.images[0].norm
+    assert cbar_ax.get_ylabel() == "Mean E"
+
+
+def test_main_aggregate_mean_without_colorby_falls_back_to_counts(monkeypatch, capsys):
+    module = _load_module(monkeypatch, "--aggregate", "max")
+
+    saved = _run_main(module, monkeypatch, _display_df(500))
+
+    assert "Showing counts" in capsys.readouterr().out
+    counts = saved[0].axes[0].images[0].get_array()
+    assert counts.sum() == 500
+
+
+def test_load_display_df_reads_requested_events_through_index(monkeypatch, tmp_path):
+    datafile = tmp_path / "display.pkl"
+    hits = _display_df(300).assign(Event=np.repeat([10, 20, 30], 100))
+    hits.to_pickle(datafile)
+    module = _load_module(monkeypatch, "--event", "20")
+    module.args.datafile = str(datafile)
+
+    loaded = module._load_display_df(module.args)
+
+    assert (tmp_path / "display.events" / "meta.json").exists()
+    assert loaded["Event"].unique().tolist() == [20]
+    np.testing.assert_allclose(loaded["X"], hits["X"].iloc[100:200])
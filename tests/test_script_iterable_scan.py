@@ -221,3 +221,118 @@ def test_main_plots_comparable_iterable_scan(monkeypatch, plot_artifact_dir):
     main()
 
     assert captured_linestyles == ["solid", "dashed"]
+
+
+def _run_many_iterables(monkeypatch, plot_artifact_dir, thresholds=range(40), **overrides):
+    module, main = _load_module_and_main(monkeypatch)
+
+    args = SimpleNamespace(
+        datafile="mock",
+        configs=["hd_cfg_a"],
+        names=["name_a"],
+        variables=None,
+        iterable="Threshold",
+        select=None,
+        save_values=None,
+        x="Values",
+        y="Counts",
+        reduce=True,
+        collection_threshold=10,
+        collection_cmap="viridis",
+        labelx="X Axis",
+        labely="Y Axis",
+        labelz=None,
+        logx=False,
+        logy=False,
+        rangex=None,
+        rangey=None,
+        plot_style="-",
+        plot_type="step",
+        title=None,
+        output=str(plot_artifact_dir / "out"),
+        horizontal=None,
+        horizontal_label=None,
+        vertical=None,
+        vertical_label=None,
+        point=None,
+        point_label=None,
+        errorx=False,
+        stacked=False,
+        connect=False,
+        debug=False,
+    )
+    vars(args).update(overrides)
+
+    x_vals = np.linspace(0, 10, 20)
+    df = pd.DataFrame(
+        [
+            {
+                "Config": "hd_cfg_a",
+                "Name": "name_a",
+                "Threshold": threshold,
+                "Values": x_vals,
+                "Counts": np.exp(-x_vals / (float(threshold) + 1)),
+            }
+            for threshold in thresholds
+        ]
+    )
+
+    figures = []
+
+    monkeypatch.setattr(module, "args", args, raising=False)
+    monkeypatch.setattr(module, "import_data", lambda _args: df)
+    monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df)
+    monkeypatch.setattr(module, "prepare_import", lambda _args: (_args.configs, _args.names))
+    monkeypatch.setattr(module, "make_subtitle_from_args", lambda _args, _idx: "sub")
+    monkeypatch.setattr(module, "make_title_from_args", lambda _args: "title")
+    monkeypatch.setattr(
+        module,
+        "make_name_from_args",
+        lambda _args, idx=None, prefix=None, suffix=None: "test_script_iterable_scan.png",
+    )
+    monkeypatch.setattr(module, "rprint", lambda *a, **k: None)
+    monkeypatch.setattr(
+        module, "save_figure_to_paths", lambda fig, *args, **kwargs: figures.append(fig)
+    )
+
+    main()
+    return figures
+
+
+def test_main_draws_many_iterables_as_single_collection(monkeypatch, plot_artifact_dir):
+    thresholds = [float(threshold) for threshold in range(40)]
+    figures = _run_many_iterables(monkeypatch, plot_artifact_dir, thresholds=thresholds)
+
+    main_ax = figures[0].axes[0]
+    assert len(main_ax.collections) == 1
+    assert len(main_ax.lines) == 0
+    collection = main_ax.collections[0]
+    assert len(collection.get_segments()) == 40
+    # Steps drawn from the bin edges: two vertices per bin
+    assert collection.get_segments()[0].shape == (40, 2)
+    np.testing.assert_allclose(collection.get_array(), np.arange(40.0))
+    assert len(figures[0].axes) == 2  # main axes plus colorbar
+    assert main_ax.get_legend() is None
+
+
+def test_main_keeps_marker_scans_per_line_above_collection_threshold(monkeypatch, plot_artifact_dir):
+    thresholds = [float(threshold) for threshold in range(40)]
+    figures = _run_many_iterables(
+        monkeypatch, plot_artifact_dir, thresholds=thresholds, plot_type=None, reduce=False
+    )
+
+    main_ax = figures[0].axes[0]
+    assert len(main_ax.collections) == 0
+    assert len(main_ax.lines) == 40
+    assert all(line.get_linestyle() == "None" and line.get_marker() == "o" for line in main_ax.lines)
+    assert main_ax.get_legend() is not None
+
+
+def test_main_collection_with_hidden_lines(monkeypatch, plot_artifact_dir):
+    thresholds = [float(threshold) for threshold in range(40)]
+    figures = _run_many_iterables(
+        monkeypatch, plot_artifact_dir, thresholds=thresholds, plot_type="line", plot_style="none"
+    )
+
+    collection = figures[0].axes[0].collections[0]
+    assert np.all(collection.get_linewidths() == 0)
@@ -114,6 +114,7 @@ def test_main_plots_fit_and_zero_residuals_for_matching_data(monkeypatch, plot_a
         title=None,
         output=str(plot_artifact_dir / "artifact-root"),
         debug=False,
+        no_fit_cache=True,
     )
 
     linear = lambda x, slope, intercept: slope * x + intercept
@@ -155,3 +156,94 @@ def test_main_plots_fit_and_zero_residuals_for_matching_data(monkeypatch, plot_a
     output_file = plot_artifact_dir / "test_script_line_fit.png"
     assert output_file.exists()
     assert output_file.stat().st_size > 0
+
+
+def test_main_refits_all_iterables_with_fit_model(monkeypatch, plot_artifact_dir, tmp_path):
+    module, main = _load_module_and_main(monkeypatch)
+
+    args = SimpleNamespace(
+        datafile="mock",
+        configs=["cfg_a"],
+        names=["sample_a"],
+        variables=None,
+        x="Values",
+        y="Density",
+        iterable="Threshold",
+        select=None,
+        save_values=None,
+        reduce=False,
+        labelx="Energy",
+        labely="Density",
+        labelz=None,
+        logx=False,
+        logy=False,
+        chi2=False,
+        fitindex=1,
+        fitlegendposition=(0.55, 0.90),
+        errorx=False,
+        errory=False,
+        rangex=None,
+        rangey=None,
+        title=None,
+        output=str(plot_artifact_dir / "artifact-root"),
+        debug=False,
+        fit_model="linear",
+        fit_range=[1.0, 10.0],
+        fit_p0=None,
+        fit_workers=1,
+        fit_output_dir=str(tmp_path),
+        fit_cache_dir=str(tmp_path / "cache"),
+    )
+
+    x = np.linspace(0.5, 12.0, 120)
+    df = pd.DataFrame(
+        [
+            {
+                "Config": "cfg_a",
+                "Name": "sample_a",
+                "Threshold": threshold,
+                "Values": x,
+                "Density": slope * x + 1.0,
+            }
+            for threshold, slope in [(1, 2.0), (2, 3.0), (3, 4.0)]
+        ]
+    )
+
+    axis_top = _DummyAxis()
+    monkeypatch.setattr(module, "args", args, raising=False)
+    monkeypatch.setattr(module, "import_data", lambda _args: df)
+    monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df)
+    monkeypatch.setattr(module, "prepare_import", lambda _args: (_args.configs, _args.names))
+    monkeypatch.setattr(module, "make_title_from_args", lambda _args: "title")
+    monkeypatch.setattr(
+        module,
+        "make_name_from_args",
+        lambda _args, _idx, prefix, suffix: f"test_script_line_fit_refit.{suffix}",
+    )
+    monkeypatch.setattr(module, "rprint", lambda *a, **k: None)
+
+    main()
+
+    fits = pd.read_pickle(tmp_path / "test_script_line_fit_refit.fits.pkl")
+    assert list(fits["Threshold"]) == [1, 2, 3]
+    assert fits["FitModel"].unique().tolist() == ["linear"]
+    assert np.allclose(np.stack(fits["Params"]), [[2.0, 1.0], [3.0, 1.0], [4.0, 1.0]])
+    assert all(np.shape(cov) == (2, 2) for cov in fits["ParamsCovariance"])
+    assert (plot_artifact_dir / "test_script_line_fit_refit.fit.png").exists()
+
+
+def test_stored_fit_labels_are_reused_only_for_the_same_model(monkeypatch):
+    module, _main = _load_module_and_main(monkeypatch)
+    from lib.fitting import resolve_fit_model
+
+    def gaussian(x, amplitude, mean, sigma):
+        return amplitude * np.exp(-0.5 * ((x - mean) / sigma) ** 2)
+
+    subset = pd.DataFrame(
+        [{"FitFunction": gaussian, "ParamsLabel": ["A", "mu", "sigma"], "ParamsFormat": [".1f"] * 3}]
+    )
+
+    assert not module.stored_fit_matches(subset, resolve_fit_model("quadratic"))
+    assert module.stored_fit_matches(subset, {"name": "gaussian", "function": None})
+    assert module.stored_fit_matches(subset, {"name": "other", "function": gaussian})
+    assert not module.stored_fit_matches(subset.drop(columns="ParamsLabel"), {"name": "gaussian", "function": gaussian})
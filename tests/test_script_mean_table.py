@@ -77,3 +77,66 @@ def test_main_generates_table_latex_output(monkeypatch, plot_artifact_dir):
     
     # The test passes if main() completes without error
     # HTML and LaTeX files are generated internally
+
+
+def _mean_table_df():
+    return pd.DataFrame({
+        "Geometry": ["hd"] * 4,
+        "Config": ["hd_1x2x6"] * 4,
+        "Name": ["marley_official"] * 4,
+        "Variable": ["Energy", "Energy", "Momentum", "Momentum"],
+        "Counts": [1.0, 3.0, 5.0, 7.0],
+        "Efficiency": [0.5, 0.7, 0.9, 0.9],
+    })
+
+
+def test_tables_mode_builds_every_spec_from_one_import(monkeypatch, tmp_path):
+    module, main = _load_module_and_main(monkeypatch)
+    spec_file = tmp_path / "tables.json"
+    spec_file.write_text(
+        '[{"y": "Counts", "variables": ["Energy", "Momentum"], "variable_title": "Counts"},'
+        ' {"y": "Efficiency", "variables": ["Momentum"], "output": ["eff"]}]'
+    )
+    module.args.tables = str(spec_file)
+    module.args.configs = ["hd_1x2x6"]
+    module.args.names = ["marley_official"]
+
+    imports, written = [], []
+    monkeypatch.setattr(module, "import_data", lambda _args: imports.append(_args) or _mean_table_df())
+    monkeypatch.setattr(module, "filter_dataframe", lambda _df, _args: _df[_df["Variable"].isin(_args.variables)])
+    monkeypatch.setattr(module, "write_table", lambda table, spec: written.append((spec, table)))
+    monkeypatch.setattr(
+        module,
+        "format_with_error",
+        lambda row, args: f"{row[(args.y, 'mean')]:.0f} ± {row[(f'{args.y}Error', '<lambda>')]:.1f}",
+    )
+
+    main()
+
+    assert len(imports) == 1
+    assert imports[0].variables is None
+    assert [spec.y for spec, _ in written] == ["Counts", "Efficiency"]
+    assert written[1][0].output == ["eff"]
+    counts_table = written[0][1]
+    assert counts_table.columns.tolist()[1:] == [("Counts", "Energy"), ("Counts", "Momentum")]
+    assert counts_table.iloc[0, 1] == "2 ± 1.6"
+    assert written[1][1].shape == (1, 2)
+
+
+def test_load_table_specs_parses_mean_table_command_lists(monkeypatch, tmp_path):
+    module, _ = _load_module_and_main(monkeypatch)
+    script_file = tmp_path / "example_scripts.txt"
+    script_file.write_text(
+        "# comment\n"
+        "scripts/script_mean_table.py --datafile mock -y Counts --variables Energy --it 1\n"
+        "scripts/script_compare_hist1d.py --datafile mock\n"
+        "scripts/script_mean_table.py --datafile mock -y Efficiency -o custom\n"
+    )
+    module.args.output = ["shared"]
+
+    specs = module.load_table_specs(str(script_file), module.args)
+
+    assert [spec.y for spec in specs] == ["Counts", "Efficiency"]
+    assert specs[0].variables == ["Energy"] and specs[0].it == 1
+    assert specs[0].output == ["shared"]
+    assert specs[1].output == ["custom"]
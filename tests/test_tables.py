@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+sys.path.insert(0, str(repo_root))
+
+from lib.tables import aggregate_mean_with_error
+
+
+def test_aggregate_mean_with_error_matches_quadrature_lambda():
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame(
+        {
+            "Config": rng.choice(["a", "b", "c"], size=300),
+            "Variable": rng.choice(["E", "P"], size=300),
+            "Counts": rng.normal(10.0, 1.0, size=300).astype(object),
+            "CountsError": rng.uniform(0.1, 0.5, size=300),
+        }
+    )
+
+    result = aggregate_mean_with_error(df, ["Config", "Variable"], "Counts", "CountsError")
+    expected = df.astype({"Counts": float}).groupby(["Config", "Variable"]).agg(
+        {"Counts": "mean", "CountsError": lambda x: np.sqrt(np.sum(x**2)) / len(x)}
+    )
+
+    pd.testing.assert_frame_equal(result, expected, check_names=False)
+
+
+def test_aggregate_mean_with_error_skips_nan_like_the_series_sum():
+    df = pd.DataFrame(
+        {
+            "Config": ["a", "a", "b", "b"],
+            "Counts": [1.0, np.nan, 3.0, 4.0],
+            "CountsError": [0.1, np.nan, np.nan, 0.2],
+        }
+    )
+
+    result = aggregate_mean_with_error(df, "Config", "Counts", "CountsError")
+    expected = df.groupby("Config").agg(
+        {"Counts": "mean", "CountsError": lambda x: np.sqrt(np.sum(x**2)) / len(x)}
+    )
+
+    pd.testing.assert_frame_equal(result, expected, check_names=False)
+    np.testing.assert_allclose(result["CountsError"], [0.05, 0.1])